@@ -1,6 +1,8 @@
 import cv2
 
 
+from skellytracker.system.default_paths import get_log_file_path
+from skellytracker.system.logging_configuration import configure_logging
 from skellytracker.trackers.bright_point_tracker.brightest_point_tracker import (
     BrightestPointTracker,
 )
@@ -60,4 +62,5 @@ def main(demo_tracker: str = "mediapipe_holistic_tracker"):
 
 
 if __name__ == "__main__":
+    configure_logging(log_file_path=str(get_log_file_path()))
     main(demo_tracker="mediapipe_holistic_tracker")
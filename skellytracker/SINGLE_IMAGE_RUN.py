@@ -1,6 +1,8 @@
 import cv2
 from pathlib import Path
 
+from skellytracker.system.default_paths import get_log_file_path
+from skellytracker.system.logging_configuration import configure_logging
 from skellytracker.trackers.bright_point_tracker.brightest_point_tracker import (
     BrightestPointTracker,
 )
@@ -19,6 +21,7 @@ except ModuleNotFoundError:
 
 
 if __name__ == "__main__":
+    configure_logging(log_file_path=str(get_log_file_path()))
     demo_tracker = "brightest_point_tracker"
     image_path = Path("/Path/To/Your/Image.jpg")
 
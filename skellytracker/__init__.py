@@ -11,44 +11,60 @@ __repo_url__ = (
 )
 __repo_issues_url__ = f"{__repo_url__}/issues"
 
-# ruff: noqa: F401, E402
-
-import sys
-from pathlib import Path
-
-print(f"Thank you for using {__package_name__}!")
-print(f"This is printing from: {__file__}")
-print(f"Source code for this package is available at: {__repo_url__}")
-
-base_package_path = Path(__file__).parent
-print(f"adding base_package_path: {base_package_path} : to sys.path")
-sys.path.insert(0, str(base_package_path))  # add parent directory to sys.path
-
-from skellytracker.system.default_paths import get_log_file_path
-from skellytracker.system.logging_configuration import configure_logging
-
-try:
-    from skellytracker.trackers.mediapipe_tracker.mediapipe_holistic_tracker import (
-        MediapipeHolisticTracker,
-    )
-    from skellytracker.trackers.mediapipe_tracker.mediapipe_model_info import (
-        MediapipeModelInfo,
-    )
-except ModuleNotFoundError:
-    print("To use mediapipe_holistic_tracker, install skellytracker[mediapipe]")
-try:
-    from skellytracker.trackers.yolo_tracker.yolo_tracker import YOLOPoseTracker
-    from skellytracker.trackers.yolo_tracker.yolo_model_info import YOLOModelInfo
-except ModuleNotFoundError:
-    print("To use yolo_tracker, install skellytracker[yolo]")
-try:
-    from skellytracker.trackers.yolo_mediapipe_combo_tracker.yolo_mediapipe_combo_tracker import (
-        YOLOMediapipeComboTracker,
-    )
-except ModuleNotFoundError:
-    print(
-        "To use yolo_mediapipe_combo_tracker, install skellytracker[mediapipe, yolo] or skellytracker[all]"
-    )
-
-
-configure_logging(log_file_path=str(get_log_file_path()))
+# Importing the package has no side effects: tracker classes are imported on first attribute access,
+# so a tracker's heavy dependencies (i.e. mediapipe, ultralytics and torch) are only loaded when it is used,
+# and logging is only configured by entry points calling `configure_logging`.
+
+import importlib
+from typing import Any, Dict, List, Optional, Tuple
+
+# attribute name -> (module it is defined in, optional dependency group needed to import it)
+_LAZY_ATTRIBUTES: Dict[str, Tuple[str, Optional[str]]] = {
+    "get_log_file_path": ("skellytracker.system.default_paths", None),
+    "configure_logging": ("skellytracker.system.logging_configuration", None),
+    "BaseTracker": ("skellytracker.trackers.base_tracker.base_tracker", None),
+    "BaseRecorder": ("skellytracker.trackers.base_tracker.base_recorder", None),
+    "register_tracker": ("skellytracker.trackers.tracker_registry", None),
+    "BrightestPointTracker": (
+        "skellytracker.trackers.bright_point_tracker.brightest_point_tracker",
+        None,
+    ),
+    "CharucoTracker": ("skellytracker.trackers.charuco_tracker.charuco_tracker", None),
+    "MediapipeHolisticTracker": (
+        "skellytracker.trackers.mediapipe_tracker.mediapipe_holistic_tracker",
+        "mediapipe",
+    ),
+    "MediapipeModelInfo": (
+        "skellytracker.trackers.mediapipe_tracker.mediapipe_model_info",
+        "mediapipe",
+    ),
+    "YOLOPoseTracker": ("skellytracker.trackers.yolo_tracker.yolo_tracker", "yolo"),
+    "YOLOModelInfo": ("skellytracker.trackers.yolo_tracker.yolo_model_info", None),
+    "YOLOMediapipeComboTracker": (
+        "skellytracker.trackers.yolo_mediapipe_combo_tracker.yolo_mediapipe_combo_tracker",
+        "mediapipe,yolo",
+    ),
+}
+
+
+def __getattr__(name: str) -> Any:
+    if name not in _LAZY_ATTRIBUTES:
+        raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+
+    module_name, optional_dependency_group = _LAZY_ATTRIBUTES[name]
+    try:
+        module = importlib.import_module(module_name)
+    except ModuleNotFoundError as e:
+        if optional_dependency_group is None:
+            raise
+        raise ImportError(
+            f"To use {name}, install skellytracker[{optional_dependency_group}]"
+        ) from e
+
+    attribute = getattr(module, name)
+    globals()[name] = attribute
+    return attribute
+
+
+def __dir__() -> List[str]:
+    return sorted(list(globals()) + list(_LAZY_ATTRIBUTES))
@@ -9,11 +9,14 @@ sys.path.insert(0, str(base_package_path))  # add parent directory to sys.path
 import logging  # noqa: E402
 
 from skellytracker.RUN_ME import main  # noqa: E402
+from skellytracker.system.default_paths import get_log_file_path  # noqa: E402
+from skellytracker.system.logging_configuration import configure_logging  # noqa: E402
 
 logger = logging.getLogger(__name__)
 
 
 def cli_main():
+    configure_logging(log_file_path=str(get_log_file_path()))
     logger.info("Running as a script")
     if len(sys.argv) > 1:
         demo_tracker = str(sys.argv[1])
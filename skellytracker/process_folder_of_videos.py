@@ -1,52 +1,33 @@
+import hashlib
 import logging
 import numpy as np
 from multiprocessing import Pool, cpu_count
 from pathlib import Path
-from typing import Optional
+from typing import Dict, List, Optional, Tuple
 from pydantic import BaseModel
 
 
 from skellytracker.system.constants import BASE_2D_FILE_NAME
 from skellytracker.trackers.base_tracker.base_tracker import BaseTracker
 from skellytracker.trackers.base_tracker.model_info import ModelInfo
-from skellytracker.trackers.bright_point_tracker.brightest_point_tracker import (
-    BrightestPointTracker,
+from skellytracker.trackers.openpose_tracker.openpose_scheduler import OpenPoseScheduler
+from skellytracker.trackers.tracker_registry import (
+    create_default_tracking_params,
+    create_tracker,
+    get_model_file_name,
 )
 from skellytracker.utilities.get_video_paths import get_video_paths
-
-try:
-    from skellytracker.trackers.yolo_mediapipe_combo_tracker.yolo_mediapipe_combo_tracker import (
-        YOLOMediapipeComboTracker,
-    )
-except ModuleNotFoundError:
-    print(
-        "\n\nTo use yolo_mediapipe_combo_tracker, install skellytracker[yolo, mediapipe]\n\n"
-    )
-try:
-    from skellytracker.trackers.yolo_tracker.yolo_tracker import YOLOPoseTracker
-    from skellytracker.trackers.yolo_tracker.yolo_model_info import YOLOTrackingParams
-except ModuleNotFoundError:
-    print("To use yolo_tracker, install skellytracker[yolo]")
-try:
-    from skellytracker.trackers.mediapipe_tracker.mediapipe_holistic_tracker import (
-        MediapipeHolisticTracker,
-    )
-    from skellytracker.trackers.mediapipe_tracker.mediapipe_model_info import (
-        MediapipeTrackingParams,
-    )
-except ModuleNotFoundError:
-    print("To use mediapipe_holistic_tracker, install skellytracker[mediapipe]")
+from skellytracker.utilities.result_cache import ResultCache
+from skellytracker.utilities.shared_output_array import (
+    create_shared_output_array,
+    get_video_frame_counts,
+    write_to_shared_output_array,
+)
 
 logger = logging.getLogger(__name__)
 
-try:
-    from skellytracker.trackers.openpose_tracker.openpose_tracker import (
-        OpenPoseTracker,
-    )
-except ModuleNotFoundError:
-    print("To use openpose_tracker, install skellytracker[openpose]")
-
-logger = logging.getLogger(__name__)
+# trackers built by worker processes, keyed by tracker name and serialized tracking params
+_worker_trackers: Dict[Tuple[str, str, str], BaseTracker] = {}
 
 
 def process_folder_of_videos(
@@ -56,6 +37,12 @@ def process_folder_of_videos(
     output_folder_path: Optional[Path] = None,
     annotated_video_path: Optional[Path] = None,
     num_processes: Optional[int] = None,
+    num_frame_shards: int = 1,
+    shard_warmup_frames: int = 30,
+    use_shared_output_array: bool = False,
+    resume: bool = False,
+    result_cache: Optional[ResultCache] = None,
+    synchronized_batch_inference: bool = False,
 ) -> np.ndarray:
     """
     Process a folder of synchronized videos with the given tracker.
@@ -67,58 +54,518 @@ def process_folder_of_videos(
     :param output_folder_path: Path to save tracked data to.
     :param annotated_video_path: Path to save annotated videos to.
     :param num_processes: Number of processes to use, 1 to disable multiprocessing.
+        For OpenPose, the number of OpenPose processes run at once by an `OpenPoseScheduler`.
+    :param num_frame_shards: Number of contiguous frame ranges to split each video into, each processed as its own task.
+        Annotated videos are not written when videos are split into more than one shard. Not supported for OpenPose.
+    :param shard_warmup_frames: Number of frames before each shard to run the tracker on without keeping the results,
+        so trackers with temporal state (i.e. MediaPipe smoothing) have settled by the first frame of the shard.
+    :param use_shared_output_array: Whether workers should write their results directly into a memory-mapped output file,
+        instead of returning them to be stacked. The file has the same shape as the stacked array, sized from running the
+        tracker on one frame in this process. The returned array is then a read-only memory map of the saved file.
+    :param resume: Whether each task should checkpoint its progress in a checkpoints folder next to the output file,
+        and continue from its checkpoint if one exists, so a rerun after a crash skips the frames already processed.
+        Checkpoints are kept per tracker and tracking params. Annotated videos are not rewritten for videos resumed partway through.
+        Not supported for OpenPose.
+    :param result_cache: Cache to load each video's tracking data from instead of processing it, if the video, tracker,
+        and tracking params are unchanged. New results are added to the cache. Annotated videos are not rewritten on a cache hit.
+    :param synchronized_batch_inference: Whether to read the videos in lockstep in this process, running the tracker on
+        frame i of every camera in a single batch, so one model instance serves all cameras.
+        Only supported for trackers that process frames independently, and not with frame shards, resume, or a result cache.
     :return: Array of tracking data
     """
     video_paths = get_video_paths(synchronized_video_path)
 
+    if synchronized_batch_inference:
+        if num_frame_shards > 1 or resume or result_cache is not None:
+            raise ValueError(
+                "Synchronized batch inference does not support frame shards, resume, or a result cache"
+            )
+        return process_synchronized_videos(
+            model_info=model_info,
+            tracking_params=tracking_params,
+            video_paths=video_paths,
+            output_file_path=get_output_file_path(
+                model_info=model_info,
+                synchronized_video_path=Path(synchronized_video_path),
+                output_folder_path=output_folder_path,
+            ),
+            annotated_video_path=get_annotated_video_folder_path(
+                Path(synchronized_video_path), annotated_video_path
+            ),
+            use_shared_output_array=use_shared_output_array,
+        )
+
+    if model_info.tracker_name == "OpenPoseTracker" and (num_frame_shards > 1 or resume):
+        # OpenPose runs on whole videos in its own process, so it cannot start partway through one
+        raise ValueError("OpenPose does not support frame shards or resume")
+
+    if num_frame_shards > 1:
+        return process_folder_of_videos_in_shards(
+            model_info=model_info,
+            tracking_params=tracking_params,
+            video_paths=video_paths,
+            output_file_path=get_output_file_path(
+                model_info=model_info,
+                synchronized_video_path=Path(synchronized_video_path),
+                output_folder_path=output_folder_path,
+            ),
+            num_processes=num_processes,
+            num_frame_shards=num_frame_shards,
+            shard_warmup_frames=shard_warmup_frames,
+            use_shared_output_array=use_shared_output_array,
+            resume=resume,
+            result_cache=result_cache,
+        )
+
     if num_processes is None:
         num_processes = min((cpu_count() - 1), len(video_paths))
     else:
         num_processes = min(num_processes, len(video_paths), cpu_count() - 1)
 
-    file_name = model_info.name + "_" + BASE_2D_FILE_NAME
     synchronized_video_path = Path(synchronized_video_path)
+
+    if model_info.tracker_name == "OpenPoseTracker":
+        return process_openpose_videos(
+            model_info=model_info,
+            tracking_params=tracking_params,
+            video_paths=video_paths,
+            output_file_path=get_output_file_path(
+                model_info=model_info,
+                synchronized_video_path=synchronized_video_path,
+                output_folder_path=output_folder_path,
+            ),
+            annotated_video_path=get_annotated_video_folder_path(
+                synchronized_video_path, annotated_video_path
+            ),
+            max_concurrent_jobs=max(num_processes, 1),
+            use_shared_output_array=use_shared_output_array,
+            result_cache=result_cache,
+        )
+    output_folder_path = get_output_file_path(
+        model_info=model_info,
+        synchronized_video_path=synchronized_video_path,
+        output_folder_path=output_folder_path,
+    )
+
+    annotated_video_path = get_annotated_video_folder_path(
+        synchronized_video_path, annotated_video_path
+    )
+
+    if use_shared_output_array:
+        create_shared_output_array(
+            file_path=output_folder_path,
+            shape=get_shared_output_array_shape(
+                tracker_name=model_info.tracker_name,
+                tracking_params=tracking_params,
+                video_paths=video_paths,
+            ),
+        )
+
+    checkpoint_folder_path = (
+        get_checkpoint_folder_path(output_folder_path, model_info.tracker_name, tracking_params)
+        if resume
+        else None
+    )
+
+    tasks = [
+        (
+            model_info.tracker_name,
+            tracking_params,
+            video_path,
+            annotated_video_path,
+            output_folder_path if use_shared_output_array else None,
+            camera_index,
+            checkpoint_folder_path,
+            result_cache,
+        )
+        for camera_index, video_path in enumerate(video_paths)
+    ]
+
+    if num_processes > 1:
+        logging.info("Using multiprocessing to run pose estimation")
+        # workers build their own trackers, so don't fork one built here to size the shared output array
+        clear_worker_trackers()
+        with Pool(
+            processes=num_processes,
+            initializer=initialize_worker,
+            initargs=(model_info.tracker_name, tracking_params),
+        ) as pool:
+            array_list = pool.starmap(process_single_video, tasks)
+    else:
+        array_list = []
+        try:
+            for task in tasks:
+                array_list.append(process_single_video(*task))
+        finally:
+            clear_worker_trackers()
+
+    if use_shared_output_array:
+        combined_array = np.load(output_folder_path, mmap_mode="r")
+        logger.info(f"Shape of output array: {combined_array.shape}")
+        return combined_array
+
+    combined_array = np.stack(array_list)
+
+    logger.info(f"Shape of output array: {combined_array.shape}")
+    np.save(output_folder_path, combined_array)
+
+    return combined_array
+
+
+def get_output_file_path(
+    model_info: ModelInfo,
+    synchronized_video_path: Path,
+    output_folder_path: Optional[Path] = None,
+) -> Path:
+    """
+    Get the path of the .npy file the combined tracking data is saved to, creating its folder if needed.
+
+    :param model_info: Model info for tracker.
+    :param synchronized_video_path: Path to folder of synchronized videos.
+    :param output_folder_path: Folder to save tracked data to, defaults to output_data/raw_data next to the videos.
+    :return: Path to the output .npy file
+    """
+    file_name = model_info.name + "_" + BASE_2D_FILE_NAME
     if output_folder_path is None:
-        output_folder_path = (
+        output_file_path = (
             synchronized_video_path.parent / "output_data" / "raw_data" / file_name
         )
     else:
-        output_folder_path = Path(output_folder_path) / file_name
-    if not output_folder_path.exists():
-        output_folder_path.parent.mkdir(parents=True, exist_ok=True)
+        output_file_path = Path(output_folder_path) / file_name
+    if not output_file_path.exists():
+        output_file_path.parent.mkdir(parents=True, exist_ok=True)
+    return output_file_path
+
 
+def get_annotated_video_folder_path(
+    synchronized_video_path: Path, annotated_video_path: Optional[Path] = None
+) -> Path:
+    """
+    Get the folder annotated videos are saved to, creating it if needed.
+
+    :param synchronized_video_path: Path to folder of synchronized videos.
+    :param annotated_video_path: Folder to save annotated videos to, defaults to annotated_videos next to the videos.
+    :return: Path to the annotated video folder
+    """
     if annotated_video_path is None:
         annotated_video_path = synchronized_video_path.parent / "annotated_videos"
     if not annotated_video_path.exists():
         annotated_video_path.mkdir(parents=True, exist_ok=True)
+    return annotated_video_path
 
-    tasks = [
-        (model_info.tracker_name, tracking_params, video_path, annotated_video_path)
-        for video_path in video_paths
-    ]
+
+def get_annotated_video_name(tracker_name: str, video_path: Path) -> str:
+    """
+    Get the file name of a video's annotated video.
+
+    :param tracker_name: Tracker the video is annotated by.
+    :param video_path: Path to video.
+    :return: File name of the annotated video
+    """
+    if tracker_name == "OpenPoseTracker":
+        return video_path.stem + "_openpose.avi"
+    return (
+        video_path.stem + "_mediapipe.mp4"
+    )  # TODO: fix it so blender output doesn't require mediapipe addendum here
+
+
+def get_checkpoint_folder_path(
+    output_file_path: Path, tracker_name: str, tracking_params: BaseModel
+) -> Path:
+    """
+    Get the folder that per-task data files and checkpoints are written to when resuming, creating it if needed.
+    The folder is unique to the tracker and tracking params, so a run with different ones does not resume from them.
+
+    :param output_file_path: Path of the combined output .npy file.
+    :param tracker_name: Tracker the tasks use.
+    :param tracking_params: Tracking parameters the tasks use.
+    :return: Path to the checkpoint folder
+    """
+    tracking_params_hash = hashlib.sha256(
+        f"{type(tracking_params).__name__}:{tracking_params.model_dump_json()}".encode()
+    ).hexdigest()
+    checkpoint_folder_path = (
+        output_file_path.parent / "checkpoints" / f"{tracker_name}_{tracking_params_hash[:16]}"
+    )
+    checkpoint_folder_path.mkdir(parents=True, exist_ok=True)
+    return checkpoint_folder_path
+
+
+def get_synchronized_frame_count(video_paths: List[Path]) -> int:
+    """
+    Get the number of frames shared by a set of synchronized videos.
+
+    :param video_paths: Paths to the synchronized videos.
+    :return: Number of frames in each video
+    :raise ValueError: If the videos do not all have the same number of frames.
+    """
+    frame_counts = get_video_frame_counts(video_paths)
+    if len(set(frame_counts)) > 1:
+        raise ValueError(
+            f"Synchronized videos must have the same number of frames, found frame counts: {frame_counts}"
+        )
+    return frame_counts[0] if frame_counts else 0
+
+
+def get_shared_output_array_shape(
+    tracker_name: str, tracking_params: BaseModel, video_paths: List[Path]
+) -> Tuple[int, ...]:
+    """
+    Get the shape of the combined output array for a set of synchronized videos,
+    matching the array the results would be stacked into without a shared output array.
+
+    The shape of each frame's data is taken from running the tracker on the first frame of the first video,
+    so the saved file does not depend on whether a shared output array is used.
+
+    :param tracker_name: Tracker to use.
+    :param tracking_params: Tracking parameters to use.
+    :param video_paths: Paths to the synchronized videos.
+    :return: Shape tuple of (numCams, numFrames, *shape of each frame's data)
+    :raise ValueError: If the videos do not all have the same number of frames, or the tracker returns no data.
+    """
+    number_of_frames = get_synchronized_frame_count(video_paths)
+    tracker = get_worker_tracker(tracker_name=tracker_name, tracking_params=tracking_params)
+    first_frame_array = tracker.process_video(
+        input_video_filepath=video_paths[0],
+        save_data_bool=False,
+        use_tqdm=False,
+        end_frame=1,
+    )
+    if first_frame_array is None:
+        raise ValueError(
+            f"{tracker_name} returned no data for {video_paths[0].name}, cannot create a shared output array"
+        )
+    return (len(video_paths), number_of_frames, *first_frame_array.shape[1:])
+
+
+def process_folder_of_videos_in_shards(
+    model_info: ModelInfo,
+    tracking_params: BaseModel,
+    video_paths: List[Path],
+    output_file_path: Path,
+    num_processes: Optional[int] = None,
+    num_frame_shards: int = 2,
+    shard_warmup_frames: int = 30,
+    use_shared_output_array: bool = False,
+    resume: bool = False,
+    result_cache: Optional[ResultCache] = None,
+) -> np.ndarray:
+    """
+    Process synchronized videos by splitting each one into contiguous frame ranges that are processed in parallel,
+    then stitching the results back together in frame order.
+
+    :param model_info: Model info for tracker.
+    :param tracking_params: Tracking parameters to use.
+    :param video_paths: Paths to the synchronized videos.
+    :param output_file_path: Path of the .npy file to save tracked data to.
+    :param num_processes: Number of processes to use, 1 to disable multiprocessing.
+    :param num_frame_shards: Number of frame ranges to split each video into.
+    :param shard_warmup_frames: Number of frames before each shard to process and discard.
+    :param use_shared_output_array: Whether each shard should write its results directly into a memory-mapped output file.
+    :param resume: Whether each shard should checkpoint its progress and continue from an existing checkpoint.
+    :param result_cache: Cache to load each shard's tracking data from instead of processing it.
+    :return: Array of tracking data
+    :raise ValueError: If any shard failed to process.
+    """
+    logger.info(f"Splitting each video into {num_frame_shards} frame shards")
+    logger.warning(
+        "Annotated videos are not saved when videos are split into more than one frame shard"
+    )
+
+    if use_shared_output_array:
+        create_shared_output_array(
+            file_path=output_file_path,
+            shape=get_shared_output_array_shape(
+                tracker_name=model_info.tracker_name,
+                tracking_params=tracking_params,
+                video_paths=video_paths,
+            ),
+        )
+
+    checkpoint_folder_path = (
+        get_checkpoint_folder_path(output_file_path, model_info.tracker_name, tracking_params)
+        if resume
+        else None
+    )
+
+    tasks = []
+    task_video_indices = []
+    for video_index, (video_path, number_of_frames) in enumerate(
+        zip(video_paths, get_video_frame_counts(video_paths))
+    ):
+        for start_frame, end_frame in get_frame_shards(
+            number_of_frames=number_of_frames, num_frame_shards=num_frame_shards
+        ):
+            task_video_indices.append(video_index)
+            tasks.append(
+                (
+                    model_info.tracker_name,
+                    tracking_params,
+                    video_path,
+                    start_frame,
+                    end_frame,
+                    min(shard_warmup_frames, start_frame),
+                    output_file_path if use_shared_output_array else None,
+                    video_index,
+                    checkpoint_folder_path,
+                    result_cache,
+                )
+            )
+
+    if num_processes is None:
+        num_processes = min((cpu_count() - 1), len(tasks))
+    else:
+        num_processes = min(num_processes, len(tasks), cpu_count() - 1)
 
     if num_processes > 1:
-        logging.info("Using multiprocessing to run pose estimation")
-        with Pool(processes=num_processes) as pool:
-            array_list = pool.starmap(process_single_video, tasks)
+        logging.info("Using multiprocessing to run pose estimation on video shards")
+        # workers build their own trackers, so don't fork one built here to size the shared output array
+        clear_worker_trackers()
+        with Pool(
+            processes=num_processes,
+            initializer=initialize_worker,
+            initargs=(model_info.tracker_name, tracking_params),
+        ) as pool:
+            shard_arrays = pool.starmap(process_video_shard, tasks)
     else:
-        array_list = []
-        for task in tasks:
-            array_list.append(process_single_video(*task))
+        try:
+            shard_arrays = [process_video_shard(*task) for task in tasks]
+        finally:
+            clear_worker_trackers()
+
+    if use_shared_output_array:
+        combined_array = np.load(output_file_path, mmap_mode="r")
+        logger.info(f"Shape of output array: {combined_array.shape}")
+        return combined_array
+
+    failed_shard_names = [
+        f"{task[2].name} frames {task[3]} to {task[4]}"
+        for task, shard_array in zip(tasks, shard_arrays)
+        if shard_array is None
+    ]
+    if failed_shard_names:
+        raise ValueError(f"Failed to process video shards: {failed_shard_names}")
+
+    array_list = []
+    for video_index in range(len(video_paths)):
+        video_shard_arrays = [
+            shard_array
+            for shard_array, task_video_index in zip(shard_arrays, task_video_indices)
+            if task_video_index == video_index
+        ]
+        array_list.append(np.concatenate(video_shard_arrays, axis=0))
 
     combined_array = np.stack(array_list)
 
     logger.info(f"Shape of output array: {combined_array.shape}")
-    np.save(output_folder_path, combined_array)
+    np.save(output_file_path, combined_array)
 
     return combined_array
 
 
+def get_frame_shards(
+    number_of_frames: int, num_frame_shards: int
+) -> List[Tuple[int, int]]:
+    """
+    Split a video's frames into contiguous, nearly equal ranges.
+
+    :param number_of_frames: Number of frames in the video.
+    :param num_frame_shards: Number of ranges to split the frames into.
+    :return: List of (start_frame, end_frame) tuples, with end_frame exclusive.
+    """
+    num_frame_shards = max(min(num_frame_shards, number_of_frames), 1)
+    shard_boundaries = np.linspace(0, number_of_frames, num_frame_shards + 1).astype(int)
+    return [
+        (int(start_frame), int(end_frame))
+        for start_frame, end_frame in zip(shard_boundaries[:-1], shard_boundaries[1:])
+    ]
+
+
+def process_video_shard(
+    tracker_name: str,
+    tracking_params: BaseModel,
+    video_path: Path,
+    start_frame: int,
+    end_frame: int,
+    warmup_frames: int = 0,
+    output_file_path: Optional[Path] = None,
+    camera_index: int = 0,
+    checkpoint_folder_path: Optional[Path] = None,
+    result_cache: Optional[ResultCache] = None,
+) -> Optional[np.ndarray]:
+    """
+    Process a contiguous range of frames from a single video with the given tracker.
+
+    :param tracker_name: Tracker to use.
+    :param tracking_params: Tracking parameters to use.
+    :param video_path: Path to video.
+    :param start_frame: Index of the first frame of the shard.
+    :param end_frame: Index one past the last frame of the shard.
+    :param warmup_frames: Number of frames before start_frame to process and discard.
+    :param output_file_path: Memory-mapped output file to write the shard's data into, instead of returning it.
+    :param camera_index: Index of the video's camera in the output file.
+    :param checkpoint_folder_path: Folder to checkpoint the shard's progress in, so it can resume after a crash.
+        Does not checkpoint if None.
+    :param result_cache: Cache to load the shard's data from, and save it to after processing.
+    :return: Array of tracking data for the frames in the shard, or None if it was written to the output file
+    """
+    cache_key = None
+    output_array = None
+    if result_cache is not None:
+        cache_key = result_cache.get_key(
+            video_path=video_path,
+            tracker_name=tracker_name,
+            tracking_params=tracking_params,
+            model_file_name=get_model_file_name(tracker_name, tracking_params),
+            start_frame=start_frame - warmup_frames,
+            end_frame=end_frame,
+        )
+        output_array = result_cache.load(cache_key)
+
+    if output_array is None:
+        tracker = get_worker_tracker(tracker_name=tracker_name, tracking_params=tracking_params)
+        logger.info(
+            f"Processing frames {start_frame} to {end_frame} of video: {video_path.name} with tracker: {tracker.__class__.__name__}"
+        )
+        output_array = tracker.process_video(
+            input_video_filepath=video_path,
+            output_video_filepath=None,
+            save_data_bool=False,
+            use_tqdm=False,
+            start_frame=start_frame - warmup_frames,
+            end_frame=end_frame,
+            resume=checkpoint_folder_path is not None,
+            output_data_filepath=get_task_data_file_path(
+                checkpoint_folder_path, video_path, start_frame - warmup_frames, end_frame
+            ),
+        )
+        if cache_key is not None and output_array is not None:
+            result_cache.save(cache_key, output_array)
+
+    if output_array is None:
+        return None
+    output_array = output_array[warmup_frames:]
+
+    if output_file_path is not None:
+        write_to_shared_output_array(
+            file_path=output_file_path,
+            array=output_array,
+            camera_index=camera_index,
+            start_frame=start_frame,
+        )
+        return None
+    return output_array
+
+
 def process_single_video(
     tracker_name: str,
     tracking_params: BaseModel,
     video_path: Path,
     annotated_video_path: Path,
+    output_file_path: Optional[Path] = None,
+    camera_index: int = 0,
+    checkpoint_folder_path: Optional[Path] = None,
+    result_cache: Optional[ResultCache] = None,
 ) -> Optional[np.ndarray]:
     """
     Process a single video with the given tracker.
@@ -128,101 +575,302 @@ def process_single_video(
     :param tracking_params: Tracking parameters to use.
     :param video_path: Path to video.
     :param annotated_video_path: Path to save annotated video to.
-    :return: Array of tracking data
+    :param output_file_path: Memory-mapped output file to write the video's data into, instead of returning it.
+    :param camera_index: Index of the video's camera in the output file.
+    :param checkpoint_folder_path: Folder to checkpoint the video's progress in, so it can resume after a crash.
+        Does not checkpoint if None.
+    :param result_cache: Cache to load the video's data from, and save it to after processing.
+    :return: Array of tracking data, or None if it was written to the output file
     """
+    video_name = get_annotated_video_name(tracker_name, video_path)
+
+    cache_key = None
+    output_array = None
+    if result_cache is not None:
+        cache_key = result_cache.get_key(
+            video_path=video_path,
+            tracker_name=tracker_name,
+            tracking_params=tracking_params,
+            model_file_name=get_model_file_name(tracker_name, tracking_params),
+        )
+        output_array = result_cache.load(cache_key)
 
-    if tracker_name == "OpenPoseTracker":
-        video_name = video_path.stem + "_openpose.avi"
-    else:
-        video_name = (
-            video_path.stem + "_mediapipe.mp4"
-        )  # TODO: fix it so blender output doesn't require mediapipe addendum here
+    if output_array is None:
+        tracker = get_worker_tracker(tracker_name=tracker_name, tracking_params=tracking_params)
+        logger.info(
+            f"Processing video: {video_name} with tracker: {tracker.__class__.__name__}"
+        )
+        output_array = tracker.process_video(
+            input_video_filepath=video_path,
+            output_video_filepath=annotated_video_path / video_name,
+            save_data_bool=False,
+            resume=checkpoint_folder_path is not None,
+            output_data_filepath=get_task_data_file_path(checkpoint_folder_path, video_path),
+        )  # TODO: raise a custom error here if output_array is None?
+        if cache_key is not None and output_array is not None:
+            result_cache.save(cache_key, output_array)
+
+    if output_file_path is not None and output_array is not None:
+        write_to_shared_output_array(
+            file_path=output_file_path,
+            array=output_array,
+            camera_index=camera_index,
+        )
+        return None
+    return output_array
+
+
+def process_synchronized_videos(
+    model_info: ModelInfo,
+    tracking_params: BaseModel,
+    video_paths: List[Path],
+    output_file_path: Path,
+    annotated_video_path: Path,
+    use_shared_output_array: bool = False,
+) -> np.ndarray:
+    """
+    Process synchronized videos in lockstep with a single tracker, running it on frame i of every camera in one batch.
 
-    tracker = get_tracker(tracker_name=tracker_name, tracking_params=tracking_params)
+    :param model_info: Model info for tracker.
+    :param tracking_params: Tracking parameters to use.
+    :param video_paths: Paths to the synchronized videos.
+    :param output_file_path: Path of the .npy file to save the combined tracking data to.
+    :param annotated_video_path: Folder to save annotated videos to.
+    :param use_shared_output_array: Whether to write each camera's results into a memory-mapped output file
+        instead of saving the stacked array, returning a read-only memory map of the file.
+    :return: Array of tracking data
+    :raise ValueError: If the tracker keeps state between frames, so frames from different cameras cannot share it.
+    """
+    tracker = get_tracker(tracker_name=model_info.tracker_name, tracking_params=tracking_params)
+    if not tracker.processes_frames_independently:
+        raise ValueError(
+            f"{model_info.tracker_name} keeps state between frames, so it cannot be used for synchronized batch inference"
+        )
     logger.info(
-        f"Processing video: {video_name} with tracker: {tracker.__class__.__name__}"
+        f"Processing {len(video_paths)} synchronized videos with tracker: {tracker.__class__.__name__}"
     )
-    output_array = tracker.process_video(
-        input_video_filepath=video_path,
-        output_video_filepath=annotated_video_path / video_name,
-        save_data_bool=False,
-    )  # TODO: raise a custom error here if output_array is None?
+
+    output_array = tracker.process_synchronized_videos(
+        input_video_filepaths=video_paths,
+        output_video_filepaths=[
+            annotated_video_path / get_annotated_video_name(model_info.tracker_name, video_path)
+            for video_path in video_paths
+        ],
+    )
+
+    if use_shared_output_array:
+        create_shared_output_array(file_path=output_file_path, shape=output_array.shape)
+        for camera_index, camera_array in enumerate(output_array):
+            write_to_shared_output_array(
+                file_path=output_file_path,
+                array=camera_array,
+                camera_index=camera_index,
+            )
+        combined_array = np.load(output_file_path, mmap_mode="r")
+        logger.info(f"Shape of output array: {combined_array.shape}")
+        return combined_array
+
+    logger.info(f"Shape of output array: {output_array.shape}")
+    np.save(output_file_path, output_array)
+
     return output_array
 
 
-def get_tracker(tracker_name: str, tracking_params: BaseModel) -> BaseTracker:
+def process_openpose_videos(
+    model_info: ModelInfo,
+    tracking_params: BaseModel,
+    video_paths: List[Path],
+    output_file_path: Path,
+    annotated_video_path: Path,
+    max_concurrent_jobs: int = 1,
+    use_shared_output_array: bool = False,
+    result_cache: Optional[ResultCache] = None,
+) -> np.ndarray:
     """
-    Returns a tracker object based on the given tracker_type and tracking_params.
+    Process videos with OpenPose, running at most `max_concurrent_jobs` OpenPose processes at once from this process.
+    Each video's data is parsed as soon as its OpenPose process finishes, while the others keep running.
 
-    :param tracker_type (str): The type of tracker to be created.
-    :param tracking_params (BaseModel): The tracking parameters to be used for creating the tracker.
-    :return BaseTracker: The tracker object based on the given tracker_type and tracking_params.
-    :raise ValueError: If an invalid tracker_type is provided.
+    :param model_info: Model info for tracker.
+    :param tracking_params: OpenPose tracking parameters, including the per-job thread and memory budget.
+    :param video_paths: Paths to the synchronized videos.
+    :param output_file_path: Path of the .npy file to save the combined tracking data to.
+    :param annotated_video_path: Folder to save annotated videos to.
+    :param max_concurrent_jobs: Maximum number of OpenPose processes running at once.
+    :param use_shared_output_array: Whether to write each video's results into a memory-mapped output file as it finishes.
+    :param result_cache: Cache to load each video's data from instead of running OpenPose, and save new results to.
+    :return: Array of tracking data
+    :raise ValueError: If OpenPose failed on any video.
     """
-    if tracker_name == "MediapipeHolisticTracker":
-        tracker = MediapipeHolisticTracker(
-            model_complexity=tracking_params.mediapipe_model_complexity,
-            min_detection_confidence=tracking_params.min_detection_confidence,
-            min_tracking_confidence=tracking_params.min_tracking_confidence,
-            static_image_mode=tracking_params.static_image_mode,
+    tracker = get_tracker(tracker_name=model_info.tracker_name, tracking_params=tracking_params)
+    if use_shared_output_array:
+        create_shared_output_array(
+            file_path=output_file_path,
+            shape=(
+                len(video_paths),
+                get_synchronized_frame_count(video_paths),
+                tracker.recorder.get_number_of_markers(),
+                3,
+            ),
         )
 
-    elif tracker_name == "YOLOMediapipeComboTracker":
-        tracker = YOLOMediapipeComboTracker(
-            model_size=tracking_params.yolo_model_size,
-            model_complexity=tracking_params.mediapipe_model_complexity,
-            min_detection_confidence=tracking_params.min_detection_confidence,
-            min_tracking_confidence=tracking_params.min_tracking_confidence,
-            static_image_mode=True,  # yolo cropping must be run with static image mode due to changing size of bounding boxes
-            bounding_box_buffer_percentage=tracking_params.bounding_box_buffer_percentage,
-            buffer_size_method=tracking_params.buffer_size_method,
+    output_arrays: List[Optional[np.ndarray]] = [None] * len(video_paths)
+    cache_keys: List[Optional[str]] = [None] * len(video_paths)
+
+    def store_output_array(camera_index: int, output_array: Optional[np.ndarray]) -> None:
+        output_arrays[camera_index] = output_array
+        if output_array is None:
+            return
+        if cache_keys[camera_index] is not None:
+            result_cache.save(cache_keys[camera_index], output_array)
+        if use_shared_output_array:
+            write_to_shared_output_array(
+                file_path=output_file_path,
+                array=output_array,
+                camera_index=camera_index,
+            )
+
+    pending_camera_indices = []
+    for camera_index, video_path in enumerate(video_paths):
+        if result_cache is not None:
+            cache_key = result_cache.get_key(
+                video_path=video_path,
+                tracker_name=model_info.tracker_name,
+                tracking_params=tracking_params,
+            )
+            cached_array = result_cache.load(cache_key)
+            if cached_array is not None:
+                store_output_array(camera_index, cached_array)
+                continue
+            cache_keys[camera_index] = cache_key
+        pending_camera_indices.append(camera_index)
+
+    if pending_camera_indices:
+        scheduler = OpenPoseScheduler(tracker=tracker, max_concurrent_jobs=max_concurrent_jobs)
+        scheduler.run(
+            input_video_filepaths=[video_paths[index] for index in pending_camera_indices],
+            output_video_filepaths=[
+                annotated_video_path
+                / get_annotated_video_name(model_info.tracker_name, video_paths[index])
+                for index in pending_camera_indices
+            ],
+            on_job_finished=lambda job_index, output_array: store_output_array(
+                pending_camera_indices[job_index], output_array
+            ),
         )
 
-    elif tracker_name == "YOLOPoseTracker":
-        tracker = YOLOPoseTracker(
-            model_size="medium",
-        )
+    failed_video_names = [
+        video_path.name
+        for video_path, output_array in zip(video_paths, output_arrays)
+        if output_array is None
+    ]
+    if failed_video_names:
+        raise ValueError(f"OpenPose failed to process videos: {failed_video_names}")
 
-    elif tracker_name == "BrightestPointTracker":
-        tracker = BrightestPointTracker()
+    if use_shared_output_array:
+        combined_array = np.load(output_file_path, mmap_mode="r")
+        logger.info(f"Shape of output array: {combined_array.shape}")
+        return combined_array
 
-    elif tracker_name == "OpenPoseTracker":
-        tracker = OpenPoseTracker(
-            openpose_root_folder_path=tracking_params.openpose_root_folder_path,
-            output_json_folder_path=tracking_params.output_json_path,
-            net_resolution=tracking_params.net_resolution,
-            number_people_max=tracking_params.number_people_max,
-            track_faces=tracking_params.track_face,
-            track_hands=tracking_params.track_hands,
-            output_resolution=tracking_params.output_resolution,
-        )
+    combined_array = np.stack(output_arrays)
 
-    else:
-        raise ValueError("Invalid tracker type")
+    logger.info(f"Shape of output array: {combined_array.shape}")
+    np.save(output_file_path, combined_array)
+
+    return combined_array
+
+
+def get_task_data_file_path(
+    checkpoint_folder_path: Optional[Path],
+    video_path: Path,
+    start_frame: int = 0,
+    end_frame: Optional[int] = None,
+) -> Optional[Path]:
+    """
+    Get the path a task streams its data to when checkpointing, unique to the video and frame range.
+
+    :param checkpoint_folder_path: Folder to checkpoint in, or None when not checkpointing.
+    :param video_path: Path to video.
+    :param start_frame: Index of the first frame the task processes.
+    :param end_frame: Index one past the last frame the task processes, or None for the whole video.
+    :return: Path of the task's .npy data file, or None when not checkpointing
+    """
+    if checkpoint_folder_path is None:
+        return None
+    if end_frame is None:
+        return checkpoint_folder_path / f"{video_path.stem}.npy"
+    return checkpoint_folder_path / f"{video_path.stem}_frames_{start_frame}_{end_frame}.npy"
+
+
+def initialize_worker(tracker_name: str, tracking_params: BaseModel) -> None:
+    """
+    Pool initializer that builds the worker process's tracker up front, so model loading happens once per process
+    rather than once per task.
+
+    :param tracker_name: The type of tracker the worker's tasks use.
+    :param tracking_params: The tracking parameters the worker's tasks use.
+    """
+    get_worker_tracker(tracker_name=tracker_name, tracking_params=tracking_params)
 
+
+def get_worker_tracker(tracker_name: str, tracking_params: BaseModel) -> BaseTracker:
+    """
+    Returns this process's tracker for the given tracker_name and tracking_params, creating it on first use.
+    A reused tracker is cleaned up first, so no recorded data or temporal state carries over from its previous video.
+
+    :param tracker_name: The type of tracker.
+    :param tracking_params: The tracking parameters to be used for creating the tracker.
+    :return BaseTracker: The tracker object for this process.
+    """
+    tracker_key = (
+        tracker_name,
+        type(tracking_params).__name__,
+        tracking_params.model_dump_json(),
+    )
+    tracker = _worker_trackers.get(tracker_key)
+    if tracker is None:
+        tracker = get_tracker(tracker_name=tracker_name, tracking_params=tracking_params)
+        _worker_trackers[tracker_key] = tracker
+    else:
+        tracker.cleanup()
     return tracker
 
 
+def clear_worker_trackers() -> None:
+    """
+    Release the trackers kept by `get_worker_tracker` in this process.
+    """
+    _worker_trackers.clear()
+
+
+def get_tracker(tracker_name: str, tracking_params: BaseModel) -> BaseTracker:
+    """
+    Returns a tracker object based on the given tracker_type and tracking_params.
+    Trackers are looked up in the tracker registry, so only the requested tracker's module is imported.
+
+    :param tracker_type (str): The type of tracker to be created.
+    :param tracking_params (BaseModel): The tracking parameters to be used for creating the tracker.
+    :return BaseTracker: The tracker object based on the given tracker_type and tracking_params.
+    :raise ValueError: If an invalid tracker_type is provided.
+    """
+    return create_tracker(tracker_name=tracker_name, tracking_params=tracking_params)
+
+
 def get_tracker_params(tracker_name: str) -> BaseModel:
-    if tracker_name == "MediapipeHolisticTracker":
-        return MediapipeTrackingParams()
-    elif tracker_name == "YOLOMediapipeComboTracker":
-        return YOLOTrackingParams()  # TODO: figure out how to reference both tracking params in a stable way
-    elif tracker_name == "YOLOPoseTracker":
-        return YOLOTrackingParams()
-    elif tracker_name == "BrightestPointTracker":
-        return BaseModel()
-    elif tracker_name == "OpenPoseTracker":
-        raise ValueError(
-            "OpenPoseTracker requires explicitly setting the OpenPose root folder path and output json path, please provide tracking params directly"
-        )
-    else:
-        raise ValueError("Invalid tracker type")
+    """
+    Returns the default tracking params for the given tracker_type.
+
+    :raise ValueError: If an invalid tracker_type is provided, or the tracker has required tracking params.
+    """
+    return create_default_tracking_params(tracker_name=tracker_name)
 
 
 if __name__ == "__main__":
+    from skellytracker.system.default_paths import get_log_file_path
+    from skellytracker.system.logging_configuration import configure_logging
     from skellytracker.trackers.mediapipe_tracker.mediapipe_model_info import MediapipeModelInfo
 
+    configure_logging(log_file_path=str(get_log_file_path()))
+
     synchronized_video_path = Path(
         "/Your/Path/To/freemocap_data/recording_sessions/freemocap_sample_data/synchronized_videos"
     )
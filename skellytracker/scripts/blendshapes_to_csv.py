@@ -3,6 +3,8 @@ from pathlib import Path
 from typing import Generator
 import pandas as pd
 
+from skellytracker.system.default_paths import get_log_file_path
+from skellytracker.system.logging_configuration import configure_logging
 from skellytracker.trackers.mediapipe_blendshape_tracker.mediapipe_blendshape_tracker import (
     MediapipeBlendshapeTracker,
 )
@@ -52,6 +54,7 @@ def blendshapes_to_csv(
 
 
 def main():
+    configure_logging(log_file_path=str(get_log_file_path()))
     parser = argparse.ArgumentParser(
         prog="skellytracker_blendshapes",
         description="Process a video file to extract MediaPipe blendshapes and save the output video and CSV data.",
@@ -7,6 +7,7 @@ from skellytracker import __package_name__
 BASE_FOLDER_NAME = f"{__package_name__}_data"
 LOGS_INFO_AND_SETTINGS_FOLDER_NAME = "logs_info_and_settings"
 LOG_FILE_FOLDER_NAME = "logs"
+RESULT_CACHE_FOLDER_NAME = "result_cache"
 FIGSHARE_TEST_IMAGE_URL = "https://figshare.com/ndownloader/files/47043898"
 FIGSHARE_CHARUCO_TEST_IMAGE_URL = "https://figshare.com/ndownloader/files/47127685"
 
@@ -28,6 +29,12 @@ def get_log_file_path():
     return log_file_path
 
 
+def get_result_cache_folder_path():
+    result_cache_folder_path = get_base_folder_path() / RESULT_CACHE_FOLDER_NAME
+    result_cache_folder_path.mkdir(exist_ok=True, parents=True)
+    return result_cache_folder_path
+
+
 def create_log_file_name():
     return "log_" + get_iso6201_time_string() + ".log"
 
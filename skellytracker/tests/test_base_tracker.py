@@ -0,0 +1,425 @@
+import threading
+from typing import Optional
+
+import cv2
+import pytest
+import numpy as np
+
+
+from skellytracker.trackers.base_tracker.frame_buffer import (
+    GrowableFrameBuffer,
+    MemoryMappedFrameBuffer,
+)
+from skellytracker.trackers.base_tracker.frame_prefetcher import FramePrefetcher
+from skellytracker.trackers.base_tracker.video_checkpoint import (
+    get_checkpoint_path,
+    load_checkpoint,
+)
+from skellytracker.trackers.base_tracker.video_handler import VideoHandler
+from skellytracker.trackers.bright_point_tracker.brightest_point_recorder import (
+    BrightestPointRecorder,
+)
+from skellytracker.trackers.bright_point_tracker.brightest_point_tracker import (
+    BrightestPointTracker,
+)
+
+
+NUMBER_OF_FRAMES = 20
+FRAME_SIZE = (160, 120)
+
+
+@pytest.fixture()
+def sample_video(tmp_path):
+    """
+    Create a short video of a bright spot moving across a dark background.
+    """
+    video_path = tmp_path / "sample_video.mp4"
+    video_writer = cv2.VideoWriter(
+        str(video_path), cv2.VideoWriter.fourcc(*"mp4v"), 30, FRAME_SIZE
+    )
+    for frame_number in range(NUMBER_OF_FRAMES):
+        image = np.zeros((FRAME_SIZE[1], FRAME_SIZE[0], 3), dtype=np.uint8)
+        cv2.circle(image, (20 + 5 * frame_number, 60), 8, (255, 255, 255), -1)
+        video_writer.write(image)
+    video_writer.release()
+    return video_path
+
+
+def test_process_video_with_prefetch(sample_video):
+    tracker = BrightestPointTracker(num_points=1)
+    prefetched_results = tracker.process_video(
+        sample_video, use_tqdm=False, prefetch_queue_size=4
+    )
+    synchronous_results = tracker.process_video(
+        sample_video, use_tqdm=False, prefetch_queue_size=0
+    )
+
+    assert prefetched_results.shape == (NUMBER_OF_FRAMES, 1, 2)
+    assert np.array_equal(prefetched_results, synchronous_results)
+    assert np.allclose(
+        prefetched_results[:, 0, 0], 20 + 5 * np.arange(NUMBER_OF_FRAMES), atol=1
+    )
+
+
+def test_frame_prefetcher_stops_early(sample_video):
+    cap = cv2.VideoCapture(str(sample_video))
+    with FramePrefetcher(capture=cap, number_of_frames=NUMBER_OF_FRAMES, queue_size=2) as prefetcher:
+        ret, frame = prefetcher.read()
+    cap.release()
+
+    assert ret
+    assert frame.shape == (FRAME_SIZE[1], FRAME_SIZE[0], 3)
+
+
+def test_frame_prefetcher_reports_missing_frames(sample_video):
+    cap = cv2.VideoCapture(str(sample_video))
+    with FramePrefetcher(capture=cap, number_of_frames=NUMBER_OF_FRAMES + 5, queue_size=2) as prefetcher:
+        frames = []
+        ret, frame = prefetcher.read()
+        while ret:
+            frames.append(frame)
+            ret, frame = prefetcher.read()
+    cap.release()
+
+    assert len(frames) == NUMBER_OF_FRAMES
+    assert frame is None
+
+
+class FailingCapture:
+    """
+    A capture that returns a few frames, then fails with an error that is not a decoding error.
+    """
+
+    def __init__(self, number_of_good_frames: int):
+        self.number_of_good_frames = number_of_good_frames
+        self.frames_read = 0
+
+    def read(self):
+        if self.frames_read >= self.number_of_good_frames:
+            raise ValueError("capture failed")
+        self.frames_read += 1
+        return True, np.zeros((FRAME_SIZE[1], FRAME_SIZE[0], 3), dtype=np.uint8)
+
+
+def test_frame_prefetcher_reraises_thread_errors():
+    with FramePrefetcher(
+        capture=FailingCapture(number_of_good_frames=3),
+        number_of_frames=NUMBER_OF_FRAMES,
+        queue_size=2,
+    ) as prefetcher:
+        for _frame_number in range(3):
+            ret, _ = prefetcher.read()
+            assert ret
+        with pytest.raises(RuntimeError) as exception_info:
+            prefetcher.read()
+
+    assert isinstance(exception_info.value.__cause__, ValueError)
+
+
+@pytest.mark.parametrize("async_write", [True, False])
+def test_process_video_writes_annotated_video(sample_video, tmp_path, async_write):
+    output_video_path = tmp_path / "annotated_video.mp4"
+    tracker = BrightestPointTracker(num_points=1)
+    tracker.process_video(
+        sample_video,
+        output_video_filepath=output_video_path,
+        use_tqdm=False,
+        async_video_writing=async_write,
+    )
+    # frames were annotated into the renderer's buffer while writing, and later annotations get their own array
+    assert tracker.renderer._buffer is not None
+    assert not tracker.reuse_annotation_buffer
+
+    cap = cv2.VideoCapture(str(output_video_path))
+    assert int(cap.get(cv2.CAP_PROP_FRAME_COUNT)) == NUMBER_OF_FRAMES
+    assert int(cap.get(cv2.CAP_PROP_FRAME_WIDTH)) == FRAME_SIZE[0]
+    assert int(cap.get(cv2.CAP_PROP_FRAME_HEIGHT)) == FRAME_SIZE[1]
+    cap.release()
+
+
+class FailingVideoWriter:
+    def __init__(self, error: Optional[Exception] = None):
+        self.error = error if error is not None else cv2.error("write failed")
+
+    def write(self, frame):
+        raise self.error
+
+    def release(self):
+        pass
+
+
+@pytest.mark.parametrize("raise_errors", [True, False])
+def test_video_handler_close_reports_writer_errors(tmp_path, raise_errors):
+    video_handler = VideoHandler(
+        output_path=tmp_path / "annotated_video.mp4", frame_size=FRAME_SIZE, async_write=True
+    )
+    video_handler.video_writer.release()
+    video_handler.video_writer = FailingVideoWriter()
+    video_handler.add_frame(np.zeros((FRAME_SIZE[1], FRAME_SIZE[0], 3), dtype=np.uint8))
+
+    if raise_errors:
+        with pytest.raises(cv2.error):
+            video_handler.close(raise_errors=raise_errors)
+    else:
+        video_handler.close(raise_errors=raise_errors)
+
+
+def test_video_handler_add_frame_raises_writer_errors(tmp_path):
+    video_handler = VideoHandler(
+        output_path=tmp_path / "annotated_video.mp4",
+        frame_size=FRAME_SIZE,
+        async_write=True,
+        buffer_size=2,
+    )
+    video_handler.video_writer.release()
+    video_handler.video_writer = FailingVideoWriter(ValueError("write failed"))
+    frame = np.zeros((FRAME_SIZE[1], FRAME_SIZE[0], 3), dtype=np.uint8)
+
+    errors = []
+
+    def add_frames():
+        try:
+            for _frame_number in range(NUMBER_OF_FRAMES):
+                video_handler.add_frame(frame)
+        except ValueError as e:
+            errors.append(e)
+
+    # run on a thread, so a regression fails the test instead of hanging it
+    adding_thread = threading.Thread(target=add_frames, daemon=True)
+    adding_thread.start()
+    adding_thread.join(timeout=10)
+
+    assert not adding_thread.is_alive()
+    assert len(errors) == 1
+    with pytest.raises(ValueError):
+        video_handler.close()
+
+
+def test_growable_frame_buffer():
+    frame_buffer = GrowableFrameBuffer(frame_shape=(3, 2), initial_capacity=2)
+    for frame_number in range(5):
+        frame = frame_buffer.next_frame()
+        assert np.isnan(frame).all()
+        frame[0] = frame_number
+
+    assert len(frame_buffer) == 5
+    assert frame_buffer.capacity >= 5
+    assert frame_buffer.array.shape == (5, 3, 2)
+    assert np.array_equal(frame_buffer.array[:, 0, 0], np.arange(5))
+    assert np.isnan(frame_buffer.array[:, 1:]).all()
+
+    frame_buffer.clear()
+    assert len(frame_buffer) == 0
+    assert frame_buffer.capacity == 2
+
+
+def test_process_video_in_batches(sample_video):
+    tracker = BrightestPointTracker(num_points=1)
+    single_frame_results = tracker.process_video(sample_video, use_tqdm=False)
+    batched_results = tracker.process_video(
+        sample_video, use_tqdm=False, batch_size=3
+    )
+
+    assert batched_results.shape == (NUMBER_OF_FRAMES, 1, 2)
+    assert np.array_equal(batched_results, single_frame_results)
+
+
+def test_process_video_frame_range(sample_video):
+    tracker = BrightestPointTracker(num_points=1)
+    full_results = tracker.process_video(sample_video, use_tqdm=False)
+    range_results = tracker.process_video(
+        sample_video, use_tqdm=False, start_frame=5, end_frame=12
+    )
+
+    assert range_results.shape == (7, 1, 2)
+    assert np.array_equal(range_results, full_results[5:12])
+
+
+def test_process_video_streams_data_to_file(sample_video):
+    tracker = BrightestPointTracker(num_points=1)
+    in_memory_results = tracker.process_video(sample_video, use_tqdm=False)
+    streamed_results = tracker.process_video(
+        sample_video, use_tqdm=False, stream_data_to_file=True, stream_chunk_size=6
+    )
+
+    assert isinstance(streamed_results, np.memmap)
+    assert np.array_equal(streamed_results, in_memory_results)
+    assert np.array_equal(
+        np.load(sample_video.with_suffix(".npy")), in_memory_results
+    )
+
+
+def test_memory_mapped_frame_buffer_truncates(tmp_path):
+    file_path = tmp_path / "data.npy"
+    frame_buffer = MemoryMappedFrameBuffer(
+        file_path=file_path, number_of_frames=10, frame_shape=(3, 2)
+    )
+    frame_buffer.append_frames(np.zeros((3, 3, 2)))
+    frame_buffer.next_frame()[0] = 1
+    assert len(frame_buffer) == 4
+    with pytest.raises(ValueError):
+        frame_buffer.append_frames(np.zeros((7, 3, 2)))
+    frame_buffer.close()
+
+    saved_data = np.load(file_path)
+    assert saved_data.shape == (4, 3, 2)
+    assert np.array_equal(saved_data[:3], np.zeros((3, 3, 2)))
+    assert np.array_equal(saved_data[3, 0], [1, 1])
+    assert np.isnan(saved_data[3, 1:]).all()
+
+
+class CrashingRecorder(BrightestPointRecorder):
+    """
+    Recorder that raises after recording a set number of frames, to simulate a crash part way through a video.
+    """
+
+    def __init__(self, crash_after_frames: int):
+        super().__init__()
+        self.crash_after_frames = crash_after_frames
+        self.number_of_frames_recorded = 0
+
+    def record(self, tracked_objects):
+        if self.number_of_frames_recorded == self.crash_after_frames:
+            raise RuntimeError("Simulated crash")
+        self.number_of_frames_recorded += 1
+        super().record(tracked_objects)
+
+
+def test_process_video_resumes_from_checkpoint(sample_video):
+    tracker = BrightestPointTracker(num_points=1)
+    expected_results = tracker.process_video(sample_video, use_tqdm=False)
+
+    tracker.recorder = CrashingRecorder(crash_after_frames=13)
+    with pytest.raises(RuntimeError):
+        tracker.process_video(
+            sample_video, use_tqdm=False, resume=True, stream_chunk_size=5
+        )
+    checkpoint = load_checkpoint(get_checkpoint_path(sample_video.with_suffix(".npy")))
+    assert checkpoint.number_of_frames_completed == 10
+
+    tracker.recorder = CrashingRecorder(crash_after_frames=NUMBER_OF_FRAMES - 10)
+    resumed_results = tracker.process_video(
+        sample_video, use_tqdm=False, resume=True, stream_chunk_size=5
+    )
+    assert np.array_equal(resumed_results, expected_results)
+
+    # a completed run is loaded from file without processing any frames
+    tracker.recorder = CrashingRecorder(crash_after_frames=0)
+    reloaded_results = tracker.process_video(sample_video, use_tqdm=False, resume=True)
+    assert np.array_equal(reloaded_results, expected_results)
+
+
+class TwoBrightestPointsTracker(BrightestPointTracker):
+    def __init__(self):
+        super().__init__(num_points=2)
+
+
+def test_process_video_ignores_checkpoints_from_other_trackers(sample_video):
+    BrightestPointTracker(num_points=1).process_video(sample_video, use_tqdm=False, resume=True)
+
+    results = TwoBrightestPointsTracker().process_video(sample_video, use_tqdm=False, resume=True)
+
+    assert results.shape == (NUMBER_OF_FRAMES, 2, 2)
+    checkpoint = load_checkpoint(get_checkpoint_path(sample_video.with_suffix(".npy")))
+    assert checkpoint.tracker_name == "TwoBrightestPointsTracker"
+
+
+def test_process_video_resume_keeps_annotated_video(sample_video, tmp_path):
+    output_video_path = tmp_path / "annotated_video.mp4"
+    tracker = BrightestPointTracker(num_points=1)
+    tracker.recorder = CrashingRecorder(crash_after_frames=13)
+    with pytest.raises(RuntimeError):
+        tracker.process_video(
+            sample_video,
+            output_video_filepath=output_video_path,
+            use_tqdm=False,
+            resume=True,
+            stream_chunk_size=5,
+        )
+    annotated_video_bytes = output_video_path.read_bytes()
+
+    tracker.recorder = BrightestPointRecorder()
+    tracker.process_video(
+        sample_video,
+        output_video_filepath=output_video_path,
+        use_tqdm=False,
+        resume=True,
+        stream_chunk_size=5,
+    )
+
+    assert output_video_path.read_bytes() == annotated_video_bytes
+
+
+def test_cleanup_resets_temporal_state(sample_video):
+    tracker = BrightestPointTracker(num_points=1)
+    image = np.zeros((FRAME_SIZE[1], FRAME_SIZE[0], 3), dtype=np.uint8)
+    cv2.circle(image, (40, 60), 8, (255, 255, 255), -1)
+    tracker.process_image(image)
+    assert tracker.tracked_objects["brightest_point_0"].pixel_x is not None
+
+    tracker.cleanup()
+
+    assert tracker.tracked_objects["brightest_point_0"].pixel_x is None
+    assert tracker.annotated_image is None
+
+
+class CountingBrightestPointTracker(BrightestPointTracker):
+    def __init__(self, **kwargs):
+        super().__init__(**kwargs)
+        self.annotation_count = 0
+
+    def annotate_image(self, image, tracked_objects, **kwargs):
+        self.annotation_count += 1
+        return super().annotate_image(image, tracked_objects, **kwargs)
+
+
+def test_annotation_is_lazy(sample_video, tmp_path):
+    tracker = CountingBrightestPointTracker(num_points=1, luminance_threshold=200)
+
+    tracker.process_video(sample_video, use_tqdm=False)
+    assert tracker.annotation_count == 0
+
+    tracker.process_video(
+        sample_video,
+        output_video_filepath=tmp_path / "annotated_video.mp4",
+        use_tqdm=False,
+    )
+    assert tracker.annotation_count == NUMBER_OF_FRAMES
+
+    image = np.zeros((FRAME_SIZE[1], FRAME_SIZE[0], 3), dtype=np.uint8)
+    tracker.process_image(image)
+    assert tracker.annotated_image is not None
+    assert tracker.annotated_image is not None
+    assert tracker.annotation_count == NUMBER_OF_FRAMES + 1
+
+    tracker.annotate = False
+    tracker.process_image(image)
+    assert tracker.annotated_image is None
+    assert tracker.annotation_count == NUMBER_OF_FRAMES + 1
+
+
+def test_process_synchronized_videos(sample_video, tmp_path):
+    tracker = BrightestPointTracker(num_points=1)
+    single_video_results = tracker.process_video(sample_video, use_tqdm=False)
+
+    output_video_paths = [tmp_path / f"annotated_video_{index}.mp4" for index in range(2)]
+    synchronized_results = tracker.process_synchronized_videos(
+        [sample_video, sample_video],
+        output_video_filepaths=output_video_paths,
+        use_tqdm=False,
+    )
+
+    assert synchronized_results.shape == (2, NUMBER_OF_FRAMES, 1, 2)
+    assert np.array_equal(synchronized_results[0], single_video_results)
+    assert np.array_equal(synchronized_results[1], single_video_results)
+    for output_video_path in output_video_paths:
+        cap = cv2.VideoCapture(str(output_video_path))
+        assert int(cap.get(cv2.CAP_PROP_FRAME_COUNT)) == NUMBER_OF_FRAMES
+        cap.release()
+
+
+def test_process_synchronized_videos_requires_independent_frames(sample_video):
+    tracker = BrightestPointTracker(num_points=1, search_window_size=20)
+    assert not tracker.processes_frames_independently
+    with pytest.raises(ValueError):
+        tracker.process_synchronized_videos([sample_video, sample_video], use_tqdm=False)
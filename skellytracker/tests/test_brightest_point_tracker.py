@@ -87,3 +87,75 @@ def test_record(sample_image):
     assert len(tracker.recorder.recorded_objects) == 1
 
     assert len(tracker.recorder.recorded_objects[0]) == 2
+
+
+@pytest.mark.parametrize("subpixel_refinement", [False, True])
+def test_process_image_downscaled(subpixel_refinement):
+    image = np.zeros((400, 400, 3), dtype=np.uint8)
+    cv2.circle(image, (121, 281), 30, (255, 255, 255), -1)
+    tracker = BrightestPointTracker(
+        num_points=1,
+        luminance_threshold=200,
+        inference_scale=0.25,
+        subpixel_refinement=subpixel_refinement,
+    )
+    tracked_objects = tracker.process_image(image)
+
+    tolerance = 0.5 if subpixel_refinement else 2
+    assert tracked_objects["brightest_point_0"].pixel_x == pytest.approx(121, abs=tolerance)
+    assert tracked_objects["brightest_point_0"].pixel_y == pytest.approx(281, abs=tolerance)
+
+
+def test_resize_for_inference():
+    image = np.zeros((1080, 1920, 3), dtype=np.uint8)
+    tracker = BrightestPointTracker(inference_width=480)
+    inference_image, scale = tracker.resize_for_inference(image)
+
+    assert inference_image.shape == (270, 480, 3)
+    image_corners = tracker.map_to_full_resolution(
+        np.array([[-0.5, -0.5], [479.5, 269.5]]), scale
+    )
+    assert np.allclose(image_corners, [[-0.5, -0.5], [1919.5, 1079.5]])
+
+    tracker.inference_width = 3840
+    inference_image, scale = tracker.resize_for_inference(image)
+    assert inference_image is image
+    assert np.all(scale == 1)
+
+
+def test_process_image_with_search_window():
+    tracker = BrightestPointTracker(
+        num_points=2, luminance_threshold=200, search_window_size=41
+    )
+    full_frame_search = tracker.search_full_frame
+    full_frame_search_count = 0
+
+    def count_full_frame_searches(image):
+        nonlocal full_frame_search_count
+        full_frame_search_count += 1
+        return full_frame_search(image)
+
+    tracker.search_full_frame = count_full_frame_searches
+
+    for frame_number in range(10):
+        image = np.zeros((200, 200, 3), dtype=np.uint8)
+        cv2.circle(image, (20 + 8 * frame_number, 50), 8, (255, 255, 255), -1)
+        cv2.circle(image, (100, 180 - 8 * frame_number), 5, (255, 255, 255), -1)
+        tracked_objects = tracker.process_image(image)
+
+        assert tracked_objects["brightest_point_0"].pixel_x == 20 + 8 * frame_number
+        assert tracked_objects["brightest_point_0"].pixel_y == 50
+        assert tracked_objects["brightest_point_1"].pixel_x == 100
+        assert tracked_objects["brightest_point_1"].pixel_y == 180 - 8 * frame_number
+
+    assert full_frame_search_count == 1
+
+    # a lost point falls back to a full frame search
+    tracked_objects = tracker.process_image(np.zeros((200, 200, 3), dtype=np.uint8))
+    assert tracked_objects["brightest_point_0"].pixel_x is None
+    assert full_frame_search_count == 2
+
+    tracker.process_image(image)
+    tracker.reset_temporal_state()
+    tracker.process_image(image)
+    assert full_frame_search_count == 4
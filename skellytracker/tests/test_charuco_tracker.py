@@ -3,6 +3,7 @@ import pytest
 import numpy as np
 
 
+from skellytracker.trackers.charuco_tracker.charuco_recorder import CharucoRecorder
 from skellytracker.trackers.charuco_tracker.charuco_tracker import CharucoTracker
 
 
@@ -145,3 +146,120 @@ def test_record(charuco_test_image):
     # )
     # assert np.allclose(processed_results[:, :, :2], expected_results[:, :, :2], atol=1e-2)
     # assert np.isnan(processed_results[:, :, 2]).all()
+
+
+def test_record_corners():
+    recorder = CharucoRecorder(number_of_corners=4)
+    recorder.record_corners(np.array([0, 2]), np.array([[1.0, 2.0], [3.0, 4.0]]))
+    recorder.record_corners(np.array([], dtype=np.int64), np.empty((0, 2)))
+    assert len(recorder.recorded_objects) == 2
+
+    processed_results = recorder.process_tracked_objects()
+    assert processed_results.shape == (2, 4, 2)
+    assert np.array_equal(processed_results[0, [0, 2]], [[1.0, 2.0], [3.0, 4.0]])
+    assert np.isnan(processed_results[0, [1, 3]]).all()
+    assert np.isnan(processed_results[1]).all()
+
+    recorder.clear_recorded_objects()
+    assert len(recorder.recorded_objects) == 0
+
+
+def test_tracker_records_corner_arrays():
+    charuco_squares_x_in = 7
+    charuco_squares_y_in = 5
+    number_of_charuco_markers = (charuco_squares_x_in - 1) * (charuco_squares_y_in - 1)
+    charuco_ids = [str(index) for index in range(number_of_charuco_markers)]
+
+    tracker = CharucoTracker(
+        tracked_object_names=charuco_ids,
+        squares_x=charuco_squares_x_in,
+        squares_y=charuco_squares_y_in,
+        dictionary=cv2.aruco.getPredefinedDictionary(cv2.aruco.DICT_4X4_250),
+    )
+    board_image = cv2.cvtColor(
+        tracker.board.generateImage((700, 500), marginSize=20), cv2.COLOR_GRAY2BGR
+    )
+    image = np.full((700, 900, 3), 255, dtype=np.uint8)
+    image[100:600, 100:800] = board_image
+
+    tracked_objects = tracker.process_image(image)
+    assert len(tracker.charuco_ids) > 3
+    tracker.record_tracked_objects(tracker.recorder)
+    tracker.recorder.record(tracked_objects)
+
+    processed_results = tracker.recorder.process_tracked_objects()
+    assert processed_results.shape == (2, len(charuco_ids), 2)
+    assert np.array_equal(processed_results[0], processed_results[1], equal_nan=True)
+    for corner_index, name in enumerate(charuco_ids):
+        if corner_index in tracker.charuco_ids:
+            assert np.allclose(
+                processed_results[0, corner_index],
+                (tracked_objects[name].pixel_x, tracked_objects[name].pixel_y),
+            )
+        else:
+            assert tracked_objects[name].pixel_x is None
+            assert np.isnan(processed_results[0, corner_index]).all()
+
+
+def test_process_image_with_roi():
+    charuco_squares_x_in = 7
+    charuco_squares_y_in = 5
+    number_of_charuco_markers = (charuco_squares_x_in - 1) * (charuco_squares_y_in - 1)
+    charuco_ids = [str(index) for index in range(number_of_charuco_markers)]
+
+    def create_tracker(**kwargs):
+        return CharucoTracker(
+            tracked_object_names=charuco_ids,
+            squares_x=charuco_squares_x_in,
+            squares_y=charuco_squares_y_in,
+            dictionary=cv2.aruco.getPredefinedDictionary(cv2.aruco.DICT_4X4_250),
+            marker_length=0.7,
+            **kwargs,
+        )
+
+    full_frame_tracker = create_tracker()
+    roi_tracker = create_tracker(track_roi=True)
+    assert not roi_tracker.processes_frames_independently
+
+    board_image = cv2.cvtColor(
+        full_frame_tracker.board.generateImage((350, 250), marginSize=10), cv2.COLOR_GRAY2BGR
+    )
+    detection_boxes = []
+    detect_board = roi_tracker.detect_board
+
+    def record_detection_box(image, box_xyxy=None):
+        detection_boxes.append(box_xyxy)
+        return detect_board(image, box_xyxy)
+
+    roi_tracker.detect_board = record_detection_box
+
+    # the board drifts, is partly covered, then jumps out of the previous frame's crop
+    board_positions = [(100, 100), (110, 105), (120, 110), (125, 112), (700, 400), (710, 405)]
+    # per frame, whether each detection searched a crop (True) or the full frame (False)
+    frame_detection_boxes = []
+    for frame_index, (board_x, board_y) in enumerate(board_positions):
+        image = np.full((720, 1280, 3), 200, dtype=np.uint8)
+        image[board_y : board_y + 250, board_x : board_x + 350] = board_image
+        if frame_index == 3:
+            image[board_y : board_y + 250, board_x + 250 : board_x + 350] = 200
+        image = cv2.GaussianBlur(image, (5, 5), 0)
+
+        full_frame_tracker.process_image(image)
+        detection_boxes.clear()
+        roi_tracker.process_image(image)
+        frame_detection_boxes.append([box is not None for box in detection_boxes])
+
+        assert len(roi_tracker.charuco_ids) == (16 if frame_index == 3 else 24)
+        assert np.array_equal(roi_tracker.charuco_ids, full_frame_tracker.charuco_ids)
+        assert np.allclose(
+            roi_tracker.charuco_corners, full_frame_tracker.charuco_corners, atol=1e-3
+        )
+
+    # while the board stays within the crop, only the crop is searched, even when fewer corners are found
+    assert frame_detection_boxes == [[False], [True], [True], [True], [True, False], [True]]
+
+    roi_x1, roi_y1, roi_x2, roi_y2 = roi_tracker._roi_box_xyxy
+    assert (roi_x2 - roi_x1) * (roi_y2 - roi_y1) < 720 * 1280 / 4
+
+    roi_tracker.reset_temporal_state()
+    assert roi_tracker._roi_box_xyxy is None
@@ -122,3 +122,32 @@ def test_record(test_image):
     assert np.allclose(
         processed_results[:, :60, :], expected_results[:, :60, :], atol=1
     )
+
+
+@pytest.mark.usefixtures("test_image")
+def test_record_to_array(test_image):
+    tracker = MediapipeHolisticTracker(model_complexity=0)
+    array_tracker = MediapipeHolisticTracker(model_complexity=0, record_to_array=True)
+
+    tracked_objects = tracker.process_image(test_image)
+    tracker.recorder.record(tracked_objects=tracked_objects)
+    array_tracked_objects = array_tracker.process_image(test_image)
+    array_tracker.recorder.record(tracked_objects=array_tracked_objects)
+
+    assert len(array_tracker.recorder.recorded_objects) == 0
+    assert len(array_tracker.recorder.landmark_buffer) == 1
+
+    processed_results = tracker.recorder.process_tracked_objects(
+        image_size=test_image.shape[:2]
+    )
+    array_processed_results = array_tracker.recorder.process_tracked_objects(
+        image_size=test_image.shape[:2]
+    )
+    assert array_processed_results.shape == (
+        1,
+        MediapipeModelInfo.num_tracked_points,
+        3,
+    )
+    assert np.allclose(
+        array_processed_results, processed_results, atol=1e-3, equal_nan=True
+    )
@@ -0,0 +1,136 @@
+import json
+import threading
+import time
+
+import numpy as np
+import pytest
+
+from skellytracker.trackers.openpose_tracker.openpose_archive import (
+    get_openpose_archive_path,
+)
+from skellytracker.trackers.openpose_tracker.openpose_json_ingestor import (
+    OpenPoseJsonIngestor,
+)
+from skellytracker.trackers.openpose_tracker.openpose_model_info import (
+    OpenPoseModelInfo,
+)
+from skellytracker.trackers.openpose_tracker.openpose_recorder import OpenPoseRecorder
+from skellytracker.trackers.openpose_tracker.openpose_tracker import (
+    consolidate_openpose_jsons,
+)
+
+
+NUMBER_OF_FRAMES = 12
+
+
+def write_keypoints_json(json_directory, frame_index, detected=True):
+    """
+    Write a fake OpenPose keypoints file, with every body keypoint at (frame_index, frame_index).
+    """
+    people = []
+    if detected:
+        people.append(
+            {
+                "pose_keypoints_2d": [frame_index, frame_index, 1.0]
+                * OpenPoseModelInfo.num_tracked_points_body,
+                "hand_left_keypoints_2d": [0.0, 0.0, 0.0]
+                * OpenPoseModelInfo.num_tracked_points_left_hand,
+                "hand_right_keypoints_2d": [0.0, 0.0, 0.0]
+                * OpenPoseModelInfo.num_tracked_points_right_hand,
+                "face_keypoints_2d": [0.0, 0.0, 0.0]
+                * OpenPoseModelInfo.num_tracked_points_face,
+            }
+        )
+    json_path = json_directory / f"video_{frame_index:012d}_keypoints.json"
+    with open(json_path, "w") as json_file:
+        json.dump({"version": 1.3, "people": people}, json_file)
+
+
+@pytest.fixture()
+def json_directory(tmp_path):
+    json_directory = tmp_path / "openpose_jsons" / "video"
+    json_directory.mkdir(parents=True)
+    return json_directory
+
+
+def test_json_ingestor_matches_parse_openpose_jsons(json_directory):
+    for frame_index in range(NUMBER_OF_FRAMES):
+        write_keypoints_json(json_directory, frame_index, detected=frame_index != 3)
+
+    recorder = OpenPoseRecorder(track_hands=True, track_faces=True)
+    parsed_array = recorder.parse_openpose_jsons(json_directory)
+    ingested_array = OpenPoseJsonIngestor(recorder, json_directory).finish()
+
+    assert ingested_array.shape == (NUMBER_OF_FRAMES, OpenPoseModelInfo.num_tracked_points, 3)
+    assert np.array_equal(ingested_array, parsed_array, equal_nan=True)
+    assert np.isnan(ingested_array[3]).all()
+
+
+def test_parse_openpose_jsons_accepts_string_path(json_directory):
+    for frame_index in range(NUMBER_OF_FRAMES):
+        write_keypoints_json(json_directory, frame_index)
+
+    recorder = OpenPoseRecorder(track_hands=True, track_faces=True)
+    data_array = recorder.parse_openpose_jsons(str(json_directory))
+
+    assert data_array.shape == (NUMBER_OF_FRAMES, OpenPoseModelInfo.num_tracked_points, 3)
+    assert np.array_equal(data_array[:, 0, 0], np.arange(NUMBER_OF_FRAMES))
+
+
+def test_json_ingestor_parses_while_files_are_written(json_directory):
+    recorder = OpenPoseRecorder(track_hands=True, track_faces=True)
+    json_ingestor = OpenPoseJsonIngestor(
+        recorder, json_directory, number_of_frames=4, poll_interval_seconds=0.01
+    )
+
+    def write_jsons():
+        for frame_index in range(NUMBER_OF_FRAMES):
+            # leave a partially written file for the watcher to find before completing it
+            partial_path = json_directory / f"video_{frame_index:012d}_keypoints.json"
+            partial_path.write_text('{"version": 1.3, "peo')
+            time.sleep(0.005)
+            write_keypoints_json(json_directory, frame_index)
+
+    json_ingestor.start()
+    writer_thread = threading.Thread(target=write_jsons)
+    writer_thread.start()
+    writer_thread.join()
+    ingested_array = json_ingestor.finish()
+
+    assert ingested_array.shape[0] == NUMBER_OF_FRAMES
+    assert np.array_equal(
+        ingested_array[:, 0, 0], np.arange(NUMBER_OF_FRAMES, dtype=np.float64)
+    )
+
+
+def test_json_ingestor_rejects_missing_frames(json_directory):
+    write_keypoints_json(json_directory, 0)
+    write_keypoints_json(json_directory, 2)
+
+    recorder = OpenPoseRecorder(track_hands=True, track_faces=True)
+    with pytest.raises(ValueError):
+        OpenPoseJsonIngestor(recorder, json_directory).finish()
+
+
+@pytest.mark.parametrize("delete_jsons", [False, True])
+def test_consolidate_openpose_jsons(json_directory, delete_jsons):
+    for frame_index in range(NUMBER_OF_FRAMES):
+        write_keypoints_json(json_directory, frame_index, detected=frame_index != 3)
+
+    recorder = OpenPoseRecorder(track_hands=True, track_faces=True)
+    parsed_array = recorder.parse_openpose_jsons(json_directory)
+
+    archive_path = consolidate_openpose_jsons(json_directory, delete_jsons=delete_jsons)
+
+    assert archive_path == get_openpose_archive_path(json_directory)
+    assert archive_path.exists()
+    assert json_directory.exists() != delete_jsons
+    archived_array = recorder.process_tracked_objects(output_json_path=json_directory)
+    assert np.allclose(archived_array, parsed_array, equal_nan=True)
+
+    body_recorder = OpenPoseRecorder(track_hands=False, track_faces=False)
+    body_array = body_recorder.process_tracked_objects(output_json_path=json_directory)
+    assert body_array.shape == (NUMBER_OF_FRAMES, OpenPoseModelInfo.num_tracked_points_body, 3)
+    assert np.allclose(
+        body_array, parsed_array[:, : OpenPoseModelInfo.num_tracked_points_body], equal_nan=True
+    )
@@ -0,0 +1,179 @@
+import logging
+import sys
+
+import cv2
+import numpy as np
+import pytest
+
+from skellytracker.process_folder_of_videos import process_folder_of_videos
+from skellytracker.trackers.openpose_tracker.openpose_model_info import (
+    OpenPoseModelInfo,
+    OpenPoseTrackingParams,
+)
+from skellytracker.trackers.openpose_tracker.openpose_scheduler import OpenPoseScheduler
+from skellytracker.trackers.openpose_tracker.openpose_tracker import OpenPoseTracker
+from skellytracker.utilities.get_video_paths import get_video_paths
+
+
+NUMBER_OF_FRAMES = 6
+FRAME_SIZE = (64, 48)
+
+# writes one keypoints file per frame, with every body keypoint at (camera_number, frame_index),
+# and fails on videos with "broken" in their name
+STUB_OPENPOSE_SOURCE = """
+import json
+import pathlib
+import re
+import sys
+
+arguments = sys.argv[1:]
+video_path = pathlib.Path(arguments[arguments.index("--video") + 1])
+json_path = pathlib.Path(arguments[arguments.index("--write_json") + 1])
+print(f"Starting OpenPose demo on {video_path.name}")
+if "broken" in video_path.name:
+    print("Error: could not open video")
+    sys.exit(1)
+camera_number = int(re.search(r"(\\d+)$", video_path.stem).group(1))
+for frame_index in range(NUMBER_OF_FRAMES):
+    person = {
+        "pose_keypoints_2d": [camera_number, frame_index, 1.0] * 25,
+        "hand_left_keypoints_2d": [0.0] * 63,
+        "hand_right_keypoints_2d": [0.0] * 63,
+        "face_keypoints_2d": [0.0] * 210,
+    }
+    keypoints_path = json_path / f"{video_path.stem}_{frame_index:012d}_keypoints.json"
+    keypoints_path.write_text(json.dumps({"version": 1.3, "people": [person]}))
+print("OpenPose demo successfully finished")
+"""
+
+
+@pytest.fixture()
+def stub_openpose_root(tmp_path):
+    """
+    Create an OpenPose root folder with a stub executable that writes fake keypoint JSONs.
+    """
+    openpose_root = tmp_path / "openpose"
+    (openpose_root / "bin").mkdir(parents=True)
+    executable_path = openpose_root / "bin" / "OpenPoseDemo.exe"
+    executable_path.write_text(
+        f"#!{sys.executable}\nNUMBER_OF_FRAMES = {NUMBER_OF_FRAMES}\n" + STUB_OPENPOSE_SOURCE
+    )
+    executable_path.chmod(0o755)
+    return openpose_root
+
+
+def write_video(video_path):
+    video_writer = cv2.VideoWriter(
+        str(video_path), cv2.VideoWriter.fourcc(*"mp4v"), 30, FRAME_SIZE
+    )
+    for _ in range(NUMBER_OF_FRAMES):
+        video_writer.write(np.zeros((FRAME_SIZE[1], FRAME_SIZE[0], 3), dtype=np.uint8))
+    video_writer.release()
+
+
+@pytest.fixture()
+def synchronized_video_path(tmp_path):
+    video_folder = tmp_path / "synchronized_videos"
+    video_folder.mkdir()
+    for camera_number in range(3):
+        write_video(video_folder / f"camera_{camera_number}.mp4")
+    return video_folder
+
+
+@pytest.mark.skipif(sys.platform == "win32", reason="the stub executable relies on a shebang")
+def test_scheduler_runs_jobs(stub_openpose_root, synchronized_video_path, tmp_path, caplog):
+    tracker = OpenPoseTracker(
+        openpose_root_folder_path=stub_openpose_root,
+        output_json_folder_path=tmp_path / "openpose_jsons",
+        threads_per_job=1,
+    )
+    scheduler = OpenPoseScheduler(tracker, max_concurrent_jobs=2)
+    video_paths = sorted(synchronized_video_path.glob("*.mp4"))
+
+    finished_jobs = []
+    with caplog.at_level(logging.INFO):
+        output_arrays = scheduler.run(
+            video_paths,
+            [tmp_path / f"{video_path.stem}_openpose.avi" for video_path in video_paths],
+            on_job_finished=lambda video_index, _output_array: finished_jobs.append(video_index),
+        )
+
+    assert sorted(finished_jobs) == [0, 1, 2]
+    for camera_number, output_array in enumerate(output_arrays):
+        assert output_array.shape == (NUMBER_OF_FRAMES, OpenPoseModelInfo.num_tracked_points, 3)
+        assert np.all(output_array[:, 0, 0] == camera_number)
+        assert np.array_equal(output_array[:, 0, 1], np.arange(NUMBER_OF_FRAMES))
+    assert "OpenPose demo successfully finished" in caplog.text
+
+
+@pytest.mark.skipif(sys.platform == "win32", reason="the stub executable relies on a shebang")
+def test_scheduler_reports_failed_jobs(stub_openpose_root, synchronized_video_path, tmp_path):
+    broken_video_path = synchronized_video_path / "broken_camera_3.mp4"
+    write_video(broken_video_path)
+    tracker = OpenPoseTracker(
+        openpose_root_folder_path=stub_openpose_root,
+        output_json_folder_path=tmp_path / "openpose_jsons",
+    )
+
+    output_arrays = OpenPoseScheduler(tracker, max_concurrent_jobs=2).run(
+        [synchronized_video_path / "camera_0.mp4", broken_video_path],
+        [tmp_path / "camera_0_openpose.avi", tmp_path / "broken_camera_3_openpose.avi"],
+    )
+
+    assert output_arrays[0] is not None
+    assert output_arrays[1] is None
+
+
+@pytest.mark.skipif(sys.platform == "win32", reason="memory limits need the resource module")
+def test_run_openpose_process_limits_memory(stub_openpose_root, tmp_path, caplog):
+    memory_limit_bytes = 4 * 1024**3
+    tracker = OpenPoseTracker(
+        openpose_root_folder_path=stub_openpose_root,
+        output_json_folder_path=tmp_path / "openpose_jsons",
+        memory_limit_bytes_per_job=memory_limit_bytes,
+    )
+
+    with caplog.at_level(logging.INFO):
+        return_code = tracker.run_openpose_process(
+            [sys.executable, "-c", "import resource; print(resource.getrlimit(resource.RLIMIT_AS)[0])"],
+            video_name="camera_0",
+        )
+
+    assert return_code == 0
+    assert f"[OpenPose camera_0] {memory_limit_bytes}" in caplog.text
+
+
+@pytest.mark.skipif(sys.platform == "win32", reason="the stub executable relies on a shebang")
+def test_process_folder_of_videos_with_openpose(stub_openpose_root, synchronized_video_path, tmp_path):
+    combined_array = process_folder_of_videos(
+        model_info=OpenPoseModelInfo(),
+        tracking_params=OpenPoseTrackingParams(
+            openpose_root_folder_path=str(stub_openpose_root),
+            output_json_path=str(tmp_path / "openpose_jsons"),
+        ),
+        synchronized_video_path=synchronized_video_path,
+        output_folder_path=tmp_path / "output_data",
+        num_processes=2,
+    )
+
+    assert combined_array.shape == (3, NUMBER_OF_FRAMES, OpenPoseModelInfo.num_tracked_points, 3)
+    camera_numbers = [
+        int(video_path.stem.split("_")[-1]) for video_path in get_video_paths(synchronized_video_path)
+    ]
+    assert np.array_equal(combined_array[:, 0, 0, 0], camera_numbers)
+
+
+@pytest.mark.parametrize("options", [{"num_frame_shards": 2}, {"resume": True}])
+def test_process_folder_of_videos_rejects_openpose_shards_and_resume(
+    synchronized_video_path, tmp_path, options
+):
+    with pytest.raises(ValueError):
+        process_folder_of_videos(
+            model_info=OpenPoseModelInfo(),
+            tracking_params=OpenPoseTrackingParams(
+                openpose_root_folder_path=str(tmp_path / "openpose"),
+                output_json_path=str(tmp_path / "openpose_jsons"),
+            ),
+            synchronized_video_path=synchronized_video_path,
+            **options,
+        )
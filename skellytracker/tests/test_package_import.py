@@ -0,0 +1,21 @@
+import subprocess
+import sys
+
+
+def test_package_import_has_no_side_effects():
+    check_imports = (
+        "import logging, sys\n"
+        "import skellytracker\n"
+        "assert not logging.getLogger().handlers\n"
+        "heavy_modules = {'mediapipe', 'ultralytics', 'torch'}.intersection(sys.modules)\n"
+        "assert not heavy_modules, heavy_modules\n"
+        "assert skellytracker.BrightestPointTracker.__name__ == 'BrightestPointTracker'\n"
+        "heavy_modules = {'mediapipe', 'ultralytics', 'torch'}.intersection(sys.modules)\n"
+        "assert not heavy_modules, heavy_modules\n"
+    )
+    result = subprocess.run(  # noqa: S603
+        [sys.executable, "-c", check_imports], capture_output=True, text=True
+    )
+
+    assert result.returncode == 0, result.stderr
+    assert result.stdout == ""
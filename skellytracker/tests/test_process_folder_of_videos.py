@@ -0,0 +1,314 @@
+import cv2
+import pytest
+import numpy as np
+
+
+from skellytracker import process_folder_of_videos as process_folder_of_videos_module
+from skellytracker.process_folder_of_videos import (
+    get_frame_shards,
+    get_tracker,
+    process_folder_of_videos,
+)
+from skellytracker.system.constants import BASE_2D_FILE_NAME
+from skellytracker.trackers.base_tracker.model_info import ModelInfo
+from skellytracker.trackers.base_tracker.base_tracking_params import BaseTrackingParams
+from skellytracker.utilities.result_cache import ResultCache
+from skellytracker.utilities.shared_output_array import (
+    create_shared_output_array,
+    write_to_shared_output_array,
+)
+
+
+NUMBER_OF_FRAMES = 24
+FRAME_SIZE = (160, 120)
+
+
+class BrightestPointModelInfo(ModelInfo):
+    name = "brightest_point"
+    tracker_name = "BrightestPointTracker"
+    landmark_names = ["brightest_point_0"]
+    num_tracked_points = 1
+
+
+@pytest.fixture()
+def synchronized_video_path(tmp_path):
+    """
+    Create a folder of short videos of a bright spot moving across a dark background.
+    """
+    video_folder = tmp_path / "synchronized_videos"
+    video_folder.mkdir()
+    for camera_number in range(2):
+        video_writer = cv2.VideoWriter(
+            str(video_folder / f"camera_{camera_number}.mp4"),
+            cv2.VideoWriter.fourcc(*"mp4v"),
+            30,
+            FRAME_SIZE,
+        )
+        for frame_number in range(NUMBER_OF_FRAMES):
+            image = np.zeros((FRAME_SIZE[1], FRAME_SIZE[0], 3), dtype=np.uint8)
+            cv2.circle(
+                image,
+                (20 + 5 * frame_number, 40 + 40 * camera_number),
+                8,
+                (255, 255, 255),
+                -1,
+            )
+            video_writer.write(image)
+        video_writer.release()
+    return video_folder
+
+
+def test_get_frame_shards():
+    assert get_frame_shards(number_of_frames=10, num_frame_shards=3) == [
+        (0, 3),
+        (3, 6),
+        (6, 10),
+    ]
+    assert get_frame_shards(number_of_frames=2, num_frame_shards=4) == [(0, 1), (1, 2)]
+
+
+def test_process_folder_of_videos(synchronized_video_path):
+    combined_array = process_folder_of_videos(
+        model_info=BrightestPointModelInfo(),
+        tracking_params=BaseTrackingParams(),
+        synchronized_video_path=synchronized_video_path,
+        num_processes=1,
+    )
+
+    assert combined_array.shape == (2, NUMBER_OF_FRAMES, 1, 2)
+    assert np.allclose(
+        combined_array[:, :, 0, 0], 20 + 5 * np.arange(NUMBER_OF_FRAMES), atol=1
+    )
+
+
+def test_process_folder_of_videos_in_shards(synchronized_video_path):
+    combined_array = process_folder_of_videos(
+        model_info=BrightestPointModelInfo(),
+        tracking_params=BaseTrackingParams(),
+        synchronized_video_path=synchronized_video_path,
+        num_processes=1,
+    )
+    sharded_array = process_folder_of_videos(
+        model_info=BrightestPointModelInfo(),
+        tracking_params=BaseTrackingParams(),
+        synchronized_video_path=synchronized_video_path,
+        num_processes=1,
+        num_frame_shards=3,
+        shard_warmup_frames=2,
+    )
+
+    assert sharded_array.shape == combined_array.shape
+    assert np.array_equal(sharded_array, combined_array)
+
+
+def test_process_folder_of_videos_in_shards_reports_failed_shards(
+    synchronized_video_path, monkeypatch
+):
+    monkeypatch.setattr(
+        process_folder_of_videos_module, "process_video_shard", lambda *args: None
+    )
+    with pytest.raises(ValueError, match="camera_0.mp4 frames 0 to 12"):
+        process_folder_of_videos(
+            model_info=BrightestPointModelInfo(),
+            tracking_params=BaseTrackingParams(),
+            synchronized_video_path=synchronized_video_path,
+            num_processes=1,
+            num_frame_shards=2,
+        )
+
+
+@pytest.mark.parametrize("num_frame_shards", [1, 3])
+def test_process_folder_of_videos_shared_output_array(
+    synchronized_video_path, tmp_path, num_frame_shards
+):
+    combined_array = process_folder_of_videos(
+        model_info=BrightestPointModelInfo(),
+        tracking_params=BaseTrackingParams(),
+        synchronized_video_path=synchronized_video_path,
+        num_processes=1,
+    )
+    shared_array = process_folder_of_videos(
+        model_info=BrightestPointModelInfo(),
+        tracking_params=BaseTrackingParams(),
+        synchronized_video_path=synchronized_video_path,
+        output_folder_path=tmp_path / "shared_output",
+        num_processes=1,
+        num_frame_shards=num_frame_shards,
+        use_shared_output_array=True,
+    )
+
+    assert shared_array.shape == combined_array.shape == (2, NUMBER_OF_FRAMES, 1, 2)
+    assert np.array_equal(shared_array, combined_array)
+
+    saved_array = np.load(
+        tmp_path / "shared_output" / f"brightest_point_{BASE_2D_FILE_NAME}"
+    )
+    assert np.array_equal(saved_array, shared_array, equal_nan=True)
+
+
+def test_shared_output_array_accepts_per_frame_vectors(tmp_path):
+    # i.e. YOLOObjectTracker's (numFrames, 4) bounding boxes
+    file_path = tmp_path / "shared_output.npy"
+    create_shared_output_array(file_path=file_path, shape=(2, NUMBER_OF_FRAMES, 4))
+    boxes = np.arange(NUMBER_OF_FRAMES * 4, dtype=float).reshape(NUMBER_OF_FRAMES, 4)
+    write_to_shared_output_array(file_path=file_path, array=boxes, camera_index=1)
+
+    saved_array = np.load(file_path)
+    assert np.array_equal(saved_array[1], boxes)
+    assert np.isnan(saved_array[0]).all()
+
+    with pytest.raises(ValueError):
+        write_to_shared_output_array(
+            file_path=file_path, array=np.zeros((NUMBER_OF_FRAMES, 1, 2)), camera_index=0
+        )
+
+
+@pytest.mark.parametrize("num_frame_shards", [1, 3])
+def test_process_folder_of_videos_resume(
+    synchronized_video_path, tmp_path, num_frame_shards
+):
+    combined_array = process_folder_of_videos(
+        model_info=BrightestPointModelInfo(),
+        tracking_params=BaseTrackingParams(),
+        synchronized_video_path=synchronized_video_path,
+        num_processes=1,
+    )
+    for _ in range(2):
+        resumed_array = process_folder_of_videos(
+            model_info=BrightestPointModelInfo(),
+            tracking_params=BaseTrackingParams(),
+            synchronized_video_path=synchronized_video_path,
+            output_folder_path=tmp_path / "resumed_output",
+            num_processes=1,
+            num_frame_shards=num_frame_shards,
+            shard_warmup_frames=2,
+            resume=True,
+        )
+        assert np.array_equal(resumed_array, combined_array)
+
+    checkpoint_paths = list((tmp_path / "resumed_output" / "checkpoints").rglob("*.checkpoint.json"))
+    assert len(checkpoint_paths) == 2 * num_frame_shards
+
+
+def test_process_folder_of_videos_resume_keeps_checkpoints_per_tracking_params(
+    synchronized_video_path, tmp_path
+):
+    for tracking_params in [BaseTrackingParams(), BaseTrackingParams(num_processes=2)]:
+        process_folder_of_videos(
+            model_info=BrightestPointModelInfo(),
+            tracking_params=tracking_params,
+            synchronized_video_path=synchronized_video_path,
+            output_folder_path=tmp_path / "resumed_output",
+            num_processes=1,
+            resume=True,
+        )
+
+    checkpoint_folders = list((tmp_path / "resumed_output" / "checkpoints").iterdir())
+    assert len(checkpoint_folders) == 2
+    assert all(
+        checkpoint_folder.name.startswith("BrightestPointTracker_")
+        for checkpoint_folder in checkpoint_folders
+    )
+
+
+@pytest.mark.parametrize("num_frame_shards", [1, 3])
+def test_process_folder_of_videos_result_cache(
+    synchronized_video_path, tmp_path, monkeypatch, num_frame_shards
+):
+    result_cache = ResultCache(cache_folder_path=tmp_path / "cache")
+    combined_array = process_folder_of_videos(
+        model_info=BrightestPointModelInfo(),
+        tracking_params=BaseTrackingParams(),
+        synchronized_video_path=synchronized_video_path,
+        num_processes=1,
+        num_frame_shards=num_frame_shards,
+        result_cache=result_cache,
+    )
+    assert len(list(result_cache.cache_folder_path.glob("*.npy"))) == 2 * num_frame_shards
+
+    def fail_get_tracker(*args, **kwargs):
+        raise AssertionError("Tracker should not be created on a cache hit")
+
+    monkeypatch.setattr(process_folder_of_videos_module, "get_tracker", fail_get_tracker)
+    cached_array = process_folder_of_videos(
+        model_info=BrightestPointModelInfo(),
+        tracking_params=BaseTrackingParams(),
+        synchronized_video_path=synchronized_video_path,
+        num_processes=1,
+        num_frame_shards=num_frame_shards,
+        result_cache=result_cache,
+    )
+
+    assert np.array_equal(cached_array, combined_array)
+
+
+def test_process_folder_of_videos_reuses_tracker(synchronized_video_path, monkeypatch):
+    created_trackers = []
+
+    def counting_get_tracker(tracker_name, tracking_params):
+        tracker = get_tracker(tracker_name=tracker_name, tracking_params=tracking_params)
+        created_trackers.append(tracker)
+        return tracker
+
+    monkeypatch.setattr(process_folder_of_videos_module, "get_tracker", counting_get_tracker)
+    combined_array = process_folder_of_videos(
+        model_info=BrightestPointModelInfo(),
+        tracking_params=BaseTrackingParams(),
+        synchronized_video_path=synchronized_video_path,
+        num_processes=1,
+        num_frame_shards=3,
+        shard_warmup_frames=2,
+    )
+
+    assert len(created_trackers) == 1
+    assert np.allclose(
+        combined_array[:, :, 0, 0], 20 + 5 * np.arange(NUMBER_OF_FRAMES), atol=1
+    )
+
+
+@pytest.mark.parametrize("use_shared_output_array", [False, True])
+def test_process_folder_of_videos_synchronized_batch_inference(
+    synchronized_video_path, tmp_path, monkeypatch, use_shared_output_array
+):
+    combined_array = process_folder_of_videos(
+        model_info=BrightestPointModelInfo(),
+        tracking_params=BaseTrackingParams(),
+        synchronized_video_path=synchronized_video_path,
+        num_processes=1,
+    )
+
+    created_trackers = []
+
+    def counting_get_tracker(tracker_name, tracking_params):
+        tracker = get_tracker(tracker_name=tracker_name, tracking_params=tracking_params)
+        created_trackers.append(tracker)
+        return tracker
+
+    monkeypatch.setattr(process_folder_of_videos_module, "get_tracker", counting_get_tracker)
+    synchronized_array = process_folder_of_videos(
+        model_info=BrightestPointModelInfo(),
+        tracking_params=BaseTrackingParams(),
+        synchronized_video_path=synchronized_video_path,
+        output_folder_path=tmp_path / "synchronized_output",
+        use_shared_output_array=use_shared_output_array,
+        synchronized_batch_inference=True,
+    )
+
+    assert len(created_trackers) == 1
+    assert np.array_equal(synchronized_array, combined_array)
+    assert (
+        tmp_path / "synchronized_output" / f"brightest_point_{BASE_2D_FILE_NAME}"
+    ).exists()
+
+
+def test_process_folder_of_videos_synchronized_batch_inference_rejects_shards(
+    synchronized_video_path,
+):
+    with pytest.raises(ValueError):
+        process_folder_of_videos(
+            model_info=BrightestPointModelInfo(),
+            tracking_params=BaseTrackingParams(),
+            synchronized_video_path=synchronized_video_path,
+            num_frame_shards=2,
+            synchronized_batch_inference=True,
+        )
@@ -0,0 +1,60 @@
+import os
+
+import numpy as np
+import pytest
+
+from skellytracker.trackers.base_tracker.base_tracking_params import BaseTrackingParams
+from skellytracker.utilities.result_cache import ResultCache, get_file_fingerprint
+
+
+@pytest.fixture()
+def video_file(tmp_path):
+    video_path = tmp_path / "video.mp4"
+    video_path.write_bytes(os.urandom(4 * 1024 * 1024))
+    return video_path
+
+
+def test_file_fingerprint_changes_with_content(video_file):
+    fingerprint = get_file_fingerprint(video_file)
+    assert get_file_fingerprint(video_file) == fingerprint
+
+    file_stat = os.stat(video_file)
+    with open(video_file, "r+b") as file:
+        file.write(b"changed")
+    os.utime(video_file, ns=(file_stat.st_atime_ns, file_stat.st_mtime_ns))
+
+    assert get_file_fingerprint(video_file) != fingerprint
+
+
+def test_cache_key_depends_on_tracking_params(video_file, tmp_path):
+    result_cache = ResultCache(cache_folder_path=tmp_path / "cache")
+    key = result_cache.get_key(video_file, "BrightestPointTracker", BaseTrackingParams())
+
+    assert key == result_cache.get_key(video_file, "BrightestPointTracker", BaseTrackingParams())
+    assert key != result_cache.get_key(
+        video_file, "BrightestPointTracker", BaseTrackingParams(num_processes=2)
+    )
+    assert key != result_cache.get_key(video_file, "MediapipeHolisticTracker", BaseTrackingParams())
+    assert key != result_cache.get_key(
+        video_file, "BrightestPointTracker", BaseTrackingParams(), start_frame=10
+    )
+
+
+def test_cache_evicts_least_recently_used(tmp_path):
+    array = np.zeros((100, 10, 3))
+    entry_size = array.nbytes + 128
+    result_cache = ResultCache(
+        cache_folder_path=tmp_path / "cache", max_size_bytes=int(2.5 * entry_size)
+    )
+
+    assert result_cache.load("first") is None
+    for modification_time, key in enumerate(["first", "second"]):
+        result_cache.save(key, array)
+        os.utime(result_cache.cache_folder_path / f"{key}.npy", ns=(modification_time, modification_time))
+    # reading marks "first" as recently used, so "second" is evicted next
+    assert np.array_equal(result_cache.load("first"), array)
+    result_cache.save("third", array)
+
+    assert result_cache.load("second") is None
+    assert result_cache.load("first") is not None
+    assert result_cache.load("third") is not None
@@ -0,0 +1,85 @@
+import numpy as np
+
+
+from skellytracker.trackers.base_tracker.skeleton_renderer import (
+    SkeletonRenderer,
+    get_segment_connection_indices,
+    get_virtual_marker_weights,
+)
+from skellytracker.trackers.yolo_tracker.yolo_model_info import YOLOModelInfo
+
+
+def test_render_draws_points_and_segments():
+    image = np.zeros((100, 100, 3), dtype=np.uint8)
+    renderer = SkeletonRenderer(connections=np.array([[0, 1], [1, 2]]))
+    points = np.array([[10, 10], [10, 90], [np.nan, np.nan]])
+
+    annotated_image = renderer.render(image, points)
+
+    assert not np.any(image)
+    assert annotated_image[10, 10].tolist() == [0, 0, 255]
+    assert annotated_image[90, 10].tolist() == [0, 0, 255]
+    assert annotated_image[50, 10].tolist() == [224, 224, 224]
+    # the segment to the missing point is not drawn
+    assert not np.any(annotated_image[:, 50:])
+
+
+def test_render_returns_independent_copies():
+    image = np.zeros((100, 100, 3), dtype=np.uint8)
+    renderer = SkeletonRenderer(marker_type="cross", marker_size=20)
+
+    first_image = renderer.render(image, np.array([[30, 30]]))
+    second_image = renderer.render(image, np.array([[70, 70]]))
+
+    assert second_image is not first_image
+    assert first_image[30, 38].tolist() == [0, 0, 255]
+    assert first_image[78, 70].tolist() == [0, 0, 0]
+    assert second_image[78, 70].tolist() == [0, 0, 255]
+
+
+def test_render_reuses_buffer():
+    image = np.zeros((100, 100, 3), dtype=np.uint8)
+    renderer = SkeletonRenderer(marker_type="cross", marker_size=20)
+
+    first_image = renderer.render(image, np.array([[30, 30]]), reuse_buffer=True)
+    assert first_image[30, 38].tolist() == [0, 0, 255]
+    second_image = renderer.render(image, np.array([[70, 70]]), reuse_buffer=True)
+
+    assert second_image is first_image
+    assert second_image[30, 38].tolist() == [0, 0, 0]
+    assert second_image[78, 70].tolist() == [0, 0, 255]
+
+
+def test_render_several_skeletons():
+    image = np.zeros((100, 100, 3), dtype=np.uint8)
+    renderer = SkeletonRenderer(connections=np.array([[0, 1]]), marker_size=0)
+    points = np.array([[[10, 10], [90, 10]], [[10, 90], [90, 90]]])
+
+    annotated_image = renderer.render(image, points, copy=False)
+
+    assert annotated_image is image
+    assert image[10, 50].tolist() == [224, 224, 224]
+    assert image[90, 50].tolist() == [224, 224, 224]
+    assert not np.any(image[50])
+
+
+def test_segment_connections_with_virtual_markers():
+    virtual_marker_names, virtual_marker_weights = get_virtual_marker_weights(
+        YOLOModelInfo.landmark_names, YOLOModelInfo.virtual_markers_definitions
+    )
+    connections = get_segment_connection_indices(
+        YOLOModelInfo.landmark_names + virtual_marker_names,
+        YOLOModelInfo.segment_connections,
+    )
+
+    assert virtual_marker_weights.shape == (
+        len(virtual_marker_names),
+        YOLOModelInfo.num_tracked_points,
+    )
+    assert np.allclose(virtual_marker_weights.sum(axis=1), 1)
+    assert len(connections) == len(YOLOModelInfo.segment_connections)
+    assert connections.max() < YOLOModelInfo.num_tracked_points + len(virtual_marker_names)
+
+    renderer = SkeletonRenderer.from_model_info(YOLOModelInfo)
+    points = np.random.default_rng(0).uniform(0, 100, (YOLOModelInfo.num_tracked_points, 2))
+    assert renderer.render(np.zeros((100, 100, 3), dtype=np.uint8), points).any()
@@ -0,0 +1,138 @@
+import subprocess
+import sys
+
+import pytest
+
+from skellytracker.process_folder_of_videos import get_tracker, get_tracker_params
+from skellytracker.trackers.base_tracker.base_tracking_params import BaseTrackingParams
+from skellytracker.trackers.bright_point_tracker.brightest_point_tracker import (
+    BrightestPointTracker,
+)
+from skellytracker.trackers.yolo_object_tracker.yolo_object_model_info import (
+    YOLOObjectTrackingParams,
+)
+from skellytracker.trackers.yolo_tracker.yolo_model_info import YOLOTrackingParams
+from skellytracker.trackers.mediapipe_tracker.mediapipe_model_info import (
+    MediapipeTrackingParams,
+)
+from skellytracker.trackers.tracker_registry import (
+    get_model_file_name,
+    get_registered_tracker_names,
+    get_tracker_class,
+    get_tracker_registration,
+    get_tracker_params_class,
+    register_tracker,
+    unregister_tracker,
+)
+
+
+class TwoPointTrackingParams(BaseTrackingParams):
+    luminance_threshold: int = 100
+
+
+class TwoPointTracker(BrightestPointTracker):
+    @classmethod
+    def from_tracking_params(cls, tracking_params):
+        return cls(num_points=2, luminance_threshold=tracking_params.luminance_threshold)
+
+
+def test_builtin_trackers_are_registered():
+    assert {
+        "BrightestPointTracker",
+        "MediapipeHolisticTracker",
+        "YOLOMediapipeComboTracker",
+        "YOLOPoseTracker",
+        "OpenPoseTracker",
+    }.issubset(get_registered_tracker_names())
+    assert isinstance(get_tracker("BrightestPointTracker", BaseTrackingParams()), BrightestPointTracker)
+
+
+@pytest.fixture()
+def registered_two_point_tracker():
+    register_tracker(
+        tracker_name="TwoPointTracker",
+        tracker_class_path=f"{__name__}:TwoPointTracker",
+        tracking_params_class_path=f"{__name__}:TwoPointTrackingParams",
+    )
+    yield
+    unregister_tracker("TwoPointTracker")
+
+
+def test_register_custom_tracker(registered_two_point_tracker):
+    tracking_params = get_tracker_params("TwoPointTracker")
+    assert isinstance(tracking_params, TwoPointTrackingParams)
+    assert get_tracker_params_class("TwoPointTracker") is TwoPointTrackingParams
+
+    tracker = get_tracker("TwoPointTracker", tracking_params.model_copy(update={"luminance_threshold": 50}))
+    assert isinstance(tracker, TwoPointTracker)
+    assert tracker.num_points == 2
+    assert tracker.luminance_threshold == 50
+
+
+def test_unregister_tracker():
+    register_tracker(tracker_name="TwoPointTracker", tracker_class_path=f"{__name__}:TwoPointTracker")
+    unregister_tracker("TwoPointTracker")
+
+    assert "TwoPointTracker" not in get_registered_tracker_names()
+    with pytest.raises(ValueError):
+        unregister_tracker("TwoPointTracker")
+
+
+def test_optional_dependency_groups_are_valid_extras():
+    for tracker_name in get_registered_tracker_names():
+        optional_dependency_group = get_tracker_registration(tracker_name).optional_dependency_group
+        assert optional_dependency_group is None or " " not in optional_dependency_group
+
+
+def test_missing_optional_dependency_names_install_command():
+    register_tracker(
+        tracker_name="MissingTracker",
+        tracker_class_path="skellytracker_missing_module:MissingTracker",
+        optional_dependency_group="mediapipe,yolo",
+    )
+    try:
+        with pytest.raises(ImportError, match=r"skellytracker\[mediapipe,yolo\]"):
+            get_tracker_class("MissingTracker")
+    finally:
+        unregister_tracker("MissingTracker")
+
+
+def test_invalid_tracker_name():
+    with pytest.raises(ValueError):
+        get_tracker("NotATracker", BaseTrackingParams())
+    with pytest.raises(ValueError):
+        get_tracker_params("NotATracker")
+
+
+def test_required_tracking_params():
+    with pytest.raises(ValueError):
+        get_tracker_params("OpenPoseTracker")
+
+
+def test_registry_imports_trackers_lazily():
+    check_imports = (
+        "import sys\n"
+        "from skellytracker.process_folder_of_videos import get_tracker\n"
+        "from skellytracker.trackers.base_tracker.base_tracking_params import BaseTrackingParams\n"
+        "get_tracker('BrightestPointTracker', BaseTrackingParams())\n"
+        "heavy_modules = {'mediapipe', 'ultralytics', 'torch'}.intersection(sys.modules)\n"
+        "assert not heavy_modules, heavy_modules\n"
+    )
+    result = subprocess.run(  # noqa: S603
+        [sys.executable, "-c", check_imports], capture_output=True, text=True
+    )
+
+    assert result.returncode == 0, result.stderr
+
+
+@pytest.mark.parametrize(
+    "tracker_name, tracking_params, model_file_name",
+    [
+        ("YOLOPoseTracker", YOLOTrackingParams(model_size="nano"), "yolov8n-pose.pt"),
+        ("YOLOObjectTracker", YOLOObjectTrackingParams(model_size="small"), "yolov8s.pt"),
+        ("YOLOMediapipeComboTracker", MediapipeTrackingParams(yolo_model_size="large"), "yolov8l.pt"),
+        ("BrightestPointTracker", BaseTrackingParams(), None),
+    ],
+)
+def test_get_model_file_name_uses_model_size(tracker_name, tracking_params, model_file_name):
+    assert get_model_file_name(tracker_name, tracking_params) == model_file_name
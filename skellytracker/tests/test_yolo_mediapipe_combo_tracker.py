@@ -229,3 +229,94 @@ def test_record_buffer_by_box_size(test_image):
     assert np.allclose(
         processed_results[:, :30, :], expected_results[:, :30, :], atol=2
     )
+
+
+@pytest.mark.usefixtures("test_image")
+def test_landmarks_are_rescaled_arrays(test_image):
+    tracker = YOLOMediapipeComboTracker(
+        model_size="nano",
+        model_complexity=0,
+    )
+    tracked_objects = tracker.process_image(test_image)
+
+    pose_landmarks = tracked_objects["pose_landmarks"].extra["landmarks"]
+    assert isinstance(pose_landmarks, np.ndarray)
+    assert pose_landmarks.shape == (MediapipeModelInfo.num_tracked_points_body, 3)
+    assert np.all((pose_landmarks[:, :2] > 0) & (pose_landmarks[:, :2] < 1))
+
+
+@pytest.mark.usefixtures("test_image")
+def test_process_image_roi_skips_detection(test_image):
+    tracker = YOLOMediapipeComboTracker(
+        model_size="nano",
+        model_complexity=0,
+        detection_interval=3,
+    )
+    detection_count = 0
+    model = tracker.model
+
+    def count_detections(*args, **kwargs):
+        nonlocal detection_count
+        detection_count += 1
+        return model(*args, **kwargs)
+
+    tracker.model = count_detections
+
+    for _ in range(3):
+        tracked_objects = tracker.process_image(test_image)
+        assert tracked_objects["pose_landmarks"].extra["landmarks"] is not None
+        assert tracker.annotated_image is not None
+
+    assert detection_count == 1
+
+    tracker.reset_temporal_state()
+    tracker.process_image(test_image)
+    assert detection_count == 2
+
+
+def test_process_image_no_detection_skip():
+    tracker = YOLOMediapipeComboTracker(
+        model_size="nano",
+        model_complexity=0,
+        no_detection_policy="skip",
+    )
+    image = np.zeros((480, 640, 3), dtype=np.uint8)
+    tracked_objects = tracker.process_image(image)
+    tracker.recorder.record(tracked_objects=tracked_objects)
+
+    for tracked_object in tracked_objects.values():
+        assert tracked_object.extra["landmarks"] is None
+    assert tracker.annotated_image is not None
+
+    processed_results = tracker.recorder.process_tracked_objects(
+        image_size=image.shape[:2]
+    )
+    assert processed_results.shape == (1, MediapipeModelInfo.num_tracked_points, 3)
+    assert np.isnan(processed_results).all()
+
+
+@pytest.mark.usefixtures("test_image")
+def test_process_image_no_detection_last_box(test_image):
+    tracker = YOLOMediapipeComboTracker(
+        model_size="nano",
+        model_complexity=0,
+        no_detection_policy="last_box",
+        max_frames_with_last_box=1,
+    )
+    tracker.process_image(test_image)
+
+    empty_image = np.zeros_like(test_image)
+    holistic_process = tracker.holistic.process
+    process_count = 0
+
+    def count_process(*args, **kwargs):
+        nonlocal process_count
+        process_count += 1
+        return holistic_process(*args, **kwargs)
+
+    tracker.holistic.process = count_process
+
+    tracker.process_image(empty_image)
+    assert process_count == 1
+    tracker.process_image(empty_image)
+    assert process_count == 1
@@ -1,7 +1,13 @@
+import cv2
 import pytest
 import numpy as np
 
 
+from skellytracker.process_folder_of_videos import process_folder_of_videos
+from skellytracker.trackers.base_tracker.model_info import ModelInfo
+from skellytracker.trackers.yolo_object_tracker.yolo_object_model_info import (
+    YOLOObjectTrackingParams,
+)
 from skellytracker.trackers.yolo_object_tracker.yolo_object_tracker import (
     YOLOObjectTracker,
 )
@@ -43,3 +49,57 @@ def test_record(test_image):
     assert processed_results.shape == (1, 4)
 
     assert np.allclose(processed_results, [90.676, 96.981, 493.54, 812.03], atol=1e-2)
+
+
+@pytest.mark.usefixtures("test_image")
+def test_process_batch(test_image):
+    tracker = YOLOObjectTracker(model_size="nano", person_only=True)
+
+    for tracked_objects in tracker.process_batch([test_image, test_image]):
+        tracker.recorder.record(tracked_objects=tracked_objects)
+
+    processed_results = tracker.recorder.process_tracked_objects()
+    assert processed_results.shape == (2, 4)
+    assert np.allclose(processed_results, [90.676, 96.981, 493.54, 812.03], atol=1e-2)
+
+
+NUMBER_OF_SYNCHRONIZED_FRAMES = 3
+
+
+class YOLOObjectModelInfo(ModelInfo):
+    name = "yolo_object"
+    tracker_name = "YOLOObjectTracker"
+    landmark_names = ["object"]
+    num_tracked_points = 1
+
+
+@pytest.mark.parametrize("use_shared_output_array", [False, True])
+def test_process_folder_of_videos_synchronized_batch_inference(
+    test_image, tmp_path, use_shared_output_array
+):
+    synchronized_video_path = tmp_path / "synchronized_videos"
+    synchronized_video_path.mkdir()
+    for camera_number in range(2):
+        video_writer = cv2.VideoWriter(
+            str(synchronized_video_path / f"camera_{camera_number}.mp4"),
+            cv2.VideoWriter.fourcc(*"mp4v"),
+            30,
+            (test_image.shape[1], test_image.shape[0]),
+        )
+        for _ in range(NUMBER_OF_SYNCHRONIZED_FRAMES):
+            video_writer.write(test_image)
+        video_writer.release()
+
+    output_array = process_folder_of_videos(
+        model_info=YOLOObjectModelInfo(),
+        tracking_params=YOLOObjectTrackingParams(model_size="nano"),
+        synchronized_video_path=synchronized_video_path,
+        output_folder_path=tmp_path / "output",
+        use_shared_output_array=use_shared_output_array,
+        synchronized_batch_inference=True,
+    )
+
+    assert output_array.shape == (2, NUMBER_OF_SYNCHRONIZED_FRAMES, 4)
+    # every camera sees the same image, up to video compression
+    assert np.allclose(output_array, output_array[0, 0], atol=1)
+    assert not np.isnan(output_array).any()
@@ -1,9 +1,15 @@
 import math
+from pathlib import Path
+
+import cv2
 import pytest
 import numpy as np
 
 
-from skellytracker.trackers.yolo_tracker.yolo_model_info import YOLOModelInfo
+from skellytracker.trackers.yolo_tracker.yolo_model_info import (
+    YOLOModelInfo,
+    YOLOTrackingParams,
+)
 from skellytracker.trackers.yolo_tracker.yolo_tracker import YOLOPoseTracker
 
 
@@ -50,6 +56,12 @@ def test_process_image(test_image):
     assert np.allclose(landmarks, expected_results)
 
 
+def test_from_tracking_params():
+    tracker = YOLOPoseTracker.from_tracking_params(YOLOTrackingParams(model_size="nano"))
+
+    assert Path(tracker.model.ckpt_path).name == YOLOModelInfo.model_dictionary["nano"]
+
+
 @pytest.mark.usefixtures("test_image")
 def test_annotate_image(test_image):
     tracker = YOLOPoseTracker(model_size="nano")
@@ -121,3 +133,74 @@ def test_unpack_empty_results():
     )
     assert np.isnan(tracked_person.extra["landmarks"][0, :, 0]).all()
     assert np.isnan(tracked_person.extra["landmarks"][0, :, 1]).all()
+
+
+@pytest.mark.usefixtures("test_image")
+def test_process_batch(test_image):
+    tracker = YOLOPoseTracker(model_size="nano")
+    single_image_landmarks = tracker.process_image(test_image)["tracked_person"].extra[
+        "landmarks"
+    ]
+
+    batch_landmarks = [
+        tracked_objects["tracked_person"].extra["landmarks"]
+        for tracked_objects in tracker.process_batch([test_image, test_image])
+    ]
+
+    assert len(batch_landmarks) == 2
+    for landmarks in batch_landmarks:
+        assert np.allclose(landmarks, single_image_landmarks, atol=1e-2)
+
+
+NUMBER_OF_SYNCHRONIZED_FRAMES = 3
+
+
+@pytest.fixture()
+def synchronized_video_paths(test_image, tmp_path):
+    """
+    Write short videos of the test image, and of it mirrored, as two synchronized cameras.
+    """
+    video_paths = []
+    for camera_number, image in enumerate([test_image, test_image[:, ::-1]]):
+        video_path = tmp_path / f"camera_{camera_number}.mp4"
+        video_writer = cv2.VideoWriter(
+            str(video_path),
+            cv2.VideoWriter.fourcc(*"mp4v"),
+            30,
+            (image.shape[1], image.shape[0]),
+        )
+        for _ in range(NUMBER_OF_SYNCHRONIZED_FRAMES):
+            video_writer.write(np.ascontiguousarray(image))
+        video_writer.release()
+        video_paths.append(video_path)
+    return video_paths
+
+
+def test_process_synchronized_videos(synchronized_video_paths):
+    tracker = YOLOPoseTracker(model_size="nano")
+    expected_results = np.stack(
+        [
+            tracker.process_video(video_path, use_tqdm=False)
+            for video_path in synchronized_video_paths
+        ]
+    )
+
+    model = tracker.model
+    batch_sizes = []
+
+    def counting_model(images, **kwargs):
+        batch_sizes.append(len(images))
+        return model(images, **kwargs)
+
+    tracker.model = counting_model
+    results = tracker.process_synchronized_videos(synchronized_video_paths, use_tqdm=False)
+
+    # one model call per frame index, covering every camera
+    assert batch_sizes == [len(synchronized_video_paths)] * NUMBER_OF_SYNCHRONIZED_FRAMES
+    assert results.shape == (
+        len(synchronized_video_paths),
+        NUMBER_OF_SYNCHRONIZED_FRAMES,
+        YOLOModelInfo.num_tracked_points,
+        3,
+    )
+    assert np.allclose(results[..., :2], expected_results[..., :2], atol=1e-2)
@@ -1,7 +1,7 @@
 from abc import ABC, abstractmethod
 import logging
 from pathlib import Path
-from typing import Dict, Union, Optional
+from typing import Any, Dict, Union, Optional
 
 import numpy as np
 
@@ -15,8 +15,14 @@ class BaseRecorder(ABC):
     An abstract base class for implementing different recording algorithms.
     """
 
-    def __init__(self):
-        self.recorded_objects = []
+    def __init__(self, recorded_objects: Optional[Any] = None):
+        """
+        Initialize the BaseRecorder.
+
+        :param recorded_objects: What to record into, defaults to a list of each frame's tracked objects.
+            Recorders passing their own, i.e. a preallocated array, should also override `clear_recorded_objects`.
+        """
+        self.recorded_objects = recorded_objects if recorded_objects is not None else []
         self.recorded_objects_array = None
 
     @abstractmethod
@@ -1,14 +1,25 @@
 from abc import ABC, abstractmethod
+import copy
+from functools import partial
 import logging
 from pathlib import Path
-from typing import Any, Dict, List, Optional, Union
+from typing import Any, Callable, Dict, Iterator, List, Optional, Tuple, Union
 import cv2
 import numpy as np
+from pydantic import BaseModel
 from tqdm import tqdm
 
 
 from skellytracker.trackers.base_tracker.base_recorder import BaseCumulativeRecorder, BaseRecorder
+from skellytracker.trackers.base_tracker.frame_buffer import MemoryMappedFrameBuffer
+from skellytracker.trackers.base_tracker.frame_prefetcher import FramePrefetcher
 from skellytracker.trackers.base_tracker.tracked_object import TrackedObject
+from skellytracker.trackers.base_tracker.video_checkpoint import (
+    VideoCheckpoint,
+    get_checkpoint_path,
+    load_checkpoint,
+    save_checkpoint,
+)
 from skellytracker.trackers.base_tracker.video_handler import VideoHandler
 from skellytracker.trackers.demo_viewers.image_demo_viewer import ImageDemoViewer
 from skellytracker.trackers.demo_viewers.webcam_demo_viewer import (
@@ -21,6 +32,14 @@ logger = logging.getLogger(__name__)
 class BaseTracker(ABC):
     """
     An abstract base class for implementing different tracking algorithms.
+
+    The annotated image is only drawn when `annotated_image` is read, i.e. when an annotated video is being written.
+    Set `annotate` to False to never draw it. While `reuse_annotation_buffer` is True, trackers drawing with a
+    SkeletonRenderer draw every annotated image into the same buffer, so each is overwritten by the next.
+    Writing an annotated video turns it on, as each frame is written before the next is drawn.
+
+    Trackers that support it run detection on frames downscaled by `inference_scale`, or to `inference_width` pixels wide,
+    and report coordinates in full resolution pixels.
     """
 
     def __init__(
@@ -30,12 +49,109 @@ class BaseTracker(ABC):
         **data: Any,
     ):
         self.recorder = recorder
-        self.annotated_image = None
+        self.annotate = True
+        self.reuse_annotation_buffer = False
+        self.inference_scale: Optional[float] = None
+        self.inference_width: Optional[int] = None
+        self._annotated_image: Optional[np.ndarray] = None
+        self._render_annotated_image: Optional[Callable[[], np.ndarray]] = None
         self.tracked_objects: Dict[str, TrackedObject] = {}
 
         for name in tracked_object_names:
             self.tracked_objects[name] = TrackedObject(object_id=name)
 
+    @property
+    def annotated_image(self) -> Optional[np.ndarray]:
+        """
+        The last processed image annotated with its tracking results, drawn on first access.
+        """
+        if self._render_annotated_image is not None:
+            self._annotated_image = self._render_annotated_image()
+            self._render_annotated_image = None
+        return self._annotated_image
+
+    @annotated_image.setter
+    def annotated_image(self, annotated_image: Optional[np.ndarray]) -> None:
+        self._annotated_image = annotated_image
+        self._render_annotated_image = None
+
+    def defer_annotation(
+        self, render: Callable[..., np.ndarray], *args: Any, **kwargs: Any
+    ) -> None:
+        """
+        Set the annotated image for the current image to be drawn by `render(*args, **kwargs)` when it is first read.
+
+        Should be called at the end of `process_image` instead of drawing the annotated image directly.
+        The arguments are bound now, but anything they refer to (i.e. `tracked_objects`) is read when drawing,
+        so `annotated_image` should be read before processing the next image.
+
+        :param render: Function returning the annotated image, usually `annotate_image`.
+        """
+        self._annotated_image = None
+        self._render_annotated_image = (
+            partial(render, *args, **kwargs) if self.annotate else None
+        )
+
+    def resize_for_inference(
+        self, image: np.ndarray, full_frame_width: Optional[int] = None
+    ) -> Tuple[np.ndarray, np.ndarray]:
+        """
+        Downscale an image for detection, following `inference_width` if set, otherwise `inference_scale`.
+        Images are never upscaled.
+
+        :param image: A full resolution image.
+        :param full_frame_width: Width of the frame the image was cropped from, so crops are scaled like their frame.
+        :return: The image to run detection on, and its (x, y) scale relative to the full resolution image.
+        """
+        height, width = image.shape[:2]
+        if self.inference_width is not None:
+            scale = self.inference_width / (full_frame_width or width)
+        elif self.inference_scale is not None:
+            scale = self.inference_scale
+        else:
+            scale = 1.0
+
+        if scale >= 1.0:
+            return image, np.ones(2)
+
+        inference_size = (max(round(width * scale), 1), max(round(height * scale), 1))
+        inference_image = cv2.resize(image, inference_size, interpolation=cv2.INTER_AREA)
+        return inference_image, np.array(inference_size) / np.array([width, height])
+
+    @staticmethod
+    def map_to_full_resolution(points: np.ndarray, scale: np.ndarray) -> np.ndarray:
+        """
+        Map pixel coordinates found in an image from `resize_for_inference` back to the full resolution image.
+
+        :param points: Array of shape (..., 2) of (x, y) pixel coordinates in the resized image.
+        :param scale: The (x, y) scale returned by `resize_for_inference`.
+        :return: Array of (x, y) pixel coordinates in the full resolution image
+        """
+        # pixel centers sit at integer coordinates, so map around the pixel edges rather than the origin
+        return (np.asarray(points, dtype=np.float64) + 0.5) / scale - 0.5
+
+    @property
+    def processes_frames_independently(self) -> bool:
+        """
+        Whether each frame is tracked without state from previous frames,
+        so frames from different videos can be interleaved, i.e. by `process_synchronized_videos`.
+
+        Trackers without temporal state should override this to return True.
+        """
+        return False
+
+    @classmethod
+    def from_tracking_params(cls, tracking_params: BaseModel) -> "BaseTracker":
+        """
+        Create the tracker from a tracking params model, i.e. when it is created by name through the tracker registry.
+
+        Trackers whose constructor takes arguments should override this to map the tracking params onto them.
+
+        :param tracking_params: The tracking parameters to create the tracker with.
+        :return: The tracker object
+        """
+        return cls()
+
     @abstractmethod
     def process_image(self, image: np.ndarray, **kwargs) -> Dict[str, TrackedObject]:
         """
@@ -46,6 +162,23 @@ class BaseTracker(ABC):
         """
         pass
 
+    def process_batch(
+        self, images: List[np.ndarray], **kwargs
+    ) -> Iterator[Dict[str, TrackedObject]]:
+        """
+        Process a batch of images, yielding the tracked objects for each image in order.
+
+        After each yield, `tracked_objects` and `annotated_image` hold the results for that image,
+        so they should be used (i.e. recorded) before advancing to the next one.
+        Overrides should set the annotated image with `defer_annotation`, so it is only drawn if it is used.
+        Trackers that can run inference on several images at once should override this.
+
+        :param images: A list of input images.
+        :return: Iterator of tracked object dictionaries, one per image.
+        """
+        for image in images:
+            yield self.process_image(image, **kwargs)
+
     @abstractmethod
     def annotate_image(
         self, image: np.ndarray, tracked_objects: Dict[str, TrackedObject], **kwargs
@@ -65,6 +198,15 @@ class BaseTracker(ABC):
         output_video_filepath: Optional[Union[str, Path]] = None,
         save_data_bool: bool = False,
         use_tqdm: bool = True,
+        prefetch_queue_size: int = 8,
+        async_video_writing: bool = True,
+        batch_size: int = 1,
+        start_frame: int = 0,
+        end_frame: Optional[int] = None,
+        stream_data_to_file: bool = False,
+        stream_chunk_size: int = 256,
+        resume: bool = False,
+        output_data_filepath: Optional[Union[str, Path]] = None,
     ) -> Union[np.ndarray, None]:
         """
         Run the tracker on a video.
@@ -73,7 +215,19 @@ class BaseTracker(ABC):
         :param output_video_filepath: Path to save annotated video to, does not save video if None.
         :param save_data_bool: Whether to save the data to a file.
         :param use_tqdm: Whether to use tqdm to show a progress bar
-        :return: Array of tracked keypoint data if tracker has an associated recorder
+        :param prefetch_queue_size: Number of frames to decode ahead on a background thread, 0 to decode on the tracking thread.
+        :param async_video_writing: Whether to encode the annotated video on a background thread.
+        :param batch_size: Number of frames to pass to `process_batch` at a time.
+        :param start_frame: Index of the first frame to process.
+        :param end_frame: Index one past the last frame to process, processes to the end of the video if None.
+        :param stream_data_to_file: Whether to write the data to a memory-mapped .npy file as it is recorded,
+            instead of holding the recorded objects for the whole video in memory. Implies saving the data.
+        :param stream_chunk_size: Number of recorded frames to hold in memory before writing them to the file when streaming.
+        :param resume: Whether to checkpoint progress next to the data file every `stream_chunk_size` frames,
+            and continue from an existing checkpoint instead of starting over. Implies streaming the data to file.
+            The annotated video is not written when continuing partway through, as it would only contain the remaining frames.
+        :param output_data_filepath: Path to save the data to, defaults to the video path with a .npy suffix.
+        :return: Array of tracked keypoint data if tracker has an associated recorder, memory-mapped read-only when streaming
         """
 
         cap = cv2.VideoCapture(str(input_video_filepath))
@@ -84,57 +238,379 @@ class BaseTracker(ABC):
 
         fps = cap.get(cv2.CAP_PROP_FPS)
 
+        number_of_frames = int(cap.get(cv2.CAP_PROP_FRAME_COUNT))
+        if end_frame is not None:
+            number_of_frames = min(number_of_frames, end_frame)
+        number_of_frames = max(number_of_frames - start_frame, 0)
+
+        if output_data_filepath is None:
+            output_data_filepath = Path(input_video_filepath).with_suffix(".npy")
+        output_data_filepath = Path(output_data_filepath)
+        stream_data = (stream_data_to_file or resume) and self.recorder is not None
+        checkpoint_path = get_checkpoint_path(output_data_filepath) if resume else None
+
+        data_stream: Optional[MemoryMappedFrameBuffer] = None
+        if checkpoint_path is not None:
+            data_stream = self.load_data_stream_checkpoint(
+                checkpoint_path, output_data_filepath, start_frame, number_of_frames, image_size
+            )
+        number_of_frames_completed = len(data_stream) if data_stream is not None else 0
+
+        if data_stream is not None and len(data_stream) >= data_stream.capacity:
+            cap.release()
+            data_stream.close()
+            logger.info(f"Loading completed output for {input_video_filepath} from {output_data_filepath}")
+            self.cleanup()
+            return np.load(output_data_filepath, mmap_mode="r")
+
+        if output_video_filepath is not None and number_of_frames_completed > 0:
+            # reopening the writer would replace the annotated video with one of only the remaining frames
+            logger.warning(
+                f"Resuming {input_video_filepath} at frame {start_frame + number_of_frames_completed}, "
+                f"not writing annotated video {output_video_filepath}"
+            )
+            output_video_filepath = None
+
         if output_video_filepath is not None:
             video_handler = VideoHandler(
-                output_path=output_video_filepath, frame_size=image_size, fps=fps
+                output_path=output_video_filepath,
+                frame_size=image_size,
+                fps=fps,
+                async_write=async_video_writing,
             )
         else:
             video_handler = None
 
-        ret, frame = cap.read()
-
-        number_of_frames = int(cap.get(cv2.CAP_PROP_FRAME_COUNT))
+        if start_frame + number_of_frames_completed > 0:
+            cap.set(cv2.CAP_PROP_POS_FRAMES, start_frame + number_of_frames_completed)
 
+        number_of_frames_remaining = number_of_frames - number_of_frames_completed
         if use_tqdm:
             iterator = tqdm(
-                range(number_of_frames),
+                range(number_of_frames_remaining),
                 desc=f"processing video: {Path(input_video_filepath).name}",
-                total=number_of_frames,
+                total=number_of_frames_remaining,
                 colour="magenta",
                 unit="frames",
                 dynamic_ncols=True,
             )
         else:
-            iterator = range(number_of_frames)
+            iterator = range(number_of_frames_remaining)
 
-        for _frame_number in iterator:
-            if not ret or frame is None:
-                logger.error(
-                    f"Failed to load an image from: {str(input_video_filepath)}"
-                )
-                raise ValueError("Failed to load an image from: " + str(input_video_filepath))
+        frame_prefetcher = FramePrefetcher(
+            capture=cap,
+            number_of_frames=number_of_frames_remaining,
+            queue_size=prefetch_queue_size,
+        )
 
-            self.process_image(frame)
-            if self.recorder is not None:
-                self.recorder.record(self.tracked_objects)
+        frames_since_flush = 0
+        processing_finished = False
+        reuse_annotation_buffer = self.reuse_annotation_buffer
+        self.reuse_annotation_buffer = True
+
+        try:
+            frame_prefetcher.start()
+            batch = []
+            for frame_number in iterator:
+                ret, frame = frame_prefetcher.read()
+                if not ret or frame is None:
+                    if stream_data:
+                        # the frame count is only an estimate for some containers, keep what decoded
+                        logger.warning(
+                            f"Video {str(input_video_filepath)} ended after "
+                            f"{number_of_frames_completed + frame_number} of {number_of_frames} frames"
+                        )
+                        break
+                    logger.error(
+                        f"Failed to load an image from: {str(input_video_filepath)}"
+                    )
+                    raise ValueError("Failed to load an image from: " + str(input_video_filepath))
+
+                batch.append(frame)
+                if len(batch) < batch_size and frame_number < number_of_frames_remaining - 1:
+                    continue
+
+                frames_since_flush += self.process_and_record_batch(batch, video_handler)
+                batch = []
+
+                if stream_data and frames_since_flush >= stream_chunk_size:
+                    data_stream = self.stream_tracked_objects(
+                        data_stream, output_data_filepath, number_of_frames, image_size
+                    )
+                    frames_since_flush = 0
+                    if checkpoint_path is not None:
+                        self.save_data_stream_checkpoint(
+                            checkpoint_path, data_stream, start_frame, number_of_frames, image_size
+                        )
+
+            if batch:
+                frames_since_flush += self.process_and_record_batch(batch, video_handler)
+
+            if stream_data and frames_since_flush > 0:
+                data_stream = self.stream_tracked_objects(
+                    data_stream, output_data_filepath, number_of_frames, image_size
+                )
+            processing_finished = True
+        finally:
+            self.reuse_annotation_buffer = reuse_annotation_buffer
+            frame_prefetcher.stop()
+            cap.release()
             if video_handler is not None:
-                if self.annotated_image is None:
-                    self.annotated_image = frame
-                video_handler.add_frame(self.annotated_image)
+                video_handler.close(raise_errors=processing_finished)
+            if data_stream is not None:
+                # keep the full file on failure, so a checkpointed run can continue writing into it
+                data_stream.close(truncate=processing_finished or checkpoint_path is None)
+
+        if stream_data and data_stream is not None:
+            if checkpoint_path is not None:
+                # the file is now truncated to the frames that decoded, so mark it complete at that length
+                self.save_data_stream_checkpoint(
+                    checkpoint_path, data_stream, start_frame, len(data_stream), image_size
+                )
+            logger.info(f"Streamed recorded objects to {output_data_filepath}")
+            output_array = np.load(output_data_filepath, mmap_mode="r")
+        else:
+            output_array = self.process_and_save_tracked_objects(
+                output_data_filepath, save_data_bool or stream_data, image_size
+            )
 
-            ret, frame = cap.read()
+        self.cleanup()
 
-        cap.release()
-        if video_handler is not None:
-            video_handler.close()
+        return output_array
 
-        output_array = self.process_and_save_tracked_objects(
-            input_video_filepath, save_data_bool, image_size
+    def process_synchronized_videos(
+        self,
+        input_video_filepaths: List[Union[str, Path]],
+        output_video_filepaths: Optional[List[Optional[Union[str, Path]]]] = None,
+        use_tqdm: bool = True,
+        prefetch_queue_size: int = 8,
+        async_video_writing: bool = True,
+    ) -> Optional[np.ndarray]:
+        """
+        Run the tracker on synchronized videos in lockstep, passing frame i of every video to one `process_batch` call,
+        so a single model instance serves every camera.
+
+        Each video is recorded by its own copy of the tracker's recorder.
+        Videos are processed up to the length of the shortest one.
+
+        :param input_video_filepaths: Paths to the synchronized videos, one per camera.
+        :param output_video_filepaths: Paths to save each camera's annotated video to, or None to not save annotated videos.
+        :param use_tqdm: Whether to use tqdm to show a progress bar
+        :param prefetch_queue_size: Number of frames to decode ahead per video on background threads.
+        :param async_video_writing: Whether to encode the annotated videos on background threads.
+        :return: Array of tracked data with shape (numCams, numFrames, ...), if the tracker has an associated recorder
+        :raise ValueError: If the tracker does not process frames independently.
+        """
+        if not self.processes_frames_independently:
+            raise ValueError(
+                f"{self.__class__.__name__} keeps state between frames, so it cannot interleave frames from several videos"
+            )
+        if output_video_filepaths is None:
+            output_video_filepaths = [None] * len(input_video_filepaths)
+
+        captures = [cv2.VideoCapture(str(video_path)) for video_path in input_video_filepaths]
+        image_sizes = [
+            (int(cap.get(cv2.CAP_PROP_FRAME_WIDTH)), int(cap.get(cv2.CAP_PROP_FRAME_HEIGHT)))
+            for cap in captures
+        ]
+        frame_counts = [int(cap.get(cv2.CAP_PROP_FRAME_COUNT)) for cap in captures]
+        number_of_frames = min(frame_counts)
+        if len(set(frame_counts)) > 1:
+            logger.warning(
+                f"Synchronized videos have different frame counts {frame_counts}, processing the first {number_of_frames} frames"
+            )
+
+        if self.recorder is not None:
+            self.recorder.clear_recorded_objects()
+        recorders = (
+            [copy.deepcopy(self.recorder) for _ in input_video_filepaths]
+            if self.recorder is not None
+            else [None] * len(input_video_filepaths)
         )
+        video_handlers = [
+            VideoHandler(
+                output_path=output_video_filepath,
+                frame_size=image_size,
+                fps=cap.get(cv2.CAP_PROP_FPS),
+                async_write=async_video_writing,
+            )
+            if output_video_filepath is not None
+            else None
+            for output_video_filepath, image_size, cap in zip(
+                output_video_filepaths, image_sizes, captures
+            )
+        ]
+        frame_prefetchers = [
+            FramePrefetcher(
+                capture=cap, number_of_frames=number_of_frames, queue_size=prefetch_queue_size
+            )
+            for cap in captures
+        ]
+
+        iterator = range(number_of_frames)
+        if use_tqdm:
+            iterator = tqdm(
+                iterator,
+                desc=f"processing {len(input_video_filepaths)} synchronized videos",
+                total=number_of_frames,
+                colour="magenta",
+                unit="frames",
+                dynamic_ncols=True,
+            )
+
+        processing_finished = False
+        reuse_annotation_buffer = self.reuse_annotation_buffer
+        self.reuse_annotation_buffer = True
+        try:
+            for frame_prefetcher in frame_prefetchers:
+                frame_prefetcher.start()
+            for _frame_number in iterator:
+                batch = []
+                for video_path, frame_prefetcher in zip(input_video_filepaths, frame_prefetchers):
+                    ret, frame = frame_prefetcher.read()
+                    if not ret or frame is None:
+                        logger.error(f"Failed to load an image from: {str(video_path)}")
+                        raise ValueError("Failed to load an image from: " + str(video_path))
+                    batch.append(frame)
+
+                for frame, recorder, video_handler, _tracked_objects in zip(
+                    batch, recorders, video_handlers, self.process_batch(batch)
+                ):
+                    if recorder is not None:
+                        self.record_tracked_objects(recorder)
+                    if video_handler is not None:
+                        if self.annotated_image is None:
+                            self.annotated_image = frame
+                        video_handler.add_frame(self.annotated_image)
+            processing_finished = True
+        finally:
+            self.reuse_annotation_buffer = reuse_annotation_buffer
+            for frame_prefetcher, cap in zip(frame_prefetchers, captures):
+                frame_prefetcher.stop()
+                cap.release()
+            for video_handler in video_handlers:
+                if video_handler is not None:
+                    video_handler.close(raise_errors=processing_finished)
 
         self.cleanup()
+        if self.recorder is None:
+            return None
+        return np.stack(
+            [
+                recorder.process_tracked_objects(image_size=image_size)
+                for recorder, image_size in zip(recorders, image_sizes)
+            ]
+        )
 
-        return output_array
+    def load_data_stream_checkpoint(
+        self,
+        checkpoint_path: Path,
+        data_file_path: Path,
+        start_frame: int,
+        number_of_frames: int,
+        image_size: tuple,
+    ) -> Optional[MemoryMappedFrameBuffer]:
+        """
+        Reopen a data file that was being streamed to, at the frame its checkpoint records.
+
+        :param checkpoint_path: Path of the checkpoint file.
+        :param data_file_path: Path of the .npy data file.
+        :param start_frame: Index of the first frame of the video being processed.
+        :param number_of_frames: Number of frames being processed.
+        :param image_size: Size of the video's frames, as (width, height).
+        :return: The reopened data file, or None if there is no checkpoint from this tracker for this video and frame range.
+        """
+        checkpoint = load_checkpoint(checkpoint_path)
+        if checkpoint is None or not data_file_path.exists():
+            return None
+        if checkpoint.tracker_name != self.__class__.__name__ or tuple(
+            checkpoint.image_size
+        ) != tuple(image_size):
+            logger.warning(
+                f"Checkpoint {checkpoint_path} was written by {checkpoint.tracker_name} for {checkpoint.image_size} frames, "
+                f"not {self.__class__.__name__} for {list(image_size)} frames, starting over"
+            )
+            return None
+        if checkpoint.start_frame != start_frame or (
+            checkpoint.number_of_frames != number_of_frames and not checkpoint.completed
+        ):
+            logger.warning(
+                f"Checkpoint {checkpoint_path} covers frames {checkpoint.start_frame} to "
+                f"{checkpoint.start_frame + checkpoint.number_of_frames}, starting over"
+            )
+            return None
+
+        logger.info(
+            f"Resuming from checkpoint {checkpoint_path} after {checkpoint.number_of_frames_completed} frames"
+        )
+        return MemoryMappedFrameBuffer(
+            file_path=data_file_path,
+            number_of_frames=checkpoint.number_of_frames,
+            frame_shape=tuple(checkpoint.frame_shape),
+            dtype=np.dtype(checkpoint.dtype),
+            number_of_frames_written=checkpoint.number_of_frames_completed,
+        )
+
+    def save_data_stream_checkpoint(
+        self,
+        checkpoint_path: Path,
+        data_stream: MemoryMappedFrameBuffer,
+        start_frame: int,
+        number_of_frames: int,
+        image_size: tuple,
+    ) -> None:
+        """
+        Record how many frames have been written to a data file, so processing can resume after them.
+
+        :param checkpoint_path: Path of the checkpoint file.
+        :param data_stream: The data file being streamed to, flushed up to its current length.
+        :param start_frame: Index of the first frame of the video being processed.
+        :param number_of_frames: Number of frames being processed.
+        :param image_size: Size of the video's frames, as (width, height).
+        """
+        save_checkpoint(
+            checkpoint_path,
+            VideoCheckpoint(
+                tracker_name=self.__class__.__name__,
+                image_size=list(image_size),
+                start_frame=start_frame,
+                number_of_frames=number_of_frames,
+                number_of_frames_completed=len(data_stream),
+                frame_shape=list(data_stream.frame_shape),
+                dtype=data_stream.dtype.str,
+            ),
+        )
+
+    def process_and_record_batch(
+        self, batch: List[np.ndarray], video_handler: Optional[VideoHandler]
+    ) -> int:
+        """
+        Run the tracker on a batch of frames, recording the tracked objects and writing the annotated frames.
+
+        :param batch: A list of video frames.
+        :param video_handler: The handler to write annotated frames to, or None to skip writing.
+        :return: The number of frames recorded.
+        """
+        number_of_frames_recorded = 0
+        for batch_frame, _tracked_objects in zip(batch, self.process_batch(batch)):
+            if self.recorder is not None:
+                self.record_tracked_objects(self.recorder)
+                number_of_frames_recorded += 1
+            if video_handler is not None:
+                if self.annotated_image is None:
+                    self.annotated_image = batch_frame
+                video_handler.add_frame(self.annotated_image)
+        return number_of_frames_recorded
+
+    def record_tracked_objects(self, recorder: BaseRecorder) -> None:
+        """
+        Record the results of the last processed image.
+
+        Trackers whose recorder can take the results as arrays, rather than tracked objects, should override this.
+
+        :param recorder: The recorder to record to.
+        """
+        recorder.record(self.tracked_objects)
 
     def process_and_save_tracked_objects(
         self,
@@ -152,14 +628,59 @@ class BaseTracker(ABC):
             output_array = None
         return output_array
 
+    def stream_tracked_objects(
+        self,
+        data_stream: Optional[MemoryMappedFrameBuffer],
+        file_path: Path,
+        number_of_frames: int,
+        image_size: tuple,
+    ) -> MemoryMappedFrameBuffer:
+        """
+        Write the frames recorded since the last call to a memory-mapped .npy file, and clear them from the recorder.
+
+        The file is created on the first call, once the shape of a frame's data is known.
+
+        :param data_stream: The open file, or None to create it.
+        :param file_path: Path of the .npy file.
+        :param number_of_frames: The number of frames expected in the video, used to size the file.
+        :param image_size: The (width, height) of the video frames.
+        :return: The open file.
+        """
+        chunk = self.recorder.process_tracked_objects(image_size=image_size)
+        if data_stream is None:
+            data_stream = MemoryMappedFrameBuffer(
+                file_path=file_path,
+                number_of_frames=number_of_frames,
+                frame_shape=chunk.shape[1:],
+                dtype=chunk.dtype,
+            )
+        data_stream.append_frames(chunk)
+        data_stream.flush()
+        self.recorder.clear_recorded_objects()
+        return data_stream
+
     def cleanup(self) -> None:
         """
-        Run any cleanup code for the tracker, including clearing the recorded objects.
+        Run any cleanup code for the tracker, including clearing the recorded objects and any temporal state,
+        so the tracker can be reused for another video.
 
         Can be overridden by subclasses if any tracker needs a specific cleanup.
         """
         if self.recorder is not None:
             self.recorder.clear_recorded_objects()
+        self.reset_temporal_state()
+
+    def reset_temporal_state(self) -> None:
+        """
+        Forget anything carried over from previous frames, so the next frame is processed as the start of a new video.
+
+        Trackers that keep state between frames (i.e. landmark smoothing) should override this and call super().
+        """
+        for tracked_object_name in self.tracked_objects:
+            self.tracked_objects[tracked_object_name] = TrackedObject(
+                object_id=tracked_object_name
+            )
+        self.annotated_image = None
 
     def demo(self) -> None:
         """
@@ -0,0 +1,263 @@
+from pathlib import Path
+from typing import Optional, Tuple, Union
+
+import numpy as np
+
+
+class GrowableFrameBuffer:
+    """
+    A preallocated array of per-frame data that grows as frames are added.
+
+    Frames are written in place into the next free row, and the capacity doubles whenever it runs out,
+    so recording n frames costs O(n) amortized copies instead of one allocation per frame.
+    """
+
+    def __init__(
+        self,
+        frame_shape: Tuple[int, ...],
+        dtype: np.dtype = np.float32,
+        initial_capacity: int = 1024,
+        fill_value: float = np.nan,
+    ):
+        """
+        Initialize the GrowableFrameBuffer.
+
+        :param frame_shape: The shape of the data for a single frame, i.e. (num_tracked_points, 3).
+        :param dtype: The data type of the buffer.
+        :param initial_capacity: The number of frames to preallocate.
+        :param fill_value: The value each new frame is initialized to, so missing data needs no explicit write.
+        """
+        self.frame_shape = tuple(frame_shape)
+        self.dtype = np.dtype(dtype)
+        self.initial_capacity = max(int(initial_capacity), 1)
+        self.fill_value = fill_value
+
+        self._buffer = np.empty((self.initial_capacity, *self.frame_shape), dtype=self.dtype)
+        self._number_of_frames = 0
+
+    def __len__(self) -> int:
+        return self._number_of_frames
+
+    @property
+    def capacity(self) -> int:
+        return self._buffer.shape[0]
+
+    @property
+    def array(self) -> np.ndarray:
+        """
+        A view of the frames recorded so far, with shape (number_of_frames, *frame_shape).
+        """
+        return self._buffer[: self._number_of_frames]
+
+    def reserve(self, number_of_frames: int) -> None:
+        """
+        Make sure the buffer can hold at least `number_of_frames` frames without growing.
+
+        :param number_of_frames: The total number of frames expected.
+        """
+        if number_of_frames > self.capacity:
+            self._resize(number_of_frames)
+
+    def next_frame(self) -> np.ndarray:
+        """
+        Claim the next frame in the buffer.
+
+        :return: A writable view of the new frame, initialized to the fill value.
+        """
+        if self._number_of_frames == self.capacity:
+            self._resize(2 * self.capacity)
+        frame = self._buffer[self._number_of_frames]
+        frame.fill(self.fill_value)
+        self._number_of_frames += 1
+        return frame
+
+    def append(self, frame_data: np.ndarray) -> None:
+        """
+        Copy one frame of data into the buffer.
+
+        :param frame_data: Array with shape `frame_shape`.
+        """
+        self.next_frame()[...] = frame_data
+
+    def clear(self) -> None:
+        """
+        Drop all recorded frames and release any memory beyond the initial capacity.
+        """
+        if self.capacity > self.initial_capacity:
+            self._buffer = np.empty((self.initial_capacity, *self.frame_shape), dtype=self.dtype)
+        self._number_of_frames = 0
+
+    def _resize(self, capacity: int) -> None:
+        new_buffer = np.empty((capacity, *self.frame_shape), dtype=self.dtype)
+        new_buffer[: self._number_of_frames] = self._buffer[: self._number_of_frames]
+        self._buffer = new_buffer
+
+
+class MemoryMappedFrameBuffer:
+    """
+    Per-frame data written straight into a memory-mapped .npy file, so recorded data does not accumulate in memory.
+
+    The file is sized for the expected number of frames up front. `close()` shrinks it to the frames actually written,
+    i.e. when a video decodes fewer frames than `CAP_PROP_FRAME_COUNT` promised.
+    """
+
+    def __init__(
+        self,
+        file_path: Union[str, Path],
+        number_of_frames: int,
+        frame_shape: Tuple[int, ...],
+        dtype: np.dtype = np.float64,
+        fill_value: float = np.nan,
+        number_of_frames_written: Optional[int] = None,
+    ):
+        """
+        Initialize the MemoryMappedFrameBuffer, creating the .npy file.
+
+        :param file_path: Path of the .npy file to write.
+        :param number_of_frames: The maximum number of frames the file can hold.
+        :param frame_shape: The shape of the data for a single frame, i.e. (num_tracked_points, 3).
+        :param dtype: The data type of the file.
+        :param fill_value: The value each new frame is initialized to when claimed with `next_frame`.
+        :param number_of_frames_written: Open an existing, untruncated file and continue writing after this many frames,
+            instead of creating a new file.
+        """
+        self.file_path = Path(file_path)
+        self.frame_shape = tuple(frame_shape)
+        self.dtype = np.dtype(dtype)
+        self.fill_value = fill_value
+
+        shape = (number_of_frames, *self.frame_shape)
+        if number_of_frames_written is None:
+            self._memmap: Optional[np.memmap] = np.lib.format.open_memmap(
+                str(self.file_path), mode="w+", dtype=self.dtype, shape=shape
+            )
+            self._number_of_frames = 0
+        else:
+            self._memmap = np.lib.format.open_memmap(str(self.file_path), mode="r+")
+            if self._memmap.shape != shape or self._memmap.dtype != self.dtype:
+                raise ValueError(
+                    f"Expected {self.file_path} to hold {shape} {self.dtype} data, "
+                    f"found {self._memmap.shape} {self._memmap.dtype}"
+                )
+            if not 0 <= number_of_frames_written <= number_of_frames:
+                raise ValueError(
+                    f"Cannot continue {self.file_path} with {number_of_frames} frames after frame {number_of_frames_written}"
+                )
+            self._number_of_frames = number_of_frames_written
+
+    def __len__(self) -> int:
+        return self._number_of_frames
+
+    @property
+    def capacity(self) -> int:
+        return self._memmap.shape[0]
+
+    @property
+    def array(self) -> np.ndarray:
+        """
+        A view of the frames written so far, with shape (number_of_frames, *frame_shape).
+        """
+        return self._memmap[: self._number_of_frames]
+
+    def next_frame(self) -> np.ndarray:
+        """
+        Claim the next frame in the file.
+
+        :return: A writable view of the new frame, initialized to the fill value.
+        """
+        self._check_capacity(1)
+        frame = self._memmap[self._number_of_frames]
+        frame.fill(self.fill_value)
+        self._number_of_frames += 1
+        return frame
+
+    def append(self, frame_data: np.ndarray) -> None:
+        """
+        Copy one frame of data into the file.
+
+        :param frame_data: Array with shape `frame_shape`.
+        """
+        self.next_frame()[...] = frame_data
+
+    def append_frames(self, frames: np.ndarray) -> None:
+        """
+        Copy several frames of data into the file.
+
+        :param frames: Array with shape (number_of_frames, *frame_shape).
+        """
+        if tuple(frames.shape[1:]) != self.frame_shape:
+            raise ValueError(
+                f"Expected frames with shape {self.frame_shape}, got {tuple(frames.shape[1:])}"
+            )
+        self._check_capacity(frames.shape[0])
+        self._memmap[self._number_of_frames : self._number_of_frames + frames.shape[0]] = frames
+        self._number_of_frames += frames.shape[0]
+
+    def flush(self) -> None:
+        """
+        Write any changes in memory to disk.
+        """
+        self._memmap.flush()
+
+    def close(self, truncate: bool = True) -> None:
+        """
+        Flush the file and truncate it to the number of frames written.
+
+        :param truncate: Whether to truncate the file, False keeps its full size so writing can continue later.
+        """
+        if self._memmap is None:
+            return
+        self._memmap.flush()
+        number_of_frames_allocated = self._memmap.shape[0]
+        self._memmap = None
+
+        if truncate and self._number_of_frames < number_of_frames_allocated:
+            truncate_npy_file(self.file_path, self._number_of_frames)
+
+    def _check_capacity(self, number_of_new_frames: int) -> None:
+        if self._memmap is None:
+            raise ValueError(f"Cannot write to closed file {self.file_path}")
+        if self._number_of_frames + number_of_new_frames > self.capacity:
+            raise ValueError(
+                f"Cannot write more than {self.capacity} frames to {self.file_path}"
+            )
+
+
+def truncate_npy_file(file_path: Union[str, Path], number_of_frames: int) -> None:
+    """
+    Shrink a C-ordered .npy file in place to its first `number_of_frames` entries along the first axis.
+
+    The header is rewritten with the new shape, padded to its original length so the data does not move.
+
+    :param file_path: Path of the .npy file.
+    :param number_of_frames: The number of frames to keep.
+    """
+    with open(file_path, "r+b") as npy_file:
+        version = np.lib.format.read_magic(npy_file)
+        header_length_start = npy_file.tell()
+        if version == (1, 0):
+            shape, fortran_order, dtype = np.lib.format.read_array_header_1_0(npy_file)
+            header_length_size = 2
+        else:
+            shape, fortran_order, dtype = np.lib.format.read_array_header_2_0(npy_file)
+            header_length_size = 4
+        data_start = npy_file.tell()
+
+        if fortran_order:
+            raise ValueError(f"Cannot truncate Fortran-ordered array in {file_path}")
+        if number_of_frames > shape[0]:
+            raise ValueError(
+                f"Cannot truncate {file_path} with {shape[0]} frames to {number_of_frames} frames"
+            )
+
+        new_shape = (number_of_frames, *shape[1:])
+        header = "{'descr': %r, 'fortran_order': False, 'shape': %r, }" % (
+            np.lib.format.dtype_to_descr(dtype),
+            new_shape,
+        )
+        header_length = data_start - header_length_start - header_length_size
+        npy_file.seek(header_length_start + header_length_size)
+        npy_file.write(header.ljust(header_length - 1).encode("latin1") + b"\n")
+
+        frame_size_bytes = int(np.prod(shape[1:], dtype=np.int64)) * dtype.itemsize
+        npy_file.truncate(data_start + number_of_frames * frame_size_bytes)
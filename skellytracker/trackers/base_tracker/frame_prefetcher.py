@@ -0,0 +1,137 @@
+import logging
+import queue
+import threading
+from typing import Optional, Tuple
+
+import cv2
+import numpy as np
+
+logger = logging.getLogger(__name__)
+
+
+class FramePrefetcher:
+    """
+    Decode frames from a video capture on a background thread, so decoding overlaps with tracking.
+
+    Frames are handed over through a bounded queue, so at most `queue_size` decoded frames are held in memory.
+    `read()` mirrors `cv2.VideoCapture.read()`, returning `(False, None)` once the capture fails or runs out of frames.
+    """
+
+    def __init__(
+        self,
+        capture: cv2.VideoCapture,
+        number_of_frames: int,
+        queue_size: int = 8,
+    ):
+        """
+        Initialize the FramePrefetcher.
+
+        :param capture: An opened video capture, positioned at the first frame to read.
+        :param number_of_frames: The number of frames to read from the capture.
+        :param queue_size: The maximum number of decoded frames to buffer, 0 to read synchronously on the calling thread.
+        """
+        self.capture = capture
+        self.number_of_frames = number_of_frames
+        self.queue_size = queue_size
+
+        self._frame_queue: "queue.Queue[Tuple[bool, Optional[np.ndarray]]]" = queue.Queue(
+            maxsize=max(queue_size, 1)
+        )
+        self._stop_event = threading.Event()
+        self._thread: Optional[threading.Thread] = None
+        self._frames_read = 0
+        self._exhausted = False
+        self._error: Optional[Exception] = None
+
+    def __enter__(self) -> "FramePrefetcher":
+        self.start()
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback) -> None:
+        self.stop()
+
+    def start(self) -> None:
+        """
+        Start the background decoding thread. Does nothing when reading synchronously.
+        """
+        if self.queue_size <= 0 or self._thread is not None:
+            return
+        self._thread = threading.Thread(
+            target=self._decode_frames, name="FramePrefetcher", daemon=True
+        )
+        self._thread.start()
+
+    def read(self) -> Tuple[bool, Optional[np.ndarray]]:
+        """
+        Get the next decoded frame.
+
+        :return: Tuple of (success, frame), matching the return of `cv2.VideoCapture.read()`.
+        :raise RuntimeError: If the decoding thread failed with an error other than a decoding error.
+        """
+        if self._exhausted or self._frames_read >= self.number_of_frames:
+            return False, None
+
+        if self._thread is None:
+            ret, frame = self.capture.read()
+        else:
+            ret, frame = self._frame_queue.get()
+
+        if not ret or frame is None:
+            self._exhausted = True
+            if self._error is not None:
+                raise RuntimeError("Failed to read frames from the video capture") from self._error
+            return False, None
+
+        self._frames_read += 1
+        return ret, frame
+
+    def stop(self) -> None:
+        """
+        Stop the background decoding thread and discard any frames that have not been read.
+        """
+        if self._thread is None:
+            return
+        self._stop_event.set()
+        # unblock the decoding thread if it is waiting on a full queue
+        while self._thread.is_alive():
+            self._drain_queue()
+            self._thread.join(timeout=0.1)
+        self._drain_queue()
+        self._thread = None
+
+    def _drain_queue(self) -> None:
+        try:
+            while True:
+                self._frame_queue.get_nowait()
+        except queue.Empty:
+            pass
+
+    def _decode_frames(self) -> None:
+        try:
+            for _frame_number in range(self.number_of_frames):
+                if self._stop_event.is_set():
+                    return
+                ret, frame = self.capture.read()
+                self._put((ret, frame))
+                if not ret or frame is None:
+                    return
+        except cv2.error as e:
+            logger.error(f"Failed to decode frame: {e}")
+            self._put((False, None))
+        except Exception as e:
+            logger.exception(f"Frame decoding thread failed: {e}")
+            # `read()` re-raises this once it reaches the failure in the queue
+            self._error = e
+            self._put((False, None))
+
+    def _put(self, item: Tuple[bool, Optional[np.ndarray]]) -> None:
+        while not self._stop_event.is_set():
+            if self._try_put(item):
+                return
+
+    def _try_put(self, item: Tuple[bool, Optional[np.ndarray]]) -> bool:
+        try:
+            self._frame_queue.put(item, timeout=0.1)
+        except queue.Full:
+            return False
+        return True
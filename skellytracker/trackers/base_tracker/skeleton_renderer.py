@@ -0,0 +1,215 @@
+from typing import Dict, List, Literal, Optional, Tuple, Type
+
+import cv2
+import numpy as np
+
+from skellytracker.trackers.base_tracker.model_info import ModelInfo
+
+
+def get_virtual_marker_weights(
+    landmark_names: List[str],
+    virtual_markers_definitions: Dict[str, Dict[str, list]],
+) -> Tuple[List[str], np.ndarray]:
+    """
+    Convert virtual marker definitions into a weight matrix, so every virtual marker is computed with one matrix product.
+
+    Virtual markers built from points that are not in `landmark_names` are skipped.
+
+    :param landmark_names: The names of the tracked points, in array order.
+    :param virtual_markers_definitions: The model's virtual marker definitions.
+    :return: The names of the virtual markers, and their (num_virtual_markers, num_tracked_points) weights
+    """
+    landmark_indices = {name: index for index, name in enumerate(landmark_names)}
+
+    virtual_marker_names = []
+    weight_rows = []
+    for virtual_marker_name, definition in virtual_markers_definitions.items():
+        if not all(name in landmark_indices for name in definition["marker_names"]):
+            continue
+        weights = np.zeros(len(landmark_names))
+        for name, weight in zip(definition["marker_names"], definition["marker_weights"]):
+            weights[landmark_indices[name]] += weight
+        virtual_marker_names.append(virtual_marker_name)
+        weight_rows.append(weights)
+
+    return virtual_marker_names, np.array(weight_rows).reshape(-1, len(landmark_names))
+
+
+def get_segment_connection_indices(
+    point_names: List[str], segment_connections: Dict[str, Dict[str, str]]
+) -> np.ndarray:
+    """
+    Convert segment connections between named points into pairs of point indices.
+
+    Segments between points that are not in `point_names` are skipped.
+
+    :param point_names: The names of the points, in array order.
+    :param segment_connections: The model's segment connections, with "proximal" and "distal" point names.
+    :return: Array of shape (num_segments, 2) of point indices
+    """
+    point_indices = {name: index for index, name in enumerate(point_names)}
+    connections = [
+        (point_indices[segment["proximal"]], point_indices[segment["distal"]])
+        for segment in segment_connections.values()
+        if segment["proximal"] in point_indices and segment["distal"] in point_indices
+    ]
+    return np.array(connections, dtype=np.int64).reshape(-1, 2)
+
+
+class SkeletonRenderer:
+    """
+    Draws tracked points and the segments connecting them onto an image.
+
+    All segments are drawn in one batched `cv2.polylines` call, and all markers in one more
+    (dots are drawn as zero-length lines, crosses as pairs of lines), instead of a drawing call per point.
+    """
+
+    def __init__(
+        self,
+        connections: Optional[np.ndarray] = None,
+        virtual_marker_weights: Optional[np.ndarray] = None,
+        marker_type: Literal["dot", "cross"] = "dot",
+        marker_size: int = 6,
+        marker_thickness: int = 2,
+        marker_color: Tuple[int, int, int] = (0, 0, 255),
+        line_thickness: int = 2,
+        line_color: Tuple[int, int, int] = (224, 224, 224),
+    ):
+        """
+        Initialize the SkeletonRenderer.
+
+        :param connections: Array of shape (num_segments, 2) of the point indices to connect.
+            Indices past the tracked points refer to virtual markers, in `virtual_marker_weights` order.
+        :param virtual_marker_weights: Array of shape (num_virtual_markers, num_tracked_points)
+            for computing virtual markers from the tracked points.
+        :param marker_type: Draw points as filled "dot"s or as "cross"es.
+        :param marker_size: Diameter of dots, or width of crosses, in pixels. 0 draws no markers.
+        :param marker_thickness: Line thickness of crosses.
+        :param marker_color: BGR color of the markers.
+        :param line_thickness: Line thickness of the segments.
+        :param line_color: BGR color of the segments.
+        """
+        self.connections = (
+            np.asarray(connections, dtype=np.int64).reshape(-1, 2)
+            if connections is not None
+            else np.empty((0, 2), dtype=np.int64)
+        )
+        self.virtual_marker_weights = virtual_marker_weights
+        self.marker_type = marker_type
+        self.marker_size = marker_size
+        self.marker_thickness = marker_thickness
+        self.marker_color = marker_color
+        self.line_thickness = line_thickness
+        self.line_color = line_color
+
+        self._buffer: Optional[np.ndarray] = None
+
+    @classmethod
+    def from_model_info(cls, model_info: Type[ModelInfo], **kwargs) -> "SkeletonRenderer":
+        """
+        Create a renderer drawing the segments in a model's `segment_connections`,
+        including segments to its virtual markers, for points in `landmark_names` order.
+
+        :param model_info: The model info class.
+        :return: The renderer
+        """
+        virtual_marker_names, virtual_marker_weights = get_virtual_marker_weights(
+            model_info.landmark_names, model_info.virtual_markers_definitions or {}
+        )
+        connections = get_segment_connection_indices(
+            model_info.landmark_names + virtual_marker_names,
+            model_info.segment_connections or {},
+        )
+        return cls(
+            connections=connections,
+            virtual_marker_weights=virtual_marker_weights if virtual_marker_names else None,
+            **kwargs,
+        )
+
+    def render(
+        self,
+        image: np.ndarray,
+        points: np.ndarray,
+        copy: bool = True,
+        reuse_buffer: bool = False,
+    ) -> np.ndarray:
+        """
+        Draw points and their segments onto an image.
+
+        :param image: The image to draw on.
+        :param points: Array of shape (num_points, 2+) or (num_skeletons, num_points, 2+) of pixel coordinates,
+            NaN for points that were not tracked.
+        :param copy: Whether to draw on a copy of the image, instead of on the image itself.
+        :param reuse_buffer: Whether to make the copy into a buffer kept by the renderer instead of a new array,
+            avoiding an allocation per call. The returned image is then overwritten by the next call,
+            so only use it when the image is consumed before rendering again.
+        :return: The annotated image
+        """
+        if copy and reuse_buffer:
+            if (
+                self._buffer is None
+                or self._buffer.shape != image.shape
+                or self._buffer.dtype != image.dtype
+            ):
+                self._buffer = np.empty_like(image)
+            np.copyto(self._buffer, image)
+            image = self._buffer
+        elif copy:
+            image = image.copy()
+
+        points = np.asarray(points, dtype=np.float64)[..., :2]
+        if points.size == 0:
+            return image
+        if points.ndim == 2:
+            points = points[np.newaxis]
+        if self.virtual_marker_weights is not None:
+            virtual_points = np.einsum("vn,snd->svd", self.virtual_marker_weights, points)
+            points = np.concatenate([points, virtual_points], axis=1)
+        number_of_skeletons, number_of_points = points.shape[:2]
+
+        points = points.reshape(-1, 2)
+        visible = ~np.isnan(points).any(axis=1)
+        pixel_points = np.nan_to_num(points).round().astype(np.int32)
+
+        connections = self.connections[(self.connections < number_of_points).all(axis=1)]
+        if connections.size > 0:
+            # offset the segments of each skeleton to its points
+            skeleton_offsets = number_of_points * np.arange(number_of_skeletons)
+            connections = (
+                connections[np.newaxis] + skeleton_offsets[:, np.newaxis, np.newaxis]
+            ).reshape(-1, 2)
+            connections = connections[visible[connections].all(axis=1)]
+        if connections.size > 0:
+            cv2.polylines(
+                image,
+                pixel_points[connections],
+                isClosed=False,
+                color=self.line_color,
+                thickness=self.line_thickness,
+            )
+
+        visible_points = pixel_points[visible]
+        if visible_points.size > 0 and self.marker_size > 0:
+            if self.marker_type == "cross":
+                half_size = self.marker_size // 2
+                horizontal = np.array([[-half_size, 0], [half_size, 0]], dtype=np.int32)
+                vertical = np.array([[0, -half_size], [0, half_size]], dtype=np.int32)
+                marker_lines = np.concatenate(
+                    [
+                        visible_points[:, np.newaxis] + horizontal,
+                        visible_points[:, np.newaxis] + vertical,
+                    ]
+                )
+                thickness = self.marker_thickness
+            else:
+                marker_lines = np.repeat(visible_points[:, np.newaxis], 2, axis=1)
+                thickness = self.marker_size
+            cv2.polylines(
+                image,
+                marker_lines,
+                isClosed=False,
+                color=self.marker_color,
+                thickness=thickness,
+            )
+
+        return image
@@ -0,0 +1,74 @@
+from dataclasses import asdict, dataclass
+import json
+import logging
+import os
+from pathlib import Path
+from typing import List, Optional, Union
+
+logger = logging.getLogger(__name__)
+
+
+@dataclass
+class VideoCheckpoint:
+    """
+    A dataclass for storing the progress of a video being streamed to a memory-mapped .npy file,
+    so processing can continue from the last completed frame after a crash.
+
+    The tracker and video image size are recorded so a different tracker, or a different video, starts over instead of resuming it.
+    """
+
+    tracker_name: str
+    image_size: List[int]
+    start_frame: int
+    number_of_frames: int
+    number_of_frames_completed: int
+    frame_shape: List[int]
+    dtype: str
+
+    @property
+    def completed(self) -> bool:
+        return self.number_of_frames_completed >= self.number_of_frames
+
+
+def get_checkpoint_path(data_file_path: Union[str, Path]) -> Path:
+    """
+    Get the path of the checkpoint file that tracks progress writing to a data file.
+
+    :param data_file_path: Path of the .npy data file.
+    :return: Path of the checkpoint .json file
+    """
+    return Path(data_file_path).with_suffix(".checkpoint.json")
+
+
+def save_checkpoint(checkpoint_path: Union[str, Path], checkpoint: VideoCheckpoint) -> None:
+    """
+    Save a checkpoint, replacing the previous one atomically so a crash mid-write cannot corrupt it.
+
+    :param checkpoint_path: Path of the checkpoint .json file.
+    :param checkpoint: The checkpoint to save.
+    """
+    checkpoint_path = Path(checkpoint_path)
+    temporary_path = checkpoint_path.with_suffix(".tmp")
+    with open(temporary_path, "w") as checkpoint_file:
+        json.dump(asdict(checkpoint), checkpoint_file)
+        checkpoint_file.flush()
+        os.fsync(checkpoint_file.fileno())
+    os.replace(temporary_path, checkpoint_path)
+
+
+def load_checkpoint(checkpoint_path: Union[str, Path]) -> Optional[VideoCheckpoint]:
+    """
+    Load a checkpoint if one exists.
+
+    :param checkpoint_path: Path of the checkpoint .json file.
+    :return: The checkpoint, or None if there is no readable checkpoint at the path
+    """
+    checkpoint_path = Path(checkpoint_path)
+    if not checkpoint_path.exists():
+        return None
+    try:
+        with open(checkpoint_path, "r") as checkpoint_file:
+            return VideoCheckpoint(**json.load(checkpoint_file))
+    except (json.JSONDecodeError, TypeError) as e:
+        logger.warning(f"Ignoring unreadable checkpoint {checkpoint_path}: {e}")
+        return None
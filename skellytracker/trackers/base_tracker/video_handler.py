@@ -1,6 +1,8 @@
 import logging
+import queue
+import threading
 from pathlib import Path
-from typing import Union
+from typing import List, Optional, Union
 import cv2
 import numpy as np
 
@@ -14,6 +16,8 @@ class VideoHandler:
         frame_size: tuple[int, int],
         fps: float = 30.0,
         codec: str = "mp4v",
+        async_write: bool = False,
+        buffer_size: int = 8,
     ):
         """
         Initialize the VideoHandler.
@@ -22,24 +26,96 @@ class VideoHandler:
         :param frame_size: The size of the frames (width, height).
         :param fps: The frames per second of the output video.
         :param codec: The codec to use for the output video.
+        :param async_write: Whether to encode frames on a background thread instead of in `add_frame`.
+        :param buffer_size: The number of preallocated frame buffers to use when writing asynchronously.
         """
         self.output_path = output_path
+        self.frame_size = frame_size
         fourcc = cv2.VideoWriter.fourcc(*codec)
         self.video_writer = cv2.VideoWriter(
             str(output_path), fourcc, fps, frame_size
         )
 
+        self.async_write = async_write
+        self._frame_buffers: List[np.ndarray] = []
+        self._free_buffers: "queue.Queue[int]" = queue.Queue()
+        self._filled_buffers: "queue.Queue[Optional[int]]" = queue.Queue()
+        self._writer_thread: Optional[threading.Thread] = None
+        self._writer_error: Optional[BaseException] = None
+
+        if self.async_write:
+            width, height = frame_size
+            for buffer_index in range(max(buffer_size, 1)):
+                self._frame_buffers.append(np.empty((height, width, 3), dtype=np.uint8))
+                self._free_buffers.put(buffer_index)
+            self._writer_thread = threading.Thread(
+                target=self._write_frames, name="VideoHandlerWriter", daemon=True
+            )
+            self._writer_thread.start()
+
     def add_frame(self, frame: np.ndarray) -> None:
         """
         Add a frame to the video.
 
+        When writing asynchronously, the frame is copied into a free buffer, blocking until one is available.
+
         :param frame: The frame to add.
+        :raise Exception: The error the background writer failed with, if it failed on an earlier frame.
         """
-        self.video_writer.write(frame)
+        if not self.async_write:
+            self.video_writer.write(frame)
+            return
+
+        self._raise_writer_error()
+
+        buffer_index = self._free_buffers.get()
+        frame_buffer = self._frame_buffers[buffer_index]
+        if frame.shape != frame_buffer.shape:
+            # cv2.VideoWriter silently drops frames that do not match its frame size
+            logger.warning(
+                f"Skipping frame of shape {frame.shape}, expected {frame_buffer.shape} for {self.output_path}"
+            )
+            self._free_buffers.put(buffer_index)
+            return
+        np.copyto(frame_buffer, frame)
+        self._filled_buffers.put(buffer_index)
 
-    def close(self):
+    def close(self, raise_errors: bool = True):
         """
-        Close the video file.
+        Close the video file, writing any frames still waiting in the buffer first.
+
+        :param raise_errors: Whether to raise an error the background writer hit, or only log it.
+            Pass False when closing while another exception is propagating, so the writer error does not mask it.
         """
+        if self._writer_thread is not None:
+            self._filled_buffers.put(None)
+            self._writer_thread.join()
+            self._writer_thread = None
         self.video_writer.release()
         logger.info(f"video saved to {self.output_path}")
+        if raise_errors:
+            self._raise_writer_error()
+        elif self._writer_error is not None:
+            logger.error(f"Video writer for {self.output_path} failed: {self._writer_error}")
+
+    def _write_frames(self) -> None:
+        while True:
+            buffer_index = self._filled_buffers.get()
+            if buffer_index is None:
+                return
+            self._write_buffer(buffer_index)
+
+    def _write_buffer(self, buffer_index: int) -> None:
+        try:
+            if self._writer_error is None:
+                self.video_writer.write(self._frame_buffers[buffer_index])
+        except BaseException as e:
+            # keep draining the queue after a failure, so `add_frame` never waits on a buffer that is not coming back
+            logger.error(f"Failed to write frame to {self.output_path}: {e}")
+            self._writer_error = e
+        finally:
+            self._free_buffers.put(buffer_index)
+
+    def _raise_writer_error(self) -> None:
+        if self._writer_error is not None:
+            raise self._writer_error
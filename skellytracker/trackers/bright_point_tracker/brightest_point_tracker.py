@@ -1,11 +1,11 @@
 import logging
-from typing import Dict
+from typing import Dict, Optional, Tuple
 
 import cv2
 import numpy as np
-from pydantic import BaseModel
 
 from skellytracker.trackers.base_tracker.base_tracker import BaseTracker
+from skellytracker.trackers.base_tracker.skeleton_renderer import SkeletonRenderer
 from skellytracker.trackers.base_tracker.tracked_object import TrackedObject
 from skellytracker.trackers.bright_point_tracker.brightest_point_recorder import (
     BrightestPointRecorder,
@@ -18,14 +18,45 @@ LOWER_BOUND_COLOR = [40, 40, 40]
 logger = logging.getLogger(__name__)
 
 
-class BrightPatch(BaseModel):
-    area: float
-    centroid_x: int
-    centroid_y: int
+def find_bright_patches(
+    thresholded_image: np.ndarray,
+) -> Tuple[np.ndarray, np.ndarray, np.ndarray]:
+    """
+    Find the connected bright patches in a thresholded image, with their statistics computed in one OpenCV call.
+
+    :param thresholded_image: Binary image, nonzero where pixels are bright.
+    :return: The area of each patch in pixels with shape (num_patches,), (x, y) centroids with shape (num_patches, 2),
+        and (x, y, width, height) bounding boxes with shape (num_patches, 4)
+    """
+    _, _, stats, centroids = cv2.connectedComponentsWithStats(
+        thresholded_image, connectivity=8
+    )
+    # label 0 is the background
+    return stats[1:, cv2.CC_STAT_AREA], centroids[1:], stats[1:, :4]
 
 
 class BrightestPointTracker(BaseTracker):
-    def __init__(self, num_points: int = 1, luminance_threshold: int = 200):
+    def __init__(
+        self,
+        num_points: int = 1,
+        luminance_threshold: int = 200,
+        inference_scale: Optional[float] = None,
+        inference_width: Optional[int] = None,
+        subpixel_refinement: bool = False,
+        search_window_size: Optional[int] = None,
+    ):
+        """
+        Initialize the BrightestPointTracker.
+
+        :param num_points: Number of bright points to track, largest first.
+        :param luminance_threshold: Grayscale value a pixel must exceed to be bright.
+        :param inference_scale: Factor to downscale frames by before searching for bright points.
+        :param inference_width: Width to downscale frames to before searching for bright points, overrides inference_scale.
+        :param subpixel_refinement: Whether to refine each point to the luminance weighted centroid of its patch
+            in the full resolution image.
+        :param search_window_size: Size in pixels of the window to search for each point in, centered where its velocity
+            predicts it to be. The full frame is only searched when a point is lost. None searches the full frame every frame.
+        """
         super().__init__(
             tracked_object_names=[f"brightest_point_{i}" for i in range(num_points)],
             recorder=BrightestPointRecorder(),
@@ -33,81 +64,192 @@ class BrightestPointTracker(BaseTracker):
 
         self.num_points = num_points
         self.luminance_threshold = luminance_threshold
+        self.inference_scale = inference_scale
+        self.inference_width = inference_width
+        self.subpixel_refinement = subpixel_refinement
+        self.search_window_size = search_window_size
+        self.renderer = SkeletonRenderer(marker_type="cross", marker_size=20)
+
+        self._previous_points = np.full((num_points, 2), np.nan)
+        self._velocities = np.zeros((num_points, 2))
+
+    @property
+    def processes_frames_independently(self) -> bool:
+        # the search window follows points from the previous frame
+        return self.search_window_size is None
 
     def process_image(self, image: np.ndarray, **kwargs) -> Dict[str, TrackedObject]:
+        points = None
+        if self.search_window_size is not None and not np.isnan(self._previous_points).any():
+            points = self.search_windows(image)
+
+        if points is None:
+            points = self.search_full_frame(image)
+            # points found in the full frame are ordered by size, so they may not match the previous points
+            self._velocities = np.zeros((self.num_points, 2))
+        else:
+            self._velocities = points - self._previous_points
+        self._previous_points = points
+
+        for i, point in enumerate(points):
+            tracked_object = self.tracked_objects[f"brightest_point_{i}"]
+            if np.isnan(point).any():
+                tracked_object.pixel_x = None  # TODO: Is this the right value for missing data?
+                tracked_object.pixel_y = None
+            else:
+                tracked_object.pixel_x = float(point[0])
+                tracked_object.pixel_y = float(point[1])
+
+        self.defer_annotation(
+            self.annotate_image, image=image, tracked_objects=self.tracked_objects
+        )
+
+        return self.tracked_objects
+
+    def search_full_frame(self, image: np.ndarray) -> np.ndarray:
+        """
+        Find the largest bright patches in the whole image.
+
+        :param image: The full resolution image.
+        :return: Array of shape (num_points, 2) of (x, y) points, largest patch first, NaN where there are too few patches
+        """
+        inference_image, scale = self.resize_for_inference(image)
+        is_downscaled = bool((scale < 1).any())
+
         # Convert the image to grayscale
-        gray_image = cv2.cvtColor(image, cv2.COLOR_BGR2GRAY)
+        gray_image = cv2.cvtColor(inference_image, cv2.COLOR_BGR2GRAY)
 
         # Threshold the image to get only bright regions
         _, thresholded_image = cv2.threshold(
             gray_image, self.luminance_threshold, 255, cv2.THRESH_BINARY
         )
 
-        # Find contours of the bright regions
-        bright_patches, _ = cv2.findContours(
-            thresholded_image, cv2.RETR_EXTERNAL, cv2.CHAIN_APPROX_SIMPLE
-        )
+        areas, centroids, bounding_boxes = find_bright_patches(thresholded_image)
+        largest_patches = np.argsort(-areas, kind="stable")[: self.num_points]
 
-        # Process each bright patch separately
-        patch_list = []
-        for patch in bright_patches:
-            patch_moments = cv2.moments(patch)
-            if patch_moments["m00"] != 0:  # Avoid division by zero
-                centroid_x = int(patch_moments["m10"] / patch_moments["m00"])
-                centroid_y = int(patch_moments["m01"] / patch_moments["m00"])
-
-                patch_list.append(
-                    BrightPatch(
-                        area=cv2.contourArea(patch),
-                        centroid_x=centroid_x,
-                        centroid_y=centroid_y,
-                    )
+        points = np.full((self.num_points, 2), np.nan)
+        for i, patch_index in enumerate(largest_patches):
+            centroid = centroids[patch_index]
+            if is_downscaled:
+                centroid = self.map_to_full_resolution(centroid, scale)
+            if self.subpixel_refinement:
+                centroid = self.refine_centroid(
+                    image, bounding_boxes[patch_index], scale, centroid
                 )
-
-        largest_patches = sorted(
-            patch_list, key=lambda patch: patch.area, reverse=True
-        )[: self.num_points]
-
-        for i, patch in enumerate(largest_patches):
-            self.tracked_objects[f"brightest_point_{i}"].pixel_x = patch.centroid_x
-            self.tracked_objects[f"brightest_point_{i}"].pixel_y = patch.centroid_y
+            elif not is_downscaled:
+                # full resolution centroids stay on the pixel grid, as they always have
+                centroid = np.floor(centroid)
+            points[i] = centroid
             self.tracked_objects[f"brightest_point_{i}"].extra[
                 "thresholdedimage"
             ] = thresholded_image
 
-        for i in range(len(largest_patches), self.num_points):
-            self.tracked_objects[f"brightest_point_{i}"].pixel_x = (
-                None  # TODO: Is this the right value for missing data?
+        return points
+
+    def search_windows(self, image: np.ndarray) -> Optional[np.ndarray]:
+        """
+        Find each point in a window around its previous location, moved by its velocity over the previous frame.
+
+        Each window is searched at full resolution, for the bright patch closest to the predicted location.
+
+        :param image: The full resolution image.
+        :return: Array of shape (num_points, 2) of (x, y) points, or None if any point was lost
+        """
+        predicted_points = self._previous_points + self._velocities
+        half_window_size = self.search_window_size // 2
+
+        points = np.full((self.num_points, 2), np.nan)
+        for i, predicted_point in enumerate(predicted_points):
+            center_x, center_y = np.round(predicted_point).astype(int)
+            left = max(center_x - half_window_size, 0)
+            top = max(center_y - half_window_size, 0)
+            right = min(center_x + half_window_size + 1, image.shape[1])
+            bottom = min(center_y + half_window_size + 1, image.shape[0])
+            if right <= left or bottom <= top:
+                return None
+
+            gray_window = cv2.cvtColor(image[top:bottom, left:right], cv2.COLOR_BGR2GRAY)
+            _, thresholded_window = cv2.threshold(
+                gray_window, self.luminance_threshold, 255, cv2.THRESH_BINARY
             )
-            self.tracked_objects[f"brightest_point_{i}"].pixel_y = None
+            _, centroids, bounding_boxes = find_bright_patches(thresholded_window)
+            if centroids.shape[0] == 0:
+                return None
 
-        self.annotated_image = self.annotate_image(
-            image=image, tracked_objects=self.tracked_objects
-        )
+            window_origin = np.array([left, top])
+            centroids = centroids + window_origin
+            closest_patch = np.argmin(
+                np.linalg.norm(centroids - predicted_point, axis=1)
+            )
+            centroid = centroids[closest_patch]
+            if self.subpixel_refinement:
+                bounding_box = bounding_boxes[closest_patch].copy()
+                bounding_box[:2] += window_origin
+                centroid = self.refine_centroid(image, bounding_box, np.ones(2), centroid)
+            else:
+                centroid = np.floor(centroid)
+            points[i] = centroid
 
-        return self.tracked_objects
+        for i in range(self.num_points):
+            # window searches do not threshold the full frame
+            self.tracked_objects[f"brightest_point_{i}"].extra.pop("thresholdedimage", None)
+
+        return points
+
+    def reset_temporal_state(self) -> None:
+        super().reset_temporal_state()
+        self._previous_points = np.full((self.num_points, 2), np.nan)
+        self._velocities = np.zeros((self.num_points, 2))
+
+    def refine_centroid(
+        self,
+        image: np.ndarray,
+        bounding_box: np.ndarray,
+        scale: np.ndarray,
+        centroid: np.ndarray,
+    ) -> np.ndarray:
+        """
+        Refine a bright point to the luminance weighted centroid of its bright pixels in the full resolution image.
+
+        Only the patch's bounding box, plus a pixel of margin at the inference resolution, is converted to grayscale.
+
+        :param image: The full resolution image.
+        :param bounding_box: The patch's (x, y, width, height) bounding box in the image detection ran on.
+        :param scale: The (x, y) scale of the image detection ran on, relative to the full resolution image.
+        :param centroid: The unrefined (x, y) centroid, in full resolution pixels.
+        :return: The refined (x, y) centroid, or the unrefined centroid if the window has no bright pixels
+        """
+        box_x, box_y, box_width, box_height = bounding_box
+        margin = np.ceil(1 / scale).astype(int)
+        left = max(int(np.floor(box_x / scale[0])) - margin[0], 0)
+        top = max(int(np.floor(box_y / scale[1])) - margin[1], 0)
+        right = min(int(np.ceil((box_x + box_width) / scale[0])) + margin[0], image.shape[1])
+        bottom = min(int(np.ceil((box_y + box_height) / scale[1])) + margin[1], image.shape[0])
+
+        window = cv2.cvtColor(image[top:bottom, left:right], cv2.COLOR_BGR2GRAY)
+        weights = np.where(window > self.luminance_threshold, window, 0).astype(np.float64)
+        total_weight = weights.sum()
+        if total_weight == 0:
+            return centroid
+
+        refined_x = left + weights.sum(axis=0) @ np.arange(weights.shape[1]) / total_weight
+        refined_y = top + weights.sum(axis=1) @ np.arange(weights.shape[0]) / total_weight
+        return np.array([refined_x, refined_y])
 
     def annotate_image(
         self, image: np.ndarray, tracked_objects: Dict[str, TrackedObject], **kwargs
     ) -> np.ndarray:
-        annotated_image = image.copy()
-
-        for key, tracked_object in tracked_objects.items():
-            if (
-                "brightest_point" in key
-                and tracked_object.pixel_x is not None
-                and tracked_object.pixel_y is not None
-            ):
-                cv2.drawMarker(
-                    img=annotated_image,
-                    position=(int(tracked_object.pixel_x), int(tracked_object.pixel_y)),
-                    color=(0, 0, 255),
-                    markerType=cv2.MARKER_CROSS,
-                    markerSize=20,
-                    thickness=2,
-                )
+        # None coordinates become NaN, which the renderer skips
+        points = np.array(
+            [
+                (tracked_object.pixel_x, tracked_object.pixel_y)
+                for key, tracked_object in tracked_objects.items()
+                if "brightest_point" in key
+            ],
+            dtype=np.float64,
+        ).reshape(-1, 2)
 
-        return annotated_image
+        return self.renderer.render(image, points, reuse_buffer=self.reuse_annotation_buffer)
 
 
 if __name__ == "__main__":
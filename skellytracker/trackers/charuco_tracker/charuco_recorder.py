@@ -1,23 +1,63 @@
-from copy import deepcopy
-from typing import Dict
+from typing import Dict, Optional
 import numpy as np
 
 from skellytracker.trackers.base_tracker.base_recorder import BaseRecorder
+from skellytracker.trackers.base_tracker.frame_buffer import GrowableFrameBuffer
 from skellytracker.trackers.base_tracker.tracked_object import TrackedObject
 
 
 class CharucoRecorder(BaseRecorder):
+    """
+    Records ChArUco corners into a preallocated (frames, number_of_corners, 2) array, NaN for corners not detected.
+
+    Each frame is written with one scatter of the detected corners into their columns.
+    `recorded_objects` is the GrowableFrameBuffer the frames are recorded into.
+    """
+
+    def __init__(self, number_of_corners: Optional[int] = None):
+        """
+        Initialize the CharucoRecorder.
+
+        :param number_of_corners: Number of corners on the board. If None, it is the number of tracked objects in the first frame recorded.
+        """
+        self.number_of_corners = number_of_corners
+        super().__init__(recorded_objects=self.create_corner_buffer())
+
+    def create_corner_buffer(self) -> GrowableFrameBuffer:
+        return GrowableFrameBuffer(frame_shape=(self.number_of_corners or 0, 2), dtype=np.float64)
+
+    def record_corners(self, corner_indices: np.ndarray, corners: np.ndarray) -> None:
+        """
+        Record one frame of detected corners.
+
+        :param corner_indices: Array of shape (num_detected,) of each detected corner's column,
+            its index in the tracker's tracked objects.
+        :param corners: Array of shape (num_detected, 2) of the detected corners' pixel coordinates.
+        """
+        self.recorded_objects.next_frame()[corner_indices] = corners
+
     def record(self, tracked_objects: Dict[str, TrackedObject]) -> None:
-        self.recorded_objects.append(
-            [deepcopy(tracked_object) for tracked_object in tracked_objects.values()]
+        if self.number_of_corners is None:
+            self.number_of_corners = len(tracked_objects)
+            self.recorded_objects = self.create_corner_buffer()
+        corner_indices = []
+        corners = []
+        for corner_index, tracked_object in enumerate(tracked_objects.values()):
+            if tracked_object.pixel_x is not None and tracked_object.pixel_y is not None:
+                corner_indices.append(corner_index)
+                corners.append((tracked_object.pixel_x, tracked_object.pixel_y))
+        self.record_corners(
+            np.array(corner_indices, dtype=np.int64), np.array(corners, dtype=np.float64).reshape(-1, 2)
         )
 
     def process_tracked_objects(self, **kwargs) -> np.ndarray:
-        self.recorded_objects_array = np.array(
-            [
-                [[tracked_object.pixel_x, tracked_object.pixel_y] for tracked_object in tracked_object_list]
-                for tracked_object_list in self.recorded_objects
-            ]
-        )
+        self.recorded_objects_array = self.recorded_objects.array.copy()
 
         return self.recorded_objects_array
+
+    def clear_recorded_objects(self):
+        corner_buffer = self.recorded_objects
+        super().clear_recorded_objects()
+        # keep the buffer, and its capacity, for the next video
+        corner_buffer.clear()
+        self.recorded_objects = corner_buffer
@@ -1,9 +1,11 @@
-from typing import Dict, List
+from typing import Dict, List, Optional, Tuple
 
 import cv2
 import numpy as np
 
+from skellytracker.trackers.base_tracker.base_recorder import BaseRecorder
 from skellytracker.trackers.base_tracker.base_tracker import BaseTracker
+from skellytracker.trackers.base_tracker.skeleton_renderer import SkeletonRenderer
 from skellytracker.trackers.base_tracker.tracked_object import TrackedObject
 from skellytracker.trackers.charuco_tracker.charuco_recorder import CharucoRecorder
 
@@ -19,9 +21,31 @@ class CharucoTracker(BaseTracker):
         dictionary: cv2.aruco.Dictionary = default_aruco_dictionary,
         square_length: float = 1,
         marker_length: float = 0.8,
+        inference_scale: Optional[float] = None,
+        inference_width: Optional[int] = None,
+        track_roi: bool = False,
+        roi_buffer_percentage: float = 40,
     ):
+        """
+        Initialize the CharucoTracker.
+
+        :param tracked_object_names: Names of the tracked corners, their ChArUco corner ids as strings.
+        :param squares_x: Number of squares along the board's x axis.
+        :param squares_y: Number of squares along the board's y axis.
+        :param dictionary: The ArUco dictionary of the board's markers.
+        :param square_length: Length of a square's side.
+        :param marker_length: Length of a marker's side, in the same units as square_length.
+        :param inference_scale: Scale to downscale frames by for detection.
+        :param inference_width: Width in pixels to downscale frames to for detection, overrides inference_scale.
+        :param track_roi: Whether to detect the board in a crop around its corners in the previous frame,
+            falling back to the full frame when the crop finds no board, or finds corners near its edges.
+        :param roi_buffer_percentage: Padding added on each side of the previous frame's corners when cropping,
+            as a percentage of the larger side of their bounding box. Corners within half the padding of a crop
+            edge count as near it.
+        """
         super().__init__(
-            recorder=CharucoRecorder(), tracked_object_names=tracked_object_names
+            recorder=CharucoRecorder(number_of_corners=len(tracked_object_names)),
+            tracked_object_names=tracked_object_names,
         )
         self.board = cv2.aruco.CharucoBoard(
             size=(squares_x, squares_y),
@@ -32,35 +56,67 @@ class CharucoTracker(BaseTracker):
 
         # Following most recent charuco detection documentation: https://docs.opencv.org/4.x/df/d4a/tutorial_charuco_detection.html
         self.charuco_detector = cv2.aruco.CharucoDetector(self.board)
+        self.renderer = SkeletonRenderer(marker_type="cross", marker_size=30)
 
         self.tracked_object_names = tracked_object_names
         self.dictionary = dictionary
+        self.inference_scale = inference_scale
+        self.inference_width = inference_width
+        self.track_roi = track_roi
+        self.roi_buffer_percentage = roi_buffer_percentage
+        self._roi_box_xyxy: Optional[np.ndarray] = None
+        self._roi_edge_margin = 0.0
+
+        # ChArUco corner id -> index of its tracked object, -1 for ids that are not tracked
+        tracked_corner_ids = {
+            int(name): corner_index
+            for corner_index, name in enumerate(tracked_object_names)
+            if name.isdigit()
+        }
+        self._corner_indices = np.full(
+            max(max(tracked_corner_ids, default=-1), len(self.board.getChessboardCorners()) - 1) + 1,
+            -1,
+            dtype=np.int64,
+        )
+        for corner_id, corner_index in tracked_corner_ids.items():
+            self._corner_indices[corner_id] = corner_index
+
+        # the last image's detected corners, as indices into tracked_object_names and their pixel coordinates
+        self.charuco_ids = np.empty(0, dtype=np.int64)
+        self.charuco_corners = np.empty((0, 2), dtype=np.float64)
+
+    @property
+    def processes_frames_independently(self) -> bool:
+        # the ROI follows the board from the previous frame
+        return not self.track_roi
 
     def process_image(self, image: np.ndarray, **kwargs) -> Dict[str, TrackedObject]:
-        # Convert the image to grayscale
-        gray_image = cv2.cvtColor(image, cv2.COLOR_BGR2GRAY)
+        charuco_ids, charuco_corners = None, None
+        if self.track_roi and self._roi_box_xyxy is not None:
+            charuco_ids, charuco_corners = self.detect_board(image, self._roi_box_xyxy)
+            if charuco_ids is not None and self._is_near_roi_edge(charuco_corners, image):
+                # the board may extend past the crop, keep whichever detection found more corners
+                full_frame_ids, full_frame_corners = self.detect_board(image)
+                if full_frame_ids is not None and len(full_frame_ids) > len(charuco_ids):
+                    charuco_ids, charuco_corners = full_frame_ids, full_frame_corners
+        if charuco_ids is None:
+            charuco_ids, charuco_corners = self.detect_board(image)
 
-        charuco_corners, charuco_ids, _marker_corners, _marker_ids = (
-            self.charuco_detector.detectBoard(gray_image)
-        )
+        self.charuco_ids = np.empty(0, dtype=np.int64)
+        self.charuco_corners = np.empty((0, 2), dtype=np.float64)
 
-        self.reinitialize_tracked_objects()
+        if charuco_ids is not None:
+            corner_indices = self._corner_indices[charuco_ids]
+            is_tracked = corner_indices >= 0
+            self.charuco_ids = corner_indices[is_tracked]
+            self.charuco_corners = charuco_corners[is_tracked]
 
-        # If any Charuco corners were found
-        if (
-            charuco_corners is not None
-            and charuco_ids is not None
-            and len(charuco_corners) > 3
-        ):
-            # Create a TrackedObject for each corner
-            for id, corner in zip(charuco_ids, charuco_corners):
-                object_id = str(id).strip("[]")
-                self.tracked_objects[object_id] = TrackedObject(object_id=object_id)
-                self.tracked_objects[object_id].pixel_x = corner[0][0]
-                self.tracked_objects[object_id].pixel_y = corner[0][1]
-
-        self.annotated_image = self.annotate_image(
-            image=image, tracked_objects=self.tracked_objects
+        if self.track_roi:
+            self._update_roi(image)
+        self.update_tracked_objects()
+
+        self.defer_annotation(
+            self.annotate_image, image=image, tracked_objects=self.tracked_objects
         )
 
         return self.tracked_objects
@@ -68,35 +124,119 @@ class CharucoTracker(BaseTracker):
     def annotate_image(
         self, image: np.ndarray, tracked_objects: Dict[str, TrackedObject], **kwargs
     ) -> np.ndarray:
-        # Copy the original image for annotation
-        annotated_image = image.copy()
+        tracked_corners = [
+            tracked_object
+            for tracked_object in tracked_objects.values()
+            if tracked_object.pixel_x is not None and tracked_object.pixel_y is not None
+        ]
 
         # Draw a marker for each tracked corner
-        for tracked_object in tracked_objects.values():
-            if (
-                tracked_object.pixel_x is not None
-                and tracked_object.pixel_y is not None
-            ):
-                cv2.drawMarker(
-                    annotated_image,
-                    (int(tracked_object.pixel_x), int(tracked_object.pixel_y)),
-                    (0, 0, 255),
-                    markerType=cv2.MARKER_CROSS,
-                    markerSize=30,
-                    thickness=2,
-                )
-                cv2.putText(
-                    annotated_image,
-                    tracked_object.object_id,
-                    (int(tracked_object.pixel_x), int(tracked_object.pixel_y)),
-                    cv2.FONT_HERSHEY_SIMPLEX,
-                    1,
-                    (255, 0, 0),
-                    2,
-                )
+        points = np.array(
+            [
+                (tracked_object.pixel_x, tracked_object.pixel_y)
+                for tracked_object in tracked_corners
+            ],
+            dtype=np.float64,
+        ).reshape(-1, 2)
+        annotated_image = self.renderer.render(
+            image, points, reuse_buffer=self.reuse_annotation_buffer
+        )
+
+        # text can not be batched, so corner ids are still drawn one at a time
+        for tracked_object in tracked_corners:
+            cv2.putText(
+                annotated_image,
+                tracked_object.object_id,
+                (int(tracked_object.pixel_x), int(tracked_object.pixel_y)),
+                cv2.FONT_HERSHEY_SIMPLEX,
+                1,
+                (255, 0, 0),
+                2,
+            )
 
         return annotated_image
 
+    def detect_board(
+        self, image: np.ndarray, box_xyxy: Optional[np.ndarray] = None
+    ) -> Tuple[Optional[np.ndarray], Optional[np.ndarray]]:
+        """
+        Detect the board's corners in an image, or in a crop of it.
+
+        :param image: A full resolution image.
+        :param box_xyxy: The (x1, y1, x2, y2) pixel box to detect in, or None for the full image.
+        :return: The detected ChArUco corner ids, and their (x, y) full resolution pixel coordinates,
+            or None for both if fewer than 4 corners were found
+        """
+        offset = np.zeros(2)
+        if box_xyxy is not None:
+            x1, y1, x2, y2 = box_xyxy
+            offset = np.array([x1, y1], dtype=np.float64)
+            crop = image[y1:y2, x1:x2]
+            inference_image, scale = self.resize_for_inference(crop, full_frame_width=image.shape[1])
+        else:
+            inference_image, scale = self.resize_for_inference(image)
+
+        # Convert the image to grayscale
+        gray_image = cv2.cvtColor(inference_image, cv2.COLOR_BGR2GRAY)
+
+        charuco_corners, charuco_ids, _marker_corners, _marker_ids = (
+            self.charuco_detector.detectBoard(gray_image)
+        )
+
+        if charuco_corners is None or charuco_ids is None or len(charuco_corners) <= 3:
+            return None, None
+        charuco_corners = charuco_corners.reshape(-1, 2).astype(np.float64)
+        if (scale < 1).any():
+            charuco_corners = self.map_to_full_resolution(charuco_corners, scale)
+        return charuco_ids.reshape(-1), charuco_corners + offset
+
+    def _is_near_roi_edge(self, corners: np.ndarray, image: np.ndarray) -> bool:
+        x1, y1, x2, y2 = self._roi_box_xyxy
+        height, width = image.shape[:2]
+        # crop edges on the image border can not cut the board off
+        near_left = x1 > 0 and corners[:, 0].min() < x1 + self._roi_edge_margin
+        near_top = y1 > 0 and corners[:, 1].min() < y1 + self._roi_edge_margin
+        near_right = x2 < width and corners[:, 0].max() > x2 - self._roi_edge_margin
+        near_bottom = y2 < height and corners[:, 1].max() > y2 - self._roi_edge_margin
+        return bool(near_left or near_top or near_right or near_bottom)
+
+    def _update_roi(self, image: np.ndarray) -> None:
+        if len(self.charuco_corners) == 0:
+            self._roi_box_xyxy = None
+            return
+        box_min = self.charuco_corners.min(axis=0)
+        box_max = self.charuco_corners.max(axis=0)
+        # pad both axes by the larger side, so the markers around the outer corners stay in the crop at any board angle
+        buffer = (box_max - box_min).max() * self.roi_buffer_percentage / 100
+        height, width = image.shape[:2]
+        x1, y1 = np.clip(np.floor(box_min - buffer), 0, None).astype(int)
+        x2, y2 = np.minimum(np.ceil(box_max + buffer) + 1, [width, height]).astype(int)
+        self._roi_box_xyxy = np.array([x1, y1, x2, y2])
+        self._roi_edge_margin = buffer / 2
+
+    def reset_temporal_state(self) -> None:
+        super().reset_temporal_state()
+        self._roi_box_xyxy = None
+        self.charuco_ids = np.empty(0, dtype=np.int64)
+        self.charuco_corners = np.empty((0, 2), dtype=np.float64)
+
+    def record_tracked_objects(self, recorder: BaseRecorder) -> None:
+        recorder.record_corners(self.charuco_ids, self.charuco_corners)
+
+    def update_tracked_objects(self) -> None:
+        """
+        Update each corner's tracked object from the last detection, None for corners not detected.
+        """
+        for tracked_object in self.tracked_objects.values():
+            tracked_object.pixel_x = None
+            tracked_object.pixel_y = None
+        for corner_index, (pixel_x, pixel_y) in zip(
+            self.charuco_ids.tolist(), self.charuco_corners.tolist()
+        ):
+            tracked_object = self.tracked_objects[self.tracked_object_names[corner_index]]
+            tracked_object.pixel_x = pixel_x
+            tracked_object.pixel_y = pixel_y
+
     def reinitialize_tracked_objects(self) -> None:
         """
         Reinitialize tracked objects to clear previous frames data
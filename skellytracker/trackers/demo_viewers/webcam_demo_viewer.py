@@ -73,7 +73,7 @@ class WebcamDemoViewer:
             self.tracker.process_image(frame)
             annotated_image = self.tracker.annotated_image
             if self.recorder is not None:
-                self.recorder.record(tracked_objects=self.tracker.tracked_objects)
+                self.tracker.record_tracked_objects(self.recorder)
 
             key = cv2.waitKey(1) & 0xFF
             if key == KEY_QUIT:
@@ -7,10 +7,10 @@ from typing import Dict, Union
 from pathlib import Path
 from mediapipe.tasks import python as mp_python
 from mediapipe.tasks.python import vision
-from mediapipe import solutions
 from mediapipe.framework.formats import landmark_pb2
 
 from skellytracker.trackers.base_tracker.base_tracker import BaseTracker
+from skellytracker.trackers.base_tracker.skeleton_renderer import SkeletonRenderer
 from skellytracker.trackers.base_tracker.tracked_object import TrackedObject
 from skellytracker.trackers.mediapipe_blendshape_tracker.mediapipe_blendshape_model_info import (
     MediapipeBlendshapeModelInfo,
@@ -30,6 +30,21 @@ class MediapipeBlendshapeTracker(BaseTracker):
             recorder=MediapipeBlendshapeRecorder(),
         )
         self.model_info = MediapipeBlendshapeModelInfo
+        self.tesselation_renderer = SkeletonRenderer(
+            connections=np.array(sorted(mp.solutions.face_mesh.FACEMESH_TESSELATION)),
+            marker_size=0,
+            line_thickness=1,
+            line_color=(192, 192, 192),
+        )
+        self.contour_renderer = SkeletonRenderer(
+            connections=np.array(
+                sorted(
+                    mp.solutions.face_mesh.FACEMESH_CONTOURS
+                    | mp.solutions.face_mesh.FACEMESH_IRISES
+                )
+            ),
+            marker_size=0,
+        )
 
         # If model_path not provided, try default model path, and if that doesn't work download model
         if model_path is None:
@@ -63,7 +78,8 @@ class MediapipeBlendshapeTracker(BaseTracker):
             blendshape.score for blendshape in results.face_blendshapes[0]
         ]  # TODO: assumes we're only interested in 1 face, but docs say this works for multiple faces??
 
-        self.annotated_image = self.annotate_image(
+        self.defer_annotation(
+            self.annotate_image,
             image=image,
             tracked_objects=self.tracked_objects,
             face_landmarks=results.face_landmarks[0],
@@ -78,39 +94,14 @@ class MediapipeBlendshapeTracker(BaseTracker):
         face_landmarks: list[landmark_pb2.NormalizedLandmark],
         **kwargs,
     ) -> np.ndarray:
-        annotated_image = image.copy()
-
-        face_landmarks_proto = landmark_pb2.NormalizedLandmarkList()
-        face_landmarks_proto.landmark.extend(
-            [
-                landmark_pb2.NormalizedLandmark(
-                    x=landmark.x, y=landmark.y, z=landmark.z
-                )
-                for landmark in face_landmarks
-            ]
-        )
+        pixel_points = np.array(
+            [(landmark.x, landmark.y) for landmark in face_landmarks], dtype=np.float64
+        ) * np.array([image.shape[1], image.shape[0]])
 
-        solutions.drawing_utils.draw_landmarks(
-            image=annotated_image,
-            landmark_list=face_landmarks_proto,
-            connections=mp.solutions.face_mesh.FACEMESH_TESSELATION,
-            landmark_drawing_spec=None,
-            connection_drawing_spec=mp.solutions.drawing_styles.get_default_face_mesh_tesselation_style(),
-        )
-        solutions.drawing_utils.draw_landmarks(
-            image=annotated_image,
-            landmark_list=face_landmarks_proto,
-            connections=mp.solutions.face_mesh.FACEMESH_CONTOURS,
-            landmark_drawing_spec=None,
-            connection_drawing_spec=mp.solutions.drawing_styles.get_default_face_mesh_contours_style(),
-        )
-        solutions.drawing_utils.draw_landmarks(
-            image=annotated_image,
-            landmark_list=face_landmarks_proto,
-            connections=mp.solutions.face_mesh.FACEMESH_IRISES,
-            landmark_drawing_spec=None,
-            connection_drawing_spec=mp.solutions.drawing_styles.get_default_face_mesh_iris_connections_style(),
+        annotated_image = self.tesselation_renderer.render(
+            image, pixel_points, reuse_buffer=self.reuse_annotation_buffer
         )
+        self.contour_renderer.render(annotated_image, pixel_points, copy=False)
 
         return annotated_image
 
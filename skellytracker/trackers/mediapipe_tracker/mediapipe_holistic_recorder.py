@@ -1,16 +1,99 @@
 from copy import deepcopy
 from typing import Dict
 import numpy as np
+from mediapipe.python.solutions import holistic as mp_holistic
 
 from skellytracker.trackers.base_tracker.base_recorder import BaseRecorder
+from skellytracker.trackers.base_tracker.frame_buffer import GrowableFrameBuffer
 from skellytracker.trackers.base_tracker.tracked_object import TrackedObject
 from skellytracker.trackers.mediapipe_tracker.mediapipe_model_info import (
     MediapipeModelInfo,
 )
 
+NUM_TRACKED_POINTS_BY_OBJECT_NAME = {
+    "pose_landmarks": MediapipeModelInfo.num_tracked_points_body,
+    "right_hand_landmarks": MediapipeModelInfo.num_tracked_points_right_hand,
+    "left_hand_landmarks": MediapipeModelInfo.num_tracked_points_left_hand,
+    "face_landmarks": MediapipeModelInfo.num_tracked_points_face,
+}
+
+
+def landmarks_to_array(landmarks) -> np.ndarray:
+    """
+    Convert a mediapipe landmark list to an array of normalized coordinates.
+
+    :param landmarks: A mediapipe NormalizedLandmarkList, or an array that is already in (num_landmarks, 3) format.
+    :return: Array of shape (num_landmarks, 3) with the x, y, z of each landmark.
+    """
+    if isinstance(landmarks, np.ndarray):
+        return landmarks
+    return np.array(
+        [(landmark.x, landmark.y, landmark.z) for landmark in landmarks.landmark],
+        dtype=np.float32,
+    ).reshape(-1, 3)
+
+
+def get_holistic_connections() -> np.ndarray:
+    """
+    Get the mediapipe landmark connections as indices into a landmark array filled by `fill_landmark_array`.
+
+    :return: Array of shape (num_connections, 2) of landmark indices.
+    """
+    connections_by_object_name = {
+        "pose_landmarks": mp_holistic.POSE_CONNECTIONS,
+        "right_hand_landmarks": mp_holistic.HAND_CONNECTIONS,
+        "left_hand_landmarks": mp_holistic.HAND_CONNECTIONS,
+        "face_landmarks": mp_holistic.FACEMESH_TESSELATION,
+    }
+    connections = []
+    start_index = 0
+    for tracked_object_name in MediapipeModelInfo.tracked_object_names:
+        connections.append(
+            np.array(sorted(connections_by_object_name[tracked_object_name])) + start_index
+        )
+        start_index += NUM_TRACKED_POINTS_BY_OBJECT_NAME[tracked_object_name]
+    return np.concatenate(connections)
+
+
+def fill_landmark_array(
+    tracked_objects: Dict[str, TrackedObject], landmark_array: np.ndarray
+) -> None:
+    """
+    Write the landmarks of a single frame into a (num_tracked_points, 3) array, in MediapipeModelInfo.tracked_object_names order.
+
+    Landmarks that were not tracked are left untouched, so the array should be initialized to NaN.
+    """
+    start_index = 0
+    for tracked_object_name in MediapipeModelInfo.tracked_object_names:
+        num_points = NUM_TRACKED_POINTS_BY_OBJECT_NAME[tracked_object_name]
+        landmarks = tracked_objects[tracked_object_name].extra.get("landmarks")
+        if landmarks is not None:
+            landmark_data = landmarks_to_array(landmarks)[:num_points]
+            landmark_array[start_index : start_index + landmark_data.shape[0]] = (
+                landmark_data
+            )
+        start_index += num_points
+
 
 class MediapipeHolisticRecorder(BaseRecorder):
+    def __init__(self, record_to_array: bool = False):
+        """
+        Initialize the MediapipeHolisticRecorder.
+
+        :param record_to_array: Whether to write landmarks straight into a preallocated array at record time,
+            instead of keeping a copy of the tracked objects for every frame.
+        """
+        super().__init__()
+        self.record_to_array = record_to_array
+        self.landmark_buffer = GrowableFrameBuffer(
+            frame_shape=(MediapipeModelInfo.num_tracked_points, 3), dtype=np.float32
+        )
+
     def record(self, tracked_objects: Dict[str, TrackedObject]) -> None:
+        if self.record_to_array:
+            fill_landmark_array(tracked_objects, self.landmark_buffer.next_frame())
+            return
+
         self.recorded_objects.append(
             [
                 deepcopy(tracked_objects[tracked_object_name])
@@ -24,40 +107,34 @@ class MediapipeHolisticRecorder(BaseRecorder):
             raise ValueError(
                 f"image_size must be provided to process tracked objects from {__class__.__name__}"
             )
-        self.recorded_objects_array = np.zeros(
-            (
-                len(self.recorded_objects),
-                MediapipeModelInfo.num_tracked_points,
-                3,
+
+        if self.record_to_array:
+            normalized_landmarks = self.landmark_buffer.array
+        else:
+            normalized_landmarks = np.full(
+                (
+                    len(self.recorded_objects),
+                    MediapipeModelInfo.num_tracked_points,
+                    3,
+                ),
+                np.nan,
             )
-        )
+            for i, recorded_object_list in enumerate(self.recorded_objects):
+                fill_landmark_array(
+                    {
+                        recorded_object.object_id: recorded_object
+                        for recorded_object in recorded_object_list
+                    },
+                    normalized_landmarks[i],
+                )
 
-        for i, recorded_object_list in enumerate(self.recorded_objects):
-            landmark_number = 0
-            for recorded_object in recorded_object_list:
-                if recorded_object.extra["landmarks"] is not None:
-                    for landmark_data in recorded_object.extra["landmarks"].landmark:
-                        self.recorded_objects_array[i, landmark_number, 0] = (
-                            landmark_data.x * image_size[0]
-                        )
-                        self.recorded_objects_array[i, landmark_number, 1] = (
-                            landmark_data.y * image_size[1]
-                        )
-                        self.recorded_objects_array[i, landmark_number, 2] = (
-                            landmark_data.z * image_size[0]
-                        )  # * image width per mediapipe docs
-                        landmark_number += 1
-                else:
-                    if recorded_object.object_id == "pose_landmarks":
-                        number = MediapipeModelInfo.num_tracked_points_body
-                    elif recorded_object.object_id == "face_landmarks":
-                        number = MediapipeModelInfo.num_tracked_points_face
-                    elif recorded_object.object_id == "left_hand_landmarks":
-                        number = MediapipeModelInfo.num_tracked_points_left_hand
-                    else:
-                        number = MediapipeModelInfo.num_tracked_points_right_hand
-                    for _ in range(number):
-                        self.recorded_objects_array[i, landmark_number, :] = np.nan
-                        landmark_number += 1
+        # z is scaled by image width per mediapipe docs
+        self.recorded_objects_array = normalized_landmarks * np.array(
+            [image_size[0], image_size[1], image_size[0]], dtype=np.float64
+        )
 
         return self.recorded_objects_array
+
+    def clear_recorded_objects(self):
+        super().clear_recorded_objects()
+        self.landmark_buffer.clear()
@@ -2,11 +2,15 @@ import cv2
 import mediapipe as mp
 import numpy as np
 from typing import Dict
+from pydantic import BaseModel
 
 from skellytracker.trackers.base_tracker.base_tracker import BaseTracker
+from skellytracker.trackers.base_tracker.skeleton_renderer import SkeletonRenderer
 from skellytracker.trackers.base_tracker.tracked_object import TrackedObject
 from skellytracker.trackers.mediapipe_tracker.mediapipe_holistic_recorder import (
     MediapipeHolisticRecorder,
+    fill_landmark_array,
+    get_holistic_connections,
 )
 from skellytracker.trackers.mediapipe_tracker.mediapipe_model_info import (
     MediapipeModelInfo,
@@ -21,13 +25,14 @@ class MediapipeHolisticTracker(BaseTracker):
         min_tracking_confidence=0.5,
         static_image_mode=False,
         smooth_landmarks=True,
+        record_to_array=False,
     ):
         super().__init__(
             tracked_object_names=MediapipeModelInfo.tracked_object_names,
-            recorder=MediapipeHolisticRecorder(),
+            recorder=MediapipeHolisticRecorder(record_to_array=record_to_array),
         )
-        self.mp_drawing = mp.solutions.drawing_utils
         self.mp_holistic = mp.solutions.holistic
+        self.renderer = SkeletonRenderer(connections=get_holistic_connections())
         self.holistic = self.mp_holistic.Holistic(
             model_complexity=model_complexity,
             min_detection_confidence=min_detection_confidence,
@@ -36,6 +41,16 @@ class MediapipeHolisticTracker(BaseTracker):
             smooth_landmarks=smooth_landmarks,
         )
 
+    @classmethod
+    def from_tracking_params(cls, tracking_params: BaseModel) -> "MediapipeHolisticTracker":
+        return cls(
+            model_complexity=tracking_params.mediapipe_model_complexity,
+            min_detection_confidence=tracking_params.min_detection_confidence,
+            min_tracking_confidence=tracking_params.min_tracking_confidence,
+            static_image_mode=tracking_params.static_image_mode,
+            record_to_array=True,
+        )
+
     def process_image(self, image: np.ndarray, **kwargs) -> Dict[str, TrackedObject]:
         # Convert the image to RGB
         rgb_image = cv2.cvtColor(image, cv2.COLOR_BGR2RGB)
@@ -57,39 +72,28 @@ class MediapipeHolisticTracker(BaseTracker):
             "landmarks"
         ] = results.right_hand_landmarks
 
-        self.annotated_image = self.annotate_image(
-            image=image, tracked_objects=self.tracked_objects
+        self.defer_annotation(
+            self.annotate_image, image=image, tracked_objects=self.tracked_objects
         )
 
         return self.tracked_objects
 
+    def reset_temporal_state(self) -> None:
+        super().reset_temporal_state()
+        # restart the mediapipe graph so landmark smoothing does not carry over between videos
+        self.holistic.reset()
+
     def annotate_image(
         self, image: np.ndarray, tracked_objects: Dict[str, TrackedObject], **kwargs
     ) -> np.ndarray:
-        annotated_image = image.copy()
         # Draw the pose, face, and hand landmarks on the image
-        self.mp_drawing.draw_landmarks(
-            annotated_image,
-            tracked_objects["pose_landmarks"].extra["landmarks"],
-            self.mp_holistic.POSE_CONNECTIONS,
-        )
-        self.mp_drawing.draw_landmarks(
-            annotated_image,
-            tracked_objects["face_landmarks"].extra["landmarks"],
-            self.mp_holistic.FACEMESH_TESSELATION,
-        )
-        self.mp_drawing.draw_landmarks(
-            annotated_image,
-            tracked_objects["left_hand_landmarks"].extra["landmarks"],
-            self.mp_holistic.HAND_CONNECTIONS,
-        )
-        self.mp_drawing.draw_landmarks(
-            annotated_image,
-            tracked_objects["right_hand_landmarks"].extra["landmarks"],
-            self.mp_holistic.HAND_CONNECTIONS,
-        )
+        landmarks = np.full((MediapipeModelInfo.num_tracked_points, 3), np.nan)
+        fill_landmark_array(tracked_objects, landmarks)
+        pixel_points = landmarks[:, :2] * np.array([image.shape[1], image.shape[0]])
 
-        return annotated_image
+        return self.renderer.render(
+            image, pixel_points, reuse_buffer=self.reuse_annotation_buffer
+        )
 
 
 if __name__ == "__main__":
@@ -199,6 +199,9 @@ class MediapipeTrackingParams(BaseTrackingParams):
     buffer_size_method: Literal["buffer_by_box_size", "buffer_by_image_size"] = (
         "buffer_by_box_size"
     )
+    yolo_detection_interval: int = 1
+    predict_roi_motion: bool = False
+    no_detection_policy: Literal["full_frame", "last_box", "skip"] = "full_frame"
 
 
 def mediapipe_body_names_match_expected(
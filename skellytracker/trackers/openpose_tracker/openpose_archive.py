@@ -0,0 +1,84 @@
+import logging
+import os
+from pathlib import Path
+from typing import Dict, Union
+
+import numpy as np
+
+from skellytracker.trackers.openpose_tracker.openpose_model_info import (
+    OpenPoseModelInfo,
+)
+
+logger = logging.getLogger(__name__)
+
+# blocks of the full keypoint array, in the order `OpenPoseRecorder.extract_keypoints` lays them out
+ARCHIVE_BLOCKS = {
+    "body": OpenPoseModelInfo.num_tracked_points_body,
+    "left_hand": OpenPoseModelInfo.num_tracked_points_left_hand,
+    "right_hand": OpenPoseModelInfo.num_tracked_points_right_hand,
+    "face": OpenPoseModelInfo.num_tracked_points_face,
+}
+
+
+def get_openpose_archive_path(json_directory: Union[str, Path]) -> Path:
+    """
+    Get the path of the archive consolidating a video's OpenPose JSON directory, next to the directory.
+
+    :param json_directory: The directory of the video's OpenPose JSON files.
+    :return: Path to the .npz archive
+    """
+    json_directory = Path(json_directory)
+    return json_directory.with_name(f"{json_directory.name}_keypoints.npz")
+
+
+def save_openpose_archive(archive_path: Union[str, Path], keypoints: np.ndarray) -> None:
+    """
+    Save keypoints as an archive of float32 body, hand and face blocks, each of shape (num_frames, num_points, 3)
+    holding pixel x, pixel y and confidence.
+
+    :param archive_path: Path of the .npz archive to write.
+    :param keypoints: Array of shape (num_frames, OpenPoseModelInfo.num_tracked_points, 3), as parsed with hands and faces tracked.
+    :raise ValueError: If the keypoints do not include every block.
+    """
+    if keypoints.ndim != 3 or keypoints.shape[1:] != (OpenPoseModelInfo.num_tracked_points, 3):
+        raise ValueError(
+            f"Expected keypoints of shape (num_frames, {OpenPoseModelInfo.num_tracked_points}, 3), got {keypoints.shape}"
+        )
+    blocks: Dict[str, np.ndarray] = {}
+    block_start = 0
+    for block_name, number_of_points in ARCHIVE_BLOCKS.items():
+        blocks[block_name] = keypoints[:, block_start : block_start + number_of_points].astype(
+            np.float32
+        )
+        block_start += number_of_points
+
+    archive_path = Path(archive_path)
+    # write to a temporary file first so readers never see a partial archive
+    temporary_path = archive_path.with_name(f"{archive_path.stem}.{os.getpid()}.tmp")
+    with open(temporary_path, "wb") as archive_file:
+        np.savez(archive_file, **blocks)
+    os.replace(temporary_path, archive_path)
+    logger.info(f"Saved OpenPose archive with {keypoints.shape[0]} frames to {archive_path}")
+
+
+def load_openpose_archive(
+    archive_path: Union[str, Path], track_hands: bool = True, track_faces: bool = True
+) -> np.ndarray:
+    """
+    Load keypoints from an archive written by `save_openpose_archive`.
+
+    :param archive_path: Path of the .npz archive.
+    :param track_hands: Whether to include the hand blocks.
+    :param track_faces: Whether to include the face block.
+    :return: Array of shape (num_frames, num_markers, 3), with the body, then hands, then face, as parsed from the JSONs
+    """
+    block_names = ["body"]
+    if track_hands:
+        block_names += ["left_hand", "right_hand"]
+    if track_faces:
+        block_names.append("face")
+    with np.load(archive_path) as archive:
+        return np.concatenate([archive[block_name] for block_name in block_names], axis=1).astype(
+            np.float64
+        )
+
@@ -0,0 +1,188 @@
+import json
+import logging
+import os
+import threading
+from concurrent.futures import Future, ThreadPoolExecutor, wait
+from pathlib import Path
+from typing import List, Optional, Set, Union
+
+import numpy as np
+
+from skellytracker.trackers.openpose_tracker.openpose_recorder import OpenPoseRecorder
+
+logger = logging.getLogger(__name__)
+
+
+class OpenPoseJsonIngestor:
+    """
+    Parses OpenPose keypoint JSON files on a thread pool while OpenPose is still writing them,
+    into a preallocated array indexed by each file's frame index.
+
+    A background thread polls the JSON directory for new files. Files that do not parse yet are assumed to be
+    partially written, and are picked up again on the next poll. `finish()` parses whatever is left once OpenPose exits.
+    """
+
+    def __init__(
+        self,
+        recorder: OpenPoseRecorder,
+        json_directory: Union[str, Path],
+        number_of_frames: int = 0,
+        max_workers: int = 4,
+        poll_interval_seconds: float = 0.1,
+    ):
+        """
+        Initialize the OpenPoseJsonIngestor.
+
+        :param recorder: The recorder used to parse each file, which decides the markers kept per frame.
+        :param json_directory: The directory OpenPose writes the video's JSON files to.
+        :param number_of_frames: The expected number of frames, used to preallocate the array. It grows if more frames arrive.
+        :param max_workers: Number of threads parsing files.
+        :param poll_interval_seconds: Time between checks of the directory for new files.
+        """
+        self.recorder = recorder
+        self.json_directory = Path(json_directory)
+        self.max_workers = max_workers
+        self.poll_interval_seconds = poll_interval_seconds
+
+        self._data_array = np.full(
+            (max(number_of_frames, 0), recorder.get_number_of_markers(), 3), np.nan
+        )
+        self._lock = threading.Lock()
+        self._submitted_file_names: Set[str] = set()
+        self._parsed_frame_indices: Set[int] = set()
+        self._invalid_file_names: Set[str] = set()
+        self._futures: List[Future] = []
+
+        self._executor: Optional[ThreadPoolExecutor] = None
+        self._watcher_thread: Optional[threading.Thread] = None
+        self._stop_event = threading.Event()
+
+    @property
+    def number_of_frames_parsed(self) -> int:
+        with self._lock:
+            return len(self._parsed_frame_indices)
+
+    def start(self) -> None:
+        """
+        Start watching the JSON directory and parsing new files in the background.
+        """
+        self._executor = ThreadPoolExecutor(
+            max_workers=self.max_workers, thread_name_prefix="openpose_json"
+        )
+        self._stop_event.clear()
+        self._watcher_thread = threading.Thread(
+            target=self._watch, name="openpose_json_watcher", daemon=True
+        )
+        self._watcher_thread.start()
+
+    def finish(self) -> np.ndarray:
+        """
+        Stop watching, parse any files not parsed yet, and return the parsed data.
+        Call once OpenPose has exited, so every file is complete.
+
+        :return: Array of shape (number_of_frames, number_of_markers, 3), NaN for frames where no one was detected
+        :raise ValueError: If a JSON file has no frame index in its name, or frames are missing.
+        """
+        self._stop_watching()
+        if self._executor is None:
+            self._executor = ThreadPoolExecutor(
+                max_workers=self.max_workers, thread_name_prefix="openpose_json"
+            )
+        try:
+            # let in-flight parses settle first, so files they put back for a retry are found by the final scan
+            wait(self._futures)
+            self._scan(is_final=True)
+            wait(self._futures)
+            for future in self._futures:
+                future.result()
+        finally:
+            self._shutdown_executor()
+
+        if self._invalid_file_names:
+            raise ValueError(
+                f"Invalid JSON file names in {self.json_directory}, expected OpenPose frame indices in: "
+                f"{sorted(self._invalid_file_names)}"
+            )
+        number_of_frames = len(self._parsed_frame_indices)
+        if number_of_frames > 0 and max(self._parsed_frame_indices) >= number_of_frames:
+            raise ValueError(
+                f"Invalid number of frames in {self.json_directory}: found {number_of_frames} files, "
+                f"but frame indices up to {max(self._parsed_frame_indices)}"
+            )
+        logger.info(f"Parsed {number_of_frames} OpenPose JSON files from {self.json_directory}")
+        return self._data_array[:number_of_frames]
+
+    def stop(self) -> None:
+        """
+        Stop watching and parsing without collecting the results, i.e. when OpenPose failed.
+        """
+        self._stop_watching()
+        if self._executor is not None:
+            for future in self._futures:
+                future.cancel()
+            self._shutdown_executor()
+
+    def _stop_watching(self) -> None:
+        self._stop_event.set()
+        if self._watcher_thread is not None:
+            self._watcher_thread.join()
+            self._watcher_thread = None
+
+    def _shutdown_executor(self) -> None:
+        self._executor.shutdown(wait=True)
+        self._executor = None
+
+    def _watch(self) -> None:
+        try:
+            while not self._stop_event.wait(self.poll_interval_seconds):
+                self._scan(is_final=False)
+        except Exception as e:
+            # files left unparsed are picked up by the final scan in `finish()`
+            logger.error(f"Failed to scan {self.json_directory} for OpenPose JSON files: {e}")
+
+    def _scan(self, is_final: bool) -> None:
+        if not self.json_directory.exists():
+            return
+        with os.scandir(self.json_directory) as entries:
+            file_names = [entry.name for entry in entries if entry.name.endswith(".json")]
+
+        for file_name in file_names:
+            with self._lock:
+                if file_name in self._submitted_file_names:
+                    continue
+                self._submitted_file_names.add(file_name)
+
+            frame_index = self.recorder.extract_frame_index(file_name)
+            if frame_index is None:
+                with self._lock:
+                    self._invalid_file_names.add(file_name)
+                continue
+            self._futures.append(
+                self._executor.submit(self._ingest, file_name, frame_index, is_final)
+            )
+
+    def _ingest(self, file_name: str, frame_index: int, is_final: bool) -> None:
+        try:
+            keypoints = self.recorder.parse_openpose_json(self.json_directory / file_name)
+        except (json.JSONDecodeError, OSError):
+            if is_final:
+                raise
+            # OpenPose is still writing the file, pick it up again on the next scan
+            with self._lock:
+                self._submitted_file_names.discard(file_name)
+            return
+
+        with self._lock:
+            if frame_index >= self._data_array.shape[0]:
+                self._grow(frame_index + 1)
+            if keypoints is not None:
+                self._data_array[frame_index] = keypoints
+            self._parsed_frame_indices.add(frame_index)
+
+    def _grow(self, number_of_frames: int) -> None:
+        new_data_array = np.full(
+            (max(number_of_frames, 2 * self._data_array.shape[0]), *self._data_array.shape[1:]),
+            np.nan,
+        )
+        new_data_array[: self._data_array.shape[0]] = self._data_array
+        self._data_array = new_data_array
@@ -162,3 +162,8 @@ class OpenPoseTrackingParams(BaseTrackingParams):
     track_face: bool = True
     write_video: bool = True
     output_resolution: str = "-1x-1"
+    consolidate_jsons: bool = False
+    delete_consolidated_jsons: bool = False
+    openpose_executable_path: Optional[str] = None
+    threads_per_job: Optional[int] = None
+    memory_limit_mb_per_job: Optional[int] = None
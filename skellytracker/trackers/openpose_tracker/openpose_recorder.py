@@ -1,11 +1,15 @@
 import json
-from typing import Dict, Union
+from typing import Dict, Optional, Union
 import numpy as np
 from pathlib import Path
 import re
 from tqdm import tqdm
 
 from skellytracker.trackers.base_tracker.base_recorder import BaseCumulativeRecorder
+from skellytracker.trackers.openpose_tracker.openpose_archive import (
+    get_openpose_archive_path,
+    load_openpose_archive,
+)
 from skellytracker.trackers.openpose_tracker.openpose_model_info import (
     OpenPoseModelInfo,
 )
@@ -29,7 +33,8 @@ class OpenPoseRecorder(BaseCumulativeRecorder):
     def parse_openpose_jsons(self, json_directory: Union[Path, str]) -> np.ndarray:
         # Remove the iteration over subdirectories and focus on a single directory
         json_directory = Path(json_directory)
-        files = list(Path(json_directory).glob("*.json"))
+        # sorted so files line up with the sorted frame indices below
+        files = sorted(json_directory.glob("*.json"))
         num_frames = len(files)
         frame_indices = [
             index
@@ -43,6 +48,21 @@ class OpenPoseRecorder(BaseCumulativeRecorder):
                 f"Invalid number of frames in {json_directory}: expected {num_frames} != {len(frame_indices)} frames in file"
             )
 
+        # Initialize a single camera array since we're only processing one video at a time
+        data_array = np.full((num_frames, self.get_number_of_markers(), 3), np.nan)
+
+        # Process each JSON file in the directory
+        for file_index, json_file in enumerate(
+            tqdm(files, desc=f"Processing {json_directory.name} JSONs")
+        ):
+            keypoints = self.parse_openpose_json(json_file)
+            if keypoints is not None:
+                data_array[frame_indices[file_index], :, :] = keypoints
+
+        return data_array
+
+    def get_number_of_markers(self) -> int:
+        """Number of markers per frame in the parsed array, given which parts are tracked."""
         num_markers = OpenPoseModelInfo.num_tracked_points_body
         if self.track_hands:
             num_markers += (
@@ -51,22 +71,22 @@ class OpenPoseRecorder(BaseCumulativeRecorder):
             )
         if self.track_faces:
             num_markers += OpenPoseModelInfo.num_tracked_points_face
+        return num_markers
 
-        # Initialize a single camera array since we're only processing one video at a time
-        data_array = np.full((num_frames, num_markers, 3), np.nan)
-
-        # Process each JSON file in the directory
-        for file_index, json_file in enumerate(
-            tqdm(files, desc=f"Processing {json_directory.name} JSONs")
-        ):
-            with open(json_file) as f:
-                data = json.load(f)
+    def parse_openpose_json(self, json_file: Union[Path, str]) -> Optional[np.ndarray]:
+        """
+        Parse a single frame's JSON file.
 
-            if data["people"]:
-                keypoints = self.extract_keypoints(data["people"][0])
-                data_array[frame_indices[file_index], :, :] = keypoints
+        :param json_file: Path to an OpenPose `_keypoints.json` file.
+        :return: The keypoints of the first person in the frame, or None if no one was detected
+        :raise json.JSONDecodeError: If the file is not complete JSON, i.e. it is still being written.
+        """
+        with open(json_file) as f:
+            data = json.load(f)
 
-        return data_array
+        if not data["people"]:
+            return None
+        return self.extract_keypoints(data["people"][0])
 
     def extract_keypoints(self, person_data: Dict[str, np.ndarray]) -> np.ndarray:
         """Extract and organize keypoints from person data."""
@@ -110,7 +130,13 @@ class OpenPoseRecorder(BaseCumulativeRecorder):
     def process_tracked_objects(self, output_json_path: Path) -> np.ndarray:
         """
         Convert the recorded JSON data into the structured numpy array format.
+        Reads the directory's consolidated archive instead of the JSON files when there is one.
         """
-        # In this case, the recorded_objects are already in the desired format, so we simply return them.
-        self.recorded_objects_array = self.parse_openpose_jsons(output_json_path)
+        archive_path = get_openpose_archive_path(output_json_path)
+        if archive_path.exists():
+            self.recorded_objects_array = load_openpose_archive(
+                archive_path, track_hands=self.track_hands, track_faces=self.track_faces
+            )
+        else:
+            self.recorded_objects_array = self.parse_openpose_jsons(output_json_path)
         return self.recorded_objects_array
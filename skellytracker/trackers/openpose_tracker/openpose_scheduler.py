@@ -0,0 +1,88 @@
+import logging
+from concurrent.futures import ThreadPoolExecutor, as_completed
+from pathlib import Path
+from typing import Callable, List, Optional, Union
+
+import numpy as np
+
+from skellytracker.trackers.openpose_tracker.openpose_tracker import OpenPoseTracker
+
+logger = logging.getLogger(__name__)
+
+
+class OpenPoseScheduler:
+    """
+    Runs OpenPose on several videos with at most `max_concurrent_jobs` OpenPose processes at a time.
+
+    Each job streams its process's output to the log and parses its JSON files while it runs,
+    so a finished job's data is collected while the other jobs keep running.
+    Per-job thread and memory budgets are set on the tracker.
+    """
+
+    def __init__(self, tracker: OpenPoseTracker, max_concurrent_jobs: int = 1):
+        """
+        Initialize the OpenPoseScheduler.
+
+        :param tracker: The tracker whose settings every job runs with.
+        :param max_concurrent_jobs: Maximum number of OpenPose processes running at once.
+        """
+        if max_concurrent_jobs < 1:
+            raise ValueError(f"max_concurrent_jobs must be at least 1, got {max_concurrent_jobs}")
+        self.tracker = tracker
+        self.max_concurrent_jobs = max_concurrent_jobs
+
+    def run(
+        self,
+        input_video_filepaths: List[Union[str, Path]],
+        output_video_filepaths: List[Union[str, Path]],
+        on_job_finished: Optional[Callable[[int, Optional[np.ndarray]], None]] = None,
+    ) -> List[Optional[np.ndarray]]:
+        """
+        Run OpenPose on every video.
+
+        :param input_video_filepaths: Paths to the input videos.
+        :param output_video_filepaths: Paths to write each video's annotated video to.
+        :param on_job_finished: Called with each video's index and output array as soon as its job finishes.
+        :return: The output arrays in video order, None for videos OpenPose failed on
+        """
+        if len(input_video_filepaths) != len(output_video_filepaths):
+            raise ValueError(
+                f"Expected one output video per input video, got {len(output_video_filepaths)} "
+                f"for {len(input_video_filepaths)} input videos"
+            )
+
+        output_arrays: List[Optional[np.ndarray]] = [None] * len(input_video_filepaths)
+        with ThreadPoolExecutor(
+            max_workers=self.max_concurrent_jobs, thread_name_prefix="openpose_job"
+        ) as executor:
+            futures = {
+                executor.submit(self.run_job, input_video_filepath, output_video_filepath): video_index
+                for video_index, (input_video_filepath, output_video_filepath) in enumerate(
+                    zip(input_video_filepaths, output_video_filepaths)
+                )
+            }
+            for future in as_completed(futures):
+                video_index = futures[future]
+                output_arrays[video_index] = future.result()
+                logger.info(
+                    f"Finished OpenPose job for {Path(input_video_filepaths[video_index]).name}"
+                )
+                if on_job_finished is not None:
+                    on_job_finished(video_index, output_arrays[video_index])
+
+        return output_arrays
+
+    def run_job(
+        self, input_video_filepath: Union[str, Path], output_video_filepath: Union[str, Path]
+    ) -> Optional[np.ndarray]:
+        output_json_folder_path = (
+            self.tracker.output_json_folder_path
+            if self.tracker.output_json_folder_path is not None
+            else self.tracker.get_default_json_folder_path(input_video_filepath)
+        )
+        logger.info(f"Starting OpenPose job for {Path(input_video_filepath).name}")
+        return self.tracker.run_openpose(
+            input_video_filepath=input_video_filepath,
+            output_video_filepath=output_video_filepath,
+            output_json_folder_path=output_json_folder_path,
+        )
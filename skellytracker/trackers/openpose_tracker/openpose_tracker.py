@@ -1,9 +1,26 @@
+import logging
+import os
 import subprocess
 from pathlib import Path
-from typing import Optional, Union
+from typing import Callable, Dict, List, Optional, Union
+import cv2
+import numpy as np
+from pydantic import BaseModel
 from skellytracker.trackers.base_tracker.base_tracker import BaseCumulativeTracker
+from skellytracker.trackers.openpose_tracker.openpose_archive import (
+    get_openpose_archive_path,
+    save_openpose_archive,
+)
+from skellytracker.trackers.openpose_tracker.openpose_json_ingestor import OpenPoseJsonIngestor
 from skellytracker.trackers.openpose_tracker.openpose_recorder import OpenPoseRecorder
 
+try:
+    import resource
+except ImportError:  # not available on Windows
+    resource = None
+
+logger = logging.getLogger(__name__)
+
 
 class OpenPoseTracker(BaseCumulativeTracker):
     def __init__(
@@ -15,6 +32,12 @@ class OpenPoseTracker(BaseCumulativeTracker):
         track_hands: bool = True,
         track_faces: bool = True,
         output_resolution: str = "-1x-1",
+        json_parsing_workers: int = 4,
+        consolidate_jsons: bool = False,
+        delete_consolidated_jsons: bool = False,
+        openpose_executable_path: Optional[Union[str, Path]] = None,
+        threads_per_job: Optional[int] = None,
+        memory_limit_bytes_per_job: Optional[int] = None,
     ):
         """
         Initialize the OpenPoseTracker.
@@ -27,6 +50,13 @@ class OpenPoseTracker(BaseCumulativeTracker):
         :param track_hands: Whether to track hands.
         :param track_faces: Whether to track faces.
         :param output_resolution: Output resolution for video.
+        :param json_parsing_workers: Number of threads parsing OpenPose's JSON output while it runs.
+        :param consolidate_jsons: Whether to consolidate each video's JSON files into a single archive after processing.
+        :param delete_consolidated_jsons: Whether to delete the JSON files once they are consolidated.
+        :param openpose_executable_path: Path to the OpenPose executable, defaults to bin/OpenPoseDemo.exe in the root folder.
+        :param threads_per_job: Maximum number of CPU threads each OpenPose process should use, unlimited if None.
+        :param memory_limit_bytes_per_job: Maximum address space of each OpenPose process, unlimited if None.
+            Only enforced on Linux.
         """
         super().__init__(
             tracked_object_names=[],
@@ -44,6 +74,37 @@ class OpenPoseTracker(BaseCumulativeTracker):
         self.track_hands = track_hands
         self.track_faces = track_faces
         self.output_resolution = output_resolution
+        self.json_parsing_workers = json_parsing_workers
+        self.consolidate_jsons = consolidate_jsons
+        self.delete_consolidated_jsons = delete_consolidated_jsons
+        self.openpose_executable_path = (
+            Path(openpose_executable_path)
+            if openpose_executable_path is not None
+            else self.openpose_root_folder_path / "bin" / "OpenPoseDemo.exe"
+        )
+        self.threads_per_job = threads_per_job
+        self.memory_limit_bytes_per_job = memory_limit_bytes_per_job
+
+    @classmethod
+    def from_tracking_params(cls, tracking_params: BaseModel) -> "OpenPoseTracker":
+        return cls(
+            openpose_root_folder_path=tracking_params.openpose_root_folder_path,
+            output_json_folder_path=tracking_params.output_json_path,
+            net_resolution=tracking_params.net_resolution,
+            number_people_max=tracking_params.number_people_max,
+            track_faces=tracking_params.track_face,
+            track_hands=tracking_params.track_hands,
+            output_resolution=tracking_params.output_resolution,
+            consolidate_jsons=tracking_params.consolidate_jsons,
+            delete_consolidated_jsons=tracking_params.delete_consolidated_jsons,
+            openpose_executable_path=tracking_params.openpose_executable_path,
+            threads_per_job=tracking_params.threads_per_job,
+            memory_limit_bytes_per_job=(
+                tracking_params.memory_limit_mb_per_job * 1024**2
+                if tracking_params.memory_limit_mb_per_job is not None
+                else None
+            ),
+        )
 
     def set_track_hands(self, track_hands: bool):
         self._track_hands = track_hands
@@ -74,28 +135,48 @@ class OpenPoseTracker(BaseCumulativeTracker):
         :param use_tqdm: Whether to use tqdm progress bar.
         :return: The output array, or None if recorder isn't initialized in tracker.
         """
-        # Extract video name without extension to use as a unique folder name
-        video_name = Path(input_video_filepath).stem
-
         if self.output_json_folder_path is None:
-            self.output_json_folder_path = Path(input_video_filepath).parent.parent / "output_data" / "raw_data" / "openpose_jsons"
+            self.output_json_folder_path = self.get_default_json_folder_path(input_video_filepath)
+
+        output_array = self.run_openpose(
+            input_video_filepath=input_video_filepath,
+            output_video_filepath=output_video_filepath,
+            output_json_folder_path=self.output_json_folder_path,
+        )
+
+        if output_array is not None and self.recorder is not None:
+            self.recorder.recorded_objects_array = output_array
+            if save_data_bool:
+                self.recorder.save(
+                    file_path=str(Path(input_video_filepath).with_suffix(".npy"))
+                )
 
-        Path(self.output_json_folder_path).mkdir(parents=True, exist_ok=True)
+        return output_array
 
-        unique_json_output_path = Path(self.output_json_folder_path) / video_name
-        unique_json_output_path.mkdir(parents=True, exist_ok=True)
+    @staticmethod
+    def get_default_json_folder_path(input_video_filepath: Union[str, Path]) -> Path:
+        return Path(input_video_filepath).parent.parent / "output_data" / "raw_data" / "openpose_jsons"
 
-        # Full path to the OpenPose executable
-        openpose_executable_path = (
-            self.openpose_root_folder_path / "bin" / "OpenPoseDemo.exe"
-        )
+    def build_openpose_command(
+        self,
+        input_video_filepath: Union[str, Path],
+        output_video_filepath: Union[str, Path],
+        json_output_path: Union[str, Path],
+    ) -> List[str]:
+        """
+        Build the OpenPose command line for a video.
 
+        :param input_video_filepath: Path to the input video file.
+        :param output_video_filepath: Path to the output video file.
+        :param json_output_path: Directory OpenPose writes the video's JSON files to.
+        :return: The command as a list of arguments
+        """
         openpose_command = [
-            str(openpose_executable_path),  # Full path to the OpenPose executable
+            str(self.openpose_executable_path),  # Full path to the OpenPose executable
             "--video",
             str(input_video_filepath),
             "--write_json",
-            str(unique_json_output_path),
+            str(json_output_path),
             "--net_resolution",
             str(self.net_resolution),
             "--number_people_max",
@@ -110,32 +191,187 @@ class OpenPoseTracker(BaseCumulativeTracker):
             openpose_command.append("--hand")
         if self.track_faces:
             openpose_command.append("--face")
+        return openpose_command
 
-        # Update the subprocess command to use the unique output directory
-        try:
-            subprocess.run(  # noqa: S603
-                openpose_command,
-                shell=False,
-                cwd=self.openpose_root_folder_path,  # Set the current working directory for the subprocess
-                check=True,
-            )
-        except subprocess.CalledProcessError as e:
-            print(f"Error: {e}")
-            return None
+    def get_openpose_environment(self) -> Dict[str, str]:
+        """
+        Environment for the OpenPose process, limiting the threads of its math libraries to `threads_per_job`.
+        """
+        environment = dict(os.environ)
+        if self.threads_per_job is not None:
+            for variable_name in ["OMP_NUM_THREADS", "MKL_NUM_THREADS", "OPENBLAS_NUM_THREADS"]:
+                environment[variable_name] = str(self.threads_per_job)
+        return environment
+
+    def run_openpose(
+        self,
+        input_video_filepath: Union[str, Path],
+        output_video_filepath: Union[str, Path],
+        output_json_folder_path: Union[str, Path],
+    ) -> Optional[np.ndarray]:
+        """
+        Run OpenPose on a video, streaming its output to the log and parsing its JSON files as they are written.
+
+        Does not change the tracker's state, so several videos can run at once, i.e. from `OpenPoseScheduler`.
 
+        :param input_video_filepath: Path to the input video file.
+        :param output_video_filepath: Path to the output video file.
+        :param output_json_folder_path: Folder to create the video's JSON directory in.
+        :return: The output array, or None if OpenPose failed or the tracker has no recorder.
+        """
+        # Extract video name without extension to use as a unique folder name
+        video_name = Path(input_video_filepath).stem
+
+        unique_json_output_path = Path(output_json_folder_path) / video_name
+        unique_json_output_path.mkdir(parents=True, exist_ok=True)
+        # an archive from a previous run would otherwise be read instead of this run's JSONs
+        get_openpose_archive_path(unique_json_output_path).unlink(missing_ok=True)
+
+        openpose_command = self.build_openpose_command(
+            input_video_filepath=input_video_filepath,
+            output_video_filepath=output_video_filepath,
+            json_output_path=unique_json_output_path,
+        )
+
+        # parse the JSON files as OpenPose writes them, so the data is nearly ready once it exits
+        json_ingestor = None
         if self.recorder is not None:
-            output_array = self.recorder.process_tracked_objects(
-                output_json_path=unique_json_output_path
+            cap = cv2.VideoCapture(str(input_video_filepath))
+            number_of_frames = int(cap.get(cv2.CAP_PROP_FRAME_COUNT))
+            cap.release()
+            json_ingestor = OpenPoseJsonIngestor(
+                recorder=self.recorder,
+                json_directory=unique_json_output_path,
+                number_of_frames=number_of_frames,
+                max_workers=self.json_parsing_workers,
             )
-            if save_data_bool:
-                self.recorder.save(
-                    file_path=str(Path(input_video_filepath).with_suffix(".npy"))
-                )
-        else:
-            output_array = None
+            json_ingestor.start()
+
+        try:
+            return_code = self.run_openpose_process(openpose_command, video_name)
+        except OSError as e:
+            return_code = None
+            logger.error(f"Failed to run OpenPose on {video_name}: {e}")
+        if return_code != 0:
+            if return_code is not None:
+                logger.error(f"OpenPose exited with code {return_code} on {video_name}")
+            if json_ingestor is not None:
+                json_ingestor.stop()
+            return None
+
+        if json_ingestor is None:
+            return None
 
+        output_array = json_ingestor.finish()
+        if self.consolidate_jsons:
+            consolidate_openpose_jsons(
+                unique_json_output_path,
+                delete_jsons=self.delete_consolidated_jsons,
+                keypoints=output_array if self.track_hands and self.track_faces else None,
+                max_workers=self.json_parsing_workers,
+            )
         return output_array
 
+    def run_openpose_process(self, openpose_command: List[str], video_name: str) -> int:
+        """
+        Run an OpenPose command, logging each line it prints, within the tracker's thread and memory budget.
+
+        :param openpose_command: The command from `build_openpose_command`.
+        :param video_name: Name of the video, prefixed to each logged line.
+        :return: The process's return code
+        """
+        process = subprocess.Popen(  # noqa: S603
+            openpose_command,
+            shell=False,
+            cwd=self.openpose_root_folder_path,  # Set the current working directory for the subprocess
+            env=self.get_openpose_environment(),
+            stdout=subprocess.PIPE,
+            stderr=subprocess.STDOUT,
+            text=True,
+            errors="replace",
+            preexec_fn=(
+                get_memory_limit_preexec_fn(self.memory_limit_bytes_per_job)
+                if self.memory_limit_bytes_per_job is not None
+                else None
+            ),
+        )
+        try:
+            for line in process.stdout:
+                line = line.rstrip()
+                if line:
+                    logger.info(f"[OpenPose {video_name}] {line}")
+        finally:
+            process.stdout.close()
+            return_code = process.wait()
+        return return_code
+
+
+def get_memory_limit_preexec_fn(memory_limit_bytes: int) -> Optional[Callable[[], None]]:
+    """
+    Returns a `preexec_fn` for `subprocess.Popen` that limits the child process's address space before it starts.
+
+    The limit is set in the child between fork and exec, so OpenPose never runs without it.
+
+    :param memory_limit_bytes: The maximum address space in bytes, lowered to the hard limit if it is above it.
+    :return: The function to pass as `preexec_fn`, or None if the platform does not support memory limits.
+    """
+    if resource is None:
+        logger.warning(
+            "Memory limits for OpenPose processes need the `resource` module, which is not available on this "
+            "platform, running OpenPose without one"
+        )
+        return None
+    _, hard_limit = resource.getrlimit(resource.RLIMIT_AS)
+    if hard_limit != resource.RLIM_INFINITY and memory_limit_bytes > hard_limit:
+        logger.warning(
+            f"OpenPose memory limit of {memory_limit_bytes} bytes is above the hard limit, using {hard_limit} bytes"
+        )
+        memory_limit_bytes = hard_limit
+
+    def limit_memory() -> None:
+        # runs in the child process, so it must not log or take locks
+        resource.setrlimit(resource.RLIMIT_AS, (memory_limit_bytes, memory_limit_bytes))
+
+    return limit_memory
+
+
+def consolidate_openpose_jsons(
+    json_directory: Union[str, Path],
+    delete_jsons: bool = False,
+    keypoints: Optional[np.ndarray] = None,
+    max_workers: int = 4,
+) -> Path:
+    """
+    Consolidate a video's OpenPose JSON directory into a single archive, which `OpenPoseRecorder` reads instead of the JSONs.
+
+    :param json_directory: The directory of the video's OpenPose JSON files.
+    :param delete_jsons: Whether to delete the JSON files, and the directory if it is then empty, once the archive is written.
+    :param keypoints: The directory's keypoints, if already parsed with hands and faces tracked, to skip parsing them again.
+    :param max_workers: Number of threads parsing the JSON files.
+    :return: Path to the archive
+    """
+    json_directory = Path(json_directory)
+    if keypoints is None:
+        keypoints = OpenPoseJsonIngestor(
+            recorder=OpenPoseRecorder(track_hands=True, track_faces=True),
+            json_directory=json_directory,
+            max_workers=max_workers,
+        ).finish()
+
+    archive_path = get_openpose_archive_path(json_directory)
+    save_openpose_archive(archive_path, keypoints)
+
+    if delete_jsons:
+        for json_file in json_directory.glob("*.json"):
+            json_file.unlink()
+        try:
+            json_directory.rmdir()
+        except OSError:
+            logger.info(f"Keeping {json_directory}, it contains files other than OpenPose JSONs")
+        logger.info(f"Deleted OpenPose JSON files in {json_directory}")
+
+    return archive_path
+
 
 if __name__ == "__main__":
     # Example usage
@@ -17,7 +17,7 @@ class SAMTracker(BaseTracker):
             results[0].keypoints
         )
 
-        self.annotated_image = self.annotate_image(image, results=results, **kwargs)
+        self.defer_annotation(self.annotate_image, image, results=results, **kwargs)
 
         return self.tracked_objects
 
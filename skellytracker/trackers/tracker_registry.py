@@ -0,0 +1,235 @@
+import importlib
+import logging
+from dataclasses import dataclass
+from typing import Any, Dict, List, Optional, Type
+
+from pydantic import BaseModel, ValidationError
+
+from skellytracker.trackers.base_tracker.base_tracker import BaseTracker
+from skellytracker.trackers.base_tracker.base_tracking_params import BaseTrackingParams
+from skellytracker.trackers.base_tracker.model_info import ModelInfo
+
+logger = logging.getLogger(__name__)
+
+
+@dataclass
+class TrackerRegistration:
+    """
+    A dataclass for storing where to find a tracker and its related classes.
+
+    Classes are given as "module.path:ClassName" strings, so registering a tracker does not import it.
+    """
+
+    tracker_name: str
+    tracker_class_path: str
+    tracking_params_class_path: Optional[str] = None
+    model_info_class_path: Optional[str] = None
+    optional_dependency_group: Optional[str] = None
+    model_dictionary_path: Optional[str] = None
+    model_size_field: str = "model_size"
+
+
+_tracker_registry: Dict[str, TrackerRegistration] = {}
+
+
+def register_tracker(
+    tracker_name: str,
+    tracker_class_path: str,
+    tracking_params_class_path: Optional[str] = None,
+    model_info_class_path: Optional[str] = None,
+    optional_dependency_group: Optional[str] = None,
+    model_dictionary_path: Optional[str] = None,
+    model_size_field: str = "model_size",
+) -> None:
+    """
+    Register a tracker so it can be created by name, i.e. by `process_folder_of_videos`.
+
+    The tracker is created with `from_tracking_params`, which trackers taking constructor arguments should override.
+
+    :param tracker_name: Name to create the tracker by, matching ModelInfo.tracker_name.
+    :param tracker_class_path: "module.path:ClassName" of the tracker class.
+    :param tracking_params_class_path: "module.path:ClassName" of the tracking params model, defaults to BaseTrackingParams.
+    :param model_info_class_path: "module.path:ClassName" of the tracker's ModelInfo, if it has one.
+    :param optional_dependency_group: The skellytracker extra needed to import the tracker, used in error messages.
+    :param model_dictionary_path: "module.path:name" of the dictionary mapping model sizes to the weights files
+        the tracker loads, if it loads one.
+    :param model_size_field: The tracking params field holding the key into the model dictionary.
+    """
+    if tracker_name in _tracker_registry:
+        logger.warning(f"Replacing registered tracker {tracker_name}")
+    _tracker_registry[tracker_name] = TrackerRegistration(
+        tracker_name=tracker_name,
+        tracker_class_path=tracker_class_path,
+        tracking_params_class_path=tracking_params_class_path,
+        model_info_class_path=model_info_class_path,
+        optional_dependency_group=optional_dependency_group,
+        model_dictionary_path=model_dictionary_path,
+        model_size_field=model_size_field,
+    )
+
+
+def unregister_tracker(tracker_name: str) -> None:
+    """
+    Remove a tracker registered with `register_tracker`.
+
+    :param tracker_name: The registered name of the tracker.
+    :raise ValueError: If no tracker is registered under tracker_name.
+    """
+    get_tracker_registration(tracker_name)
+    del _tracker_registry[tracker_name]
+
+
+def get_registered_tracker_names() -> List[str]:
+    """
+    Returns the names of all registered trackers.
+    """
+    return list(_tracker_registry)
+
+
+def get_tracker_class(tracker_name: str) -> Type[BaseTracker]:
+    """
+    Returns the tracker class registered under tracker_name, importing it on first use.
+
+    :param tracker_name: The registered name of the tracker.
+    :return: The tracker class.
+    :raise ValueError: If no tracker is registered under tracker_name.
+    :raise ImportError: If the tracker's optional dependencies are not installed.
+    """
+    registration = get_tracker_registration(tracker_name)
+    return _import_object(registration.tracker_class_path, registration)
+
+
+def get_tracker_params_class(tracker_name: str) -> Type[BaseModel]:
+    """
+    Returns the tracking params model for the tracker registered under tracker_name.
+    """
+    registration = get_tracker_registration(tracker_name)
+    if registration.tracking_params_class_path is None:
+        return BaseTrackingParams
+    return _import_object(registration.tracking_params_class_path, registration)
+
+
+def get_model_info_class(tracker_name: str) -> Optional[Type[ModelInfo]]:
+    """
+    Returns the ModelInfo class for the tracker registered under tracker_name, or None if it has none.
+    """
+    registration = get_tracker_registration(tracker_name)
+    if registration.model_info_class_path is None:
+        return None
+    return _import_object(registration.model_info_class_path, registration)
+
+
+def get_model_file_name(tracker_name: str, tracking_params: BaseModel) -> Optional[str]:
+    """
+    Returns the name of the model weights file the tracker registered under tracker_name loads.
+
+    :param tracker_name: The registered name of the tracker.
+    :param tracking_params: The tracking parameters the tracker is created from.
+    :return: The model weights file name, or None if the tracker does not load one.
+    """
+    registration = get_tracker_registration(tracker_name)
+    if registration.model_dictionary_path is None:
+        return None
+    model_dictionary = _import_object(registration.model_dictionary_path, registration)
+    return model_dictionary.get(getattr(tracking_params, registration.model_size_field))
+
+
+def create_tracker(tracker_name: str, tracking_params: BaseModel) -> BaseTracker:
+    """
+    Create the tracker registered under tracker_name from the given tracking params.
+
+    :param tracker_name: The registered name of the tracker.
+    :param tracking_params: The tracking parameters to create the tracker with.
+    :return: The tracker object.
+    """
+    return get_tracker_class(tracker_name).from_tracking_params(tracking_params)
+
+
+def create_default_tracking_params(tracker_name: str) -> BaseModel:
+    """
+    Create the default tracking params for the tracker registered under tracker_name.
+
+    :param tracker_name: The registered name of the tracker.
+    :return: The default tracking params.
+    :raise ValueError: If the tracking params have required fields without defaults.
+    """
+    try:
+        return get_tracker_params_class(tracker_name)()
+    except ValidationError as e:
+        raise ValueError(
+            f"{tracker_name} has required tracking params, please provide tracking params directly: {e}"
+        ) from e
+
+
+def get_tracker_registration(tracker_name: str) -> TrackerRegistration:
+    try:
+        return _tracker_registry[tracker_name]
+    except KeyError:
+        raise ValueError(
+            f"Invalid tracker type {tracker_name}, registered trackers are: {get_registered_tracker_names()}"
+        ) from None
+
+
+def _import_object(object_path: str, registration: TrackerRegistration) -> Any:
+    module_name, attribute_path = object_path.split(":")
+    try:
+        module = importlib.import_module(module_name)
+    except ModuleNotFoundError as e:
+        if registration.optional_dependency_group is None:
+            raise
+        raise ImportError(
+            f"To use {registration.tracker_name}, install skellytracker[{registration.optional_dependency_group}]"
+        ) from e
+    imported_object = module
+    for attribute_name in attribute_path.split("."):
+        imported_object = getattr(imported_object, attribute_name)
+    return imported_object
+
+
+register_tracker(
+    tracker_name="BrightestPointTracker",
+    tracker_class_path="skellytracker.trackers.bright_point_tracker.brightest_point_tracker:BrightestPointTracker",
+)
+register_tracker(
+    tracker_name="MediapipeHolisticTracker",
+    tracker_class_path="skellytracker.trackers.mediapipe_tracker.mediapipe_holistic_tracker:MediapipeHolisticTracker",
+    tracking_params_class_path="skellytracker.trackers.mediapipe_tracker.mediapipe_model_info:MediapipeTrackingParams",
+    model_info_class_path="skellytracker.trackers.mediapipe_tracker.mediapipe_model_info:MediapipeModelInfo",
+    optional_dependency_group="mediapipe",
+)
+register_tracker(
+    tracker_name="MediapipeBlendshapeTracker",
+    tracker_class_path="skellytracker.trackers.mediapipe_blendshape_tracker.mediapipe_blendshape_tracker:MediapipeBlendshapeTracker",
+    model_info_class_path="skellytracker.trackers.mediapipe_blendshape_tracker.mediapipe_blendshape_model_info:MediapipeBlendshapeModelInfo",
+    optional_dependency_group="mediapipe",
+)
+register_tracker(
+    tracker_name="YOLOMediapipeComboTracker",
+    tracker_class_path="skellytracker.trackers.yolo_mediapipe_combo_tracker.yolo_mediapipe_combo_tracker:YOLOMediapipeComboTracker",
+    tracking_params_class_path="skellytracker.trackers.mediapipe_tracker.mediapipe_model_info:MediapipeTrackingParams",
+    model_info_class_path="skellytracker.trackers.mediapipe_tracker.mediapipe_model_info:MediapipeModelInfo",
+    optional_dependency_group="mediapipe,yolo",
+    model_dictionary_path="skellytracker.trackers.yolo_object_tracker.yolo_object_model_info:yolo_object_model_dictionary",
+    model_size_field="yolo_model_size",
+)
+register_tracker(
+    tracker_name="YOLOPoseTracker",
+    tracker_class_path="skellytracker.trackers.yolo_tracker.yolo_tracker:YOLOPoseTracker",
+    tracking_params_class_path="skellytracker.trackers.yolo_tracker.yolo_model_info:YOLOTrackingParams",
+    model_info_class_path="skellytracker.trackers.yolo_tracker.yolo_model_info:YOLOModelInfo",
+    optional_dependency_group="yolo",
+    model_dictionary_path="skellytracker.trackers.yolo_tracker.yolo_model_info:YOLOModelInfo.model_dictionary",
+)
+register_tracker(
+    tracker_name="YOLOObjectTracker",
+    tracker_class_path="skellytracker.trackers.yolo_object_tracker.yolo_object_tracker:YOLOObjectTracker",
+    tracking_params_class_path="skellytracker.trackers.yolo_object_tracker.yolo_object_model_info:YOLOObjectTrackingParams",
+    optional_dependency_group="yolo",
+    model_dictionary_path="skellytracker.trackers.yolo_object_tracker.yolo_object_model_info:yolo_object_model_dictionary",
+)
+register_tracker(
+    tracker_name="OpenPoseTracker",
+    tracker_class_path="skellytracker.trackers.openpose_tracker.openpose_tracker:OpenPoseTracker",
+    tracking_params_class_path="skellytracker.trackers.openpose_tracker.openpose_model_info:OpenPoseTrackingParams",
+    model_info_class_path="skellytracker.trackers.openpose_tracker.openpose_model_info:OpenPoseModelInfo",
+)
@@ -3,13 +3,18 @@ import numpy as np
 import copy
 import mediapipe as mp
 import torch
-from typing import Dict, Literal, Tuple
+from typing import Dict, Literal, Optional, Tuple
+from pydantic import BaseModel
 from ultralytics import YOLO
 
 from skellytracker.trackers.base_tracker.base_tracker import BaseTracker
+from skellytracker.trackers.base_tracker.skeleton_renderer import SkeletonRenderer
 from skellytracker.trackers.base_tracker.tracked_object import TrackedObject
 from skellytracker.trackers.mediapipe_tracker.mediapipe_holistic_recorder import (
     MediapipeHolisticRecorder,
+    fill_landmark_array,
+    get_holistic_connections,
+    landmarks_to_array,
 )
 from skellytracker.trackers.mediapipe_tracker.mediapipe_model_info import (
     MediapipeModelInfo,
@@ -32,13 +37,34 @@ class YOLOMediapipeComboTracker(BaseTracker):
         buffer_size_method: Literal[
             "buffer_by_box_size", "buffer_by_image_size"
         ] = "buffer_by_box_size",
+        record_to_array: bool = False,
+        detection_interval: int = 1,
+        roi_buffer_percentage: float = 20,
+        min_roi_pose_visibility: float = 0.5,
+        predict_roi_motion: bool = False,
+        no_detection_policy: Literal["full_frame", "last_box", "skip"] = "full_frame",
+        max_frames_with_last_box: int = 5,
     ):
+        """
+        Initialize the YOLOMediapipeComboTracker.
+
+        :param detection_interval: Run YOLO person detection every N frames, and crop the frames in between around the
+            previous frame's landmarks. 1 runs detection on every frame.
+        :param roi_buffer_percentage: Buffer added around the previous frame's landmarks when cropping without detection,
+            as a percentage sized by `buffer_size_method`.
+        :param min_roi_pose_visibility: Run detection on the next frame if the mean pose landmark visibility drops below this.
+        :param predict_roi_motion: Whether to shift the crop by the landmarks' motion over the previous frame.
+        :param no_detection_policy: What to do when YOLO finds no person. "full_frame" runs mediapipe on the full image,
+            "skip" skips mediapipe and records no landmarks, and "last_box" crops to the last box
+            for up to `max_frames_with_last_box` frames before skipping.
+        :param max_frames_with_last_box: Number of frames without a detection to reuse the last box for.
+        """
         super().__init__(
             tracked_object_names=MediapipeModelInfo.tracked_object_names,
-            recorder=MediapipeHolisticRecorder(),
+            recorder=MediapipeHolisticRecorder(record_to_array=record_to_array),
         )
-        self.mp_drawing = mp.solutions.drawing_utils
         self.mp_holistic = mp.solutions.holistic
+        self.renderer = SkeletonRenderer(connections=get_holistic_connections())
         self.holistic = self.mp_holistic.Holistic(
             model_complexity=model_complexity,
             min_detection_confidence=min_detection_confidence,
@@ -52,21 +78,76 @@ class YOLOMediapipeComboTracker(BaseTracker):
         self.bounding_box_buffer_percentage = bounding_box_buffer_percentage
         self.buffer_size_method = buffer_size_method
 
+        self.detection_interval = detection_interval
+        self.roi_buffer_percentage = roi_buffer_percentage
+        self.min_roi_pose_visibility = min_roi_pose_visibility
+        self.predict_roi_motion = predict_roi_motion
+        self._roi_box_xyxy: Optional[np.ndarray] = None
+        self._roi_velocity = np.zeros(4)
+        self._frames_since_detection = 0
+
+        self.no_detection_policy = no_detection_policy
+        self.max_frames_with_last_box = max_frames_with_last_box
+        self._last_box_xyxy: Optional[np.ndarray] = None
+        self._last_box_buffer_percentage = bounding_box_buffer_percentage
+        self._frames_without_detection = 0
+
+    @classmethod
+    def from_tracking_params(cls, tracking_params: BaseModel) -> "YOLOMediapipeComboTracker":
+        return cls(
+            model_size=tracking_params.yolo_model_size,
+            model_complexity=tracking_params.mediapipe_model_complexity,
+            min_detection_confidence=tracking_params.min_detection_confidence,
+            min_tracking_confidence=tracking_params.min_tracking_confidence,
+            static_image_mode=True,  # yolo cropping must be run with static image mode due to changing size of bounding boxes
+            bounding_box_buffer_percentage=tracking_params.bounding_box_buffer_percentage,
+            buffer_size_method=tracking_params.buffer_size_method,
+            record_to_array=True,
+            detection_interval=tracking_params.yolo_detection_interval,
+            predict_roi_motion=tracking_params.predict_roi_motion,
+            no_detection_policy=tracking_params.no_detection_policy,
+        )
+
     def process_image(self, image: np.ndarray, **kwargs) -> Dict[str, TrackedObject]:
 
-        yolo_results = self.model(image, classes=0, max_det=1, verbose=False)
-        box_xyxy = np.asarray(yolo_results[0].boxes.xyxy.cpu()).flatten()
+        if self._should_run_detection():
+            yolo_results = self.model(image, classes=0, max_det=1, verbose=False)
+            box_xyxy = np.asarray(yolo_results[0].boxes.xyxy.cpu()).flatten()
+            buffer_percentage = self.bounding_box_buffer_percentage
+            self._frames_since_detection = 0
+        else:
+            yolo_results = None
+            box_xyxy = self._predict_roi_box(image)
+            buffer_percentage = self.roi_buffer_percentage
+            self._frames_since_detection += 1
+
+        detected_box = yolo_results is not None and box_xyxy.size > 0
+        if box_xyxy.size > 0:
+            self._last_box_xyxy = box_xyxy
+            self._last_box_buffer_percentage = buffer_percentage
+            self._frames_without_detection = 0
+        else:
+            self._frames_without_detection += 1
+            if (
+                self.no_detection_policy == "last_box"
+                and self._last_box_xyxy is not None
+                and self._frames_without_detection <= self.max_frames_with_last_box
+            ):
+                box_xyxy = self._last_box_xyxy
+                buffer_percentage = self._last_box_buffer_percentage
+            elif self.no_detection_policy != "full_frame":
+                return self._skip_mediapipe(yolo_results)
 
         if box_xyxy.size > 0:
             box_left, box_top, box_right, box_bottom = box_xyxy
 
             if self.buffer_size_method == "buffer_by_image_size":
                 width_buffer, height_buffer = self._get_buffer_bounding_box_total_image(
-                    image, self.bounding_box_buffer_percentage
+                    image, buffer_percentage
                 )
             elif self.buffer_size_method == "buffer_by_box_size":
                 width_buffer, height_buffer = self._get_buffer_bounding_box_box_size(
-                    box_xyxy, self.bounding_box_buffer_percentage
+                    box_xyxy, buffer_percentage
                 )
             else:
                 raise ValueError(
@@ -84,47 +165,153 @@ class YOLOMediapipeComboTracker(BaseTracker):
                 int(box_left) : int(box_right),
             ]
 
-            buffered_yolo_results = copy.deepcopy(yolo_results)
-            buffered_yolo_results[0].boxes.xyxy[0] = torch.tensor(
-                [box_left, box_top, box_right, box_bottom]
-            )
-
         else:
-            # eventually we should not even run mediapipe if no bbox is found
-            box_left, box_top, box_right, box_bottom = 0, 0, 0, 0
+            box_left, box_top, box_right, box_bottom = (
+                0,
+                0,
+                image.shape[1],
+                image.shape[0],
+            )
             cropped_image = image
 
-            buffered_yolo_results = yolo_results
-
         cropped_rgb_image = cv2.cvtColor(cropped_image, cv2.COLOR_BGR2RGB)
 
         mediapipe_results = self.holistic.process(cropped_rgb_image)
 
         # Update the tracking data
-        self._rescale_cropped_data(
+        landmarks_by_object_name = self._rescale_cropped_data(
             image, box_left, box_top, box_right, box_bottom, mediapipe_results
         )
-        self.tracked_objects["pose_landmarks"].extra[
-            "landmarks"
-        ] = mediapipe_results.pose_landmarks
-        self.tracked_objects["face_landmarks"].extra[
-            "landmarks"
-        ] = mediapipe_results.face_landmarks
-        self.tracked_objects["left_hand_landmarks"].extra[
-            "landmarks"
-        ] = mediapipe_results.left_hand_landmarks
-        self.tracked_objects["right_hand_landmarks"].extra[
-            "landmarks"
-        ] = mediapipe_results.right_hand_landmarks
-
-        bbox_image = buffered_yolo_results[0].plot()
-
-        self.annotated_image = self.annotate_image(
-            image=bbox_image, tracked_objects=self.tracked_objects
+        for tracked_object_name, landmarks in landmarks_by_object_name.items():
+            self.tracked_objects[tracked_object_name].extra["landmarks"] = landmarks
+
+        if self.detection_interval > 1:
+            self._update_roi(
+                image,
+                mediapipe_results.pose_landmarks,
+                landmarks_by_object_name["pose_landmarks"],
+            )
+
+        self.defer_annotation(
+            self._annotate_with_crop_box,
+            image=image,
+            yolo_results=yolo_results if detected_box else None,
+            crop_box=(box_left, box_top, box_right, box_bottom),
         )
 
         return self.tracked_objects
 
+    def _annotate_with_crop_box(
+        self,
+        image: np.ndarray,
+        yolo_results: Optional[list],
+        crop_box: Tuple[int, int, int, int],
+    ) -> np.ndarray:
+        """
+        Annotate the image with the box mediapipe was run on, drawn as the YOLO detection if there was one, and the landmarks.
+        """
+        if yolo_results is not None:
+            buffered_yolo_results = copy.deepcopy(yolo_results)
+            buffered_yolo_results[0].boxes.xyxy[0] = torch.tensor(crop_box)
+            bbox_image = buffered_yolo_results[0].plot()
+        else:
+            bbox_image = image.copy()
+            if crop_box != (0, 0, image.shape[1], image.shape[0]):
+                cv2.rectangle(bbox_image, crop_box[:2], crop_box[2:], (255, 0, 0), 2)
+
+        return self.annotate_image(image=bbox_image, tracked_objects=self.tracked_objects)
+
+    def _skip_mediapipe(self, yolo_results) -> Dict[str, TrackedObject]:
+        """
+        Record no landmarks for a frame without a person, without running mediapipe.
+        """
+        for tracked_object in self.tracked_objects.values():
+            tracked_object.extra["landmarks"] = None
+        self._roi_box_xyxy = None
+
+        self.defer_annotation(yolo_results[0].plot)
+
+        return self.tracked_objects
+
+    def _should_run_detection(self) -> bool:
+        return (
+            self.detection_interval <= 1
+            or self._roi_box_xyxy is None
+            or self._frames_since_detection + 1 >= self.detection_interval
+        )
+
+    def _predict_roi_box(self, image: np.ndarray) -> np.ndarray:
+        """
+        Get the box to crop around when skipping detection, from the previous frame's landmarks.
+
+        :param image: The full image.
+        :return: Box as [left, top, right, bottom] in pixels.
+        """
+        if not self.predict_roi_motion:
+            return self._roi_box_xyxy
+
+        predicted_box_xyxy = self._roi_box_xyxy + self._roi_velocity
+        image_size = np.array([image.shape[1], image.shape[0]] * 2)
+        predicted_box_xyxy = np.clip(predicted_box_xyxy, 0, image_size)
+        if (predicted_box_xyxy[2:] <= predicted_box_xyxy[:2]).any():
+            # the predicted motion carried the box out of the image
+            return self._roi_box_xyxy
+        return predicted_box_xyxy
+
+    def _update_roi(
+        self,
+        image: np.ndarray,
+        cropped_pose_landmarks,
+        pose_landmarks: Optional[np.ndarray],
+    ) -> None:
+        """
+        Store the box around this frame's pose landmarks to crop the next frame with,
+        or clear it to run detection on the next frame if the pose was lost or is leaving the crop.
+
+        :param image: The full image.
+        :param cropped_pose_landmarks: Mediapipe pose landmarks, normalized to the cropped image.
+        :param pose_landmarks: Pose landmark array normalized to the full image.
+        """
+        previous_roi_box_xyxy = self._roi_box_xyxy
+        self._roi_box_xyxy = None
+
+        if cropped_pose_landmarks is None:
+            return
+        visibility = np.array(
+            [landmark.visibility for landmark in cropped_pose_landmarks.landmark]
+        )
+        if visibility.mean() < self.min_roi_pose_visibility:
+            return
+        cropped_pose_points = landmarks_to_array(cropped_pose_landmarks)[:, :2]
+        visible_points = cropped_pose_points[visibility >= self.min_roi_pose_visibility]
+        if ((visible_points < 0) | (visible_points > 1)).any():
+            return
+
+        pixel_points = pose_landmarks[:, :2] * np.array([image.shape[1], image.shape[0]])
+        self._roi_box_xyxy = np.concatenate(
+            [pixel_points.min(axis=0), pixel_points.max(axis=0)]
+        )
+
+        if previous_roi_box_xyxy is not None:
+            # move the box with its center, so noise in the box size does not compound frame to frame
+            center_velocity = (
+                self._roi_box_xyxy[:2] + self._roi_box_xyxy[2:]
+                - previous_roi_box_xyxy[:2] - previous_roi_box_xyxy[2:]
+            ) / 2
+            self._roi_velocity = np.tile(center_velocity, 2)
+        else:
+            self._roi_velocity = np.zeros(4)
+
+    def reset_temporal_state(self) -> None:
+        super().reset_temporal_state()
+        # restart the mediapipe graph so landmark smoothing does not carry over between videos
+        self.holistic.reset()
+        self._roi_box_xyxy = None
+        self._roi_velocity = np.zeros(4)
+        self._frames_since_detection = 0
+        self._last_box_xyxy = None
+        self._frames_without_detection = 0
+
     def _get_buffer_bounding_box_total_image(
         self, image: np.ndarray, buffer_percentage: float
     ) -> Tuple[float, float]:
@@ -150,70 +337,66 @@ class YOLOMediapipeComboTracker(BaseTracker):
         box_right: int,
         box_bottom: int,
         mediapipe_results,
-    ) -> None:
-        if mediapipe_results.pose_landmarks is not None:
-            for landmark in mediapipe_results.pose_landmarks.landmark:
-                landmark.x = (
-                    (landmark.x * (box_right - box_left)) + box_left
-                ) / image.shape[1]
-                landmark.y = (
-                    (landmark.y * (box_bottom - box_top)) + box_top
-                ) / image.shape[0]
-                landmark.z = (landmark.z * (box_right - box_left)) / image.shape[1]
-        if mediapipe_results.face_landmarks is not None:
-            for landmark in mediapipe_results.face_landmarks.landmark:
-                landmark.x = (
-                    (landmark.x * (box_right - box_left)) + box_left
-                ) / image.shape[1]
-                landmark.y = (
-                    (landmark.y * (box_bottom - box_top)) + box_top
-                ) / image.shape[0]
-                landmark.z = (landmark.z * (box_right - box_left)) / image.shape[1]
-        if mediapipe_results.left_hand_landmarks is not None:
-            for landmark in mediapipe_results.left_hand_landmarks.landmark:
-                landmark.x = (
-                    (landmark.x * (box_right - box_left)) + box_left
-                ) / image.shape[1]
-                landmark.y = (
-                    (landmark.y * (box_bottom - box_top)) + box_top
-                ) / image.shape[0]
-                landmark.z = (landmark.z * (box_right - box_left)) / image.shape[1]
-        if mediapipe_results.right_hand_landmarks is not None:
-            for landmark in mediapipe_results.right_hand_landmarks.landmark:
-                landmark.x = (
-                    (landmark.x * (box_right - box_left)) + box_left
-                ) / image.shape[1]
-                landmark.y = (
-                    (landmark.y * (box_bottom - box_top)) + box_top
-                ) / image.shape[0]
-                landmark.z = (landmark.z * (box_right - box_left)) / image.shape[1]
+    ) -> Dict[str, Optional[np.ndarray]]:
+        """
+        Transform the landmarks from coordinates normalized to the cropped image to coordinates normalized to the full image.
+
+        All landmark groups are gathered into a single array and transformed at once.
+
+        :return: Dictionary of (num_landmarks, 3) landmark arrays by tracked object name, None for groups that were not found.
+        """
+        landmark_groups = {
+            tracked_object_name: getattr(mediapipe_results, tracked_object_name)
+            for tracked_object_name in MediapipeModelInfo.tracked_object_names
+        }
+        landmark_arrays = {
+            tracked_object_name: landmarks_to_array(landmarks)
+            for tracked_object_name, landmarks in landmark_groups.items()
+            if landmarks is not None
+        }
+        if not landmark_arrays:
+            return dict.fromkeys(landmark_groups)
+
+        all_landmarks = np.concatenate(list(landmark_arrays.values()))
+
+        # z is scaled by image width per mediapipe docs
+        scale = np.array(
+            [
+                (box_right - box_left) / image.shape[1],
+                (box_bottom - box_top) / image.shape[0],
+                (box_right - box_left) / image.shape[1],
+            ],
+            dtype=np.float32,
+        )
+        offset = np.array(
+            [box_left / image.shape[1], box_top / image.shape[0], 0],
+            dtype=np.float32,
+        )
+        all_landmarks = all_landmarks * scale + offset
+
+        rescaled_landmarks: Dict[str, Optional[np.ndarray]] = {}
+        start_index = 0
+        for tracked_object_name in landmark_groups:
+            if tracked_object_name not in landmark_arrays:
+                rescaled_landmarks[tracked_object_name] = None
+                continue
+            num_landmarks = landmark_arrays[tracked_object_name].shape[0]
+            rescaled_landmarks[tracked_object_name] = all_landmarks[
+                start_index : start_index + num_landmarks
+            ]
+            start_index += num_landmarks
+
+        return rescaled_landmarks
 
     def annotate_image(
         self, image: np.ndarray, tracked_objects: Dict[str, TrackedObject], **kwargs
     ) -> np.ndarray:
         # Draw the pose, face, and hand landmarks on the image
-        self.mp_drawing.draw_landmarks(
-            image,
-            tracked_objects["pose_landmarks"].extra["landmarks"],
-            self.mp_holistic.POSE_CONNECTIONS,
-        )
-        self.mp_drawing.draw_landmarks(
-            image,
-            tracked_objects["face_landmarks"].extra["landmarks"],
-            self.mp_holistic.FACEMESH_TESSELATION,
-        )
-        self.mp_drawing.draw_landmarks(
-            image,
-            tracked_objects["left_hand_landmarks"].extra["landmarks"],
-            self.mp_holistic.HAND_CONNECTIONS,
-        )
-        self.mp_drawing.draw_landmarks(
-            image,
-            tracked_objects["right_hand_landmarks"].extra["landmarks"],
-            self.mp_holistic.HAND_CONNECTIONS,
-        )
+        landmarks = np.full((MediapipeModelInfo.num_tracked_points, 3), np.nan)
+        fill_landmark_array(tracked_objects, landmarks)
+        pixel_points = landmarks[:, :2] * np.array([image.shape[1], image.shape[0]])
 
-        return image
+        return self.renderer.render(image, pixel_points, copy=False)
 
 
 if __name__ == "__main__":
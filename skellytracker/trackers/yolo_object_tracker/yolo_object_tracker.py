@@ -1,5 +1,6 @@
 import numpy as np
-from typing import Dict
+from typing import Dict, Iterator, List
+from pydantic import BaseModel
 from ultralytics import YOLO
 
 from skellytracker.trackers.base_tracker.base_tracker import BaseTracker
@@ -31,6 +32,18 @@ class YOLOObjectTracker(BaseTracker):
         else:
             self.classes = None  # None includes all classes
 
+    @property
+    def processes_frames_independently(self) -> bool:
+        return True
+
+    @classmethod
+    def from_tracking_params(cls, tracking_params: BaseModel) -> "YOLOObjectTracker":
+        return cls(
+            model_size=tracking_params.model_size,
+            person_only=tracking_params.person_only,
+            confidence_threshold=tracking_params.confidence_threshold,
+        )
+
     def process_image(self, image, **kwargs) -> Dict[str, TrackedObject]:
         results = self.model(
             image,
@@ -40,6 +53,32 @@ class YOLOObjectTracker(BaseTracker):
             conf=self.confidence_threshold,
         )
 
+        self.unpack_results(results)
+
+        self.defer_annotation(self.annotate_image, image, results=results, **kwargs)
+
+        return self.tracked_objects
+
+    def process_batch(
+        self, images: List[np.ndarray], **kwargs
+    ) -> Iterator[Dict[str, TrackedObject]]:
+        # run the model on the whole batch at once, then unpack the results one image at a time
+        batch_results = self.model(
+            images,
+            classes=self.classes,
+            max_det=1,
+            verbose=False,
+            conf=self.confidence_threshold,
+        )
+
+        for image, results in zip(images, batch_results):
+            self.unpack_results([results])
+
+            self.defer_annotation(self.annotate_image, image, results=[results], **kwargs)
+
+            yield self.tracked_objects
+
+    def unpack_results(self, results: list):
         box_xyxy = np.asarray(
             results[0].boxes.xyxy.cpu()
         ).flatten()  # On GPU, need to copy to CPU before np array conversion
@@ -53,10 +92,6 @@ class YOLOObjectTracker(BaseTracker):
             0
         ].boxes.orig_shape
 
-        self.annotated_image = self.annotate_image(image, results=results, **kwargs)
-
-        return self.tracked_objects
-
     def annotate_image(self, image: np.ndarray, results, **kwargs) -> np.ndarray:
         return results[0].plot()
 
@@ -1,8 +1,10 @@
 import numpy as np
-from typing import Dict
+from typing import Dict, Iterator, List
+from pydantic import BaseModel
 from ultralytics import YOLO
 
 from skellytracker.trackers.base_tracker.base_tracker import BaseTracker
+from skellytracker.trackers.base_tracker.skeleton_renderer import SkeletonRenderer
 from skellytracker.trackers.base_tracker.tracked_object import TrackedObject
 from skellytracker.trackers.yolo_tracker.yolo_model_info import YOLOModelInfo
 from skellytracker.trackers.yolo_tracker.yolo_recorder import YOLORecorder
@@ -14,6 +16,17 @@ class YOLOPoseTracker(BaseTracker):
 
         pytorch_model = YOLOModelInfo.model_dictionary[model_size]
         self.model = YOLO(pytorch_model)
+        self.renderer = SkeletonRenderer.from_model_info(YOLOModelInfo)
+
+    @property
+    def processes_frames_independently(self) -> bool:
+        return True
+
+    @classmethod
+    def from_tracking_params(cls, tracking_params: BaseModel) -> "YOLOPoseTracker":
+        return cls(
+            model_size=tracking_params.model_size,
+        )
 
     def process_image(self, image: np.ndarray, **kwargs) -> Dict[str, TrackedObject]:
         # "max_det=1" argument to limit to single person tracking for now
@@ -21,14 +34,34 @@ class YOLOPoseTracker(BaseTracker):
 
         self.unpack_results(results)
 
-        self.annotated_image = self.annotate_image(
-            image=image, results=results, **kwargs
+        self.defer_annotation(
+            self.annotate_image, image=image, results=results, **kwargs
         )
 
         return self.tracked_objects
 
+    def process_batch(
+        self, images: List[np.ndarray], **kwargs
+    ) -> Iterator[Dict[str, TrackedObject]]:
+        # run the model on the whole batch at once, then unpack the results one image at a time
+        batch_results = self.model(images, max_det=1, verbose=False)
+
+        for image, results in zip(images, batch_results):
+            self.unpack_results([results])
+
+            self.defer_annotation(
+                self.annotate_image, image=image, results=[results], **kwargs
+            )
+
+            yield self.tracked_objects
+
     def annotate_image(self, image: np.ndarray, results: list, **kwargs) -> np.ndarray:
-        return results[-1].plot()
+        keypoints = results[-1].keypoints
+        points = np.array(keypoints.xy, dtype=np.float64)
+        if keypoints.conf is not None:
+            # hide low confidence keypoints, as ultralytics' plot does
+            points[np.asarray(keypoints.conf) < 0.5] = np.nan
+        return self.renderer.render(image, points, reuse_buffer=self.reuse_annotation_buffer)
 
     def unpack_results(self, results: list):
         tracked_person = np.asarray(results[-1].keypoints.xy)
@@ -0,0 +1,174 @@
+import hashlib
+import json
+import logging
+import os
+from pathlib import Path
+from typing import Optional, Union
+
+import numpy as np
+from pydantic import BaseModel
+
+from skellytracker import __version__
+from skellytracker.system.default_paths import get_result_cache_folder_path
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_MAX_CACHE_SIZE_BYTES = 10 * 1024**3
+FINGERPRINT_NUMBER_OF_SAMPLES = 16
+FINGERPRINT_SAMPLE_SIZE_BYTES = 64 * 1024
+
+
+def get_file_fingerprint(
+    file_path: Union[str, Path],
+    number_of_samples: int = FINGERPRINT_NUMBER_OF_SAMPLES,
+    sample_size_bytes: int = FINGERPRINT_SAMPLE_SIZE_BYTES,
+) -> str:
+    """
+    Fingerprint a file from its size, modification time, and a hash of evenly spaced samples of its content,
+    so large videos can be identified without reading them in full.
+
+    :param file_path: Path to the file.
+    :param number_of_samples: Number of evenly spaced blocks of the file to hash.
+    :param sample_size_bytes: Size of each hashed block.
+    :return: Hex digest identifying the file
+    """
+    file_stat = os.stat(file_path)
+    file_hash = hashlib.sha256(f"{file_stat.st_size}:{file_stat.st_mtime_ns}".encode())
+
+    with open(file_path, "rb") as file:
+        if file_stat.st_size <= number_of_samples * sample_size_bytes:
+            file_hash.update(file.read())
+        else:
+            sample_offsets = np.linspace(
+                0, file_stat.st_size - sample_size_bytes, number_of_samples
+            ).astype(np.int64)
+            for sample_offset in sample_offsets:
+                file.seek(int(sample_offset))
+                file_hash.update(file.read(sample_size_bytes))
+
+    return file_hash.hexdigest()
+
+
+class ResultCache:
+    """
+    An on-disk cache of tracking output arrays, evicting the least recently used entries once it grows past a size limit.
+
+    Each entry is a .npy file named by its key. Reading an entry updates its modification time,
+    which is what the eviction order is based on.
+    """
+
+    def __init__(
+        self,
+        cache_folder_path: Optional[Union[str, Path]] = None,
+        max_size_bytes: int = DEFAULT_MAX_CACHE_SIZE_BYTES,
+    ):
+        """
+        Initialize the ResultCache.
+
+        :param cache_folder_path: Folder to store cached arrays in, defaults to a result_cache folder in the skellytracker data folder.
+        :param max_size_bytes: Total size of cached arrays to keep, the least recently used are deleted beyond this.
+        """
+        if cache_folder_path is None:
+            cache_folder_path = get_result_cache_folder_path()
+        self.cache_folder_path = Path(cache_folder_path)
+        self.cache_folder_path.mkdir(parents=True, exist_ok=True)
+        self.max_size_bytes = max_size_bytes
+
+    def get_key(
+        self,
+        video_path: Union[str, Path],
+        tracker_name: str,
+        tracking_params: BaseModel,
+        model_file_name: Optional[str] = None,
+        start_frame: int = 0,
+        end_frame: Optional[int] = None,
+    ) -> str:
+        """
+        Get the cache key for running a tracker on a video.
+
+        :param video_path: Path to the video.
+        :param tracker_name: Name of the tracker.
+        :param tracking_params: Tracking parameters the tracker is built from.
+        :param model_file_name: Model weights file the tracker loads, fingerprinted by content if it exists locally.
+        :param start_frame: Index of the first frame processed.
+        :param end_frame: Index one past the last frame processed, or None for the whole video.
+        :return: Hex digest identifying the result
+        """
+        if model_file_name is not None and Path(model_file_name).is_file():
+            model_fingerprint = get_file_fingerprint(model_file_name)
+        else:
+            model_fingerprint = model_file_name
+
+        key_data = {
+            "skellytracker_version": __version__,
+            "video": get_file_fingerprint(video_path),
+            "tracker_name": tracker_name,
+            "tracking_params_type": type(tracking_params).__name__,
+            "tracking_params": tracking_params.model_dump(mode="json"),
+            "model": model_fingerprint,
+            "start_frame": start_frame,
+            "end_frame": end_frame,
+        }
+        return hashlib.sha256(json.dumps(key_data, sort_keys=True).encode()).hexdigest()
+
+    def load(self, key: str) -> Optional[np.ndarray]:
+        """
+        Load a cached array, marking it as recently used.
+
+        :param key: Cache key from `get_key`.
+        :return: The cached array, or None on a cache miss
+        """
+        entry_path = self._get_entry_path(key)
+        try:
+            array = np.load(entry_path)
+            os.utime(entry_path)
+        except (FileNotFoundError, ValueError, OSError):
+            return None
+        logger.info(f"Loaded cached result {entry_path}")
+        return array
+
+    def save(self, key: str, array: np.ndarray) -> None:
+        """
+        Add an array to the cache, then evict the least recently used entries if the cache is too large.
+
+        :param key: Cache key from `get_key`.
+        :param array: The array to cache.
+        """
+        entry_path = self._get_entry_path(key)
+        # write to a temporary file first so concurrent readers never see a partial entry
+        temporary_path = entry_path.with_name(f"{entry_path.stem}.{os.getpid()}.tmp")
+        with open(temporary_path, "wb") as entry_file:
+            np.save(entry_file, array)
+        os.replace(temporary_path, entry_path)
+        logger.info(f"Cached result {entry_path}")
+        self.evict()
+
+    def evict(self) -> None:
+        """
+        Delete the least recently used entries until the cache fits within its size limit.
+        """
+        entries = []
+        for entry_path in self.cache_folder_path.glob("*.npy"):
+            try:
+                entry_stat = entry_path.stat()
+            except FileNotFoundError:
+                continue
+            entries.append((entry_stat.st_mtime_ns, entry_stat.st_size, entry_path))
+
+        cache_size_bytes = sum(entry_size for _, entry_size, _ in entries)
+        for _, entry_size, entry_path in sorted(entries):
+            if cache_size_bytes <= self.max_size_bytes:
+                break
+            logger.info(f"Evicting cached result {entry_path}")
+            entry_path.unlink(missing_ok=True)
+            cache_size_bytes -= entry_size
+
+    def clear(self) -> None:
+        """
+        Delete every entry in the cache.
+        """
+        for entry_path in self.cache_folder_path.glob("*.npy"):
+            entry_path.unlink(missing_ok=True)
+
+    def _get_entry_path(self, key: str) -> Path:
+        return self.cache_folder_path / f"{key}.npy"
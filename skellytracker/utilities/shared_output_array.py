@@ -0,0 +1,70 @@
+import logging
+from pathlib import Path
+from typing import List, Tuple, Union
+
+import cv2
+import numpy as np
+
+logger = logging.getLogger(__name__)
+
+
+def get_video_frame_counts(video_paths: List[Path]) -> List[int]:
+    """Return the number of frames reported by each video"""
+    frame_counts = []
+    for video_path in video_paths:
+        cap = cv2.VideoCapture(str(video_path))
+        frame_counts.append(int(cap.get(cv2.CAP_PROP_FRAME_COUNT)))
+        cap.release()
+    return frame_counts
+
+
+def create_shared_output_array(
+    file_path: Union[str, Path],
+    shape: Tuple[int, ...],
+    dtype: np.dtype = np.float64,
+) -> None:
+    """
+    Create a memory-mapped .npy file filled with NaN, for worker processes to write their results into.
+
+    :param file_path: Path of the .npy file to create.
+    :param shape: Shape of the full array, i.e. (numCams, numFrames, numTrackedPoints, values per point).
+    :param dtype: Data type of the array.
+    """
+    logger.info(f"Creating memory-mapped output array with shape {shape} at {file_path}")
+    shared_array = np.lib.format.open_memmap(
+        str(file_path), mode="w+", dtype=dtype, shape=shape
+    )
+    shared_array[:] = np.nan
+    shared_array.flush()
+    del shared_array
+
+
+def write_to_shared_output_array(
+    file_path: Union[str, Path],
+    array: np.ndarray,
+    camera_index: int,
+    start_frame: int = 0,
+) -> None:
+    """
+    Write one camera's tracking data into a memory-mapped .npy file created by `create_shared_output_array`.
+
+    :param file_path: Path of the .npy file to write to.
+    :param array: Tracking data with shape (numFrames, *shape of each frame's data in the file).
+    :param camera_index: Index of the camera the data belongs to.
+    :param start_frame: Index of the frame the data starts at.
+    """
+    shared_array = np.lib.format.open_memmap(str(file_path), mode="r+")
+    try:
+        number_of_frames = array.shape[0]
+        if (
+            array.shape[1:] != shared_array.shape[2:]
+            or start_frame + number_of_frames > shared_array.shape[1]
+        ):
+            raise ValueError(
+                f"Cannot write array of shape {array.shape} at frame {start_frame} "
+                f"into output array of shape {shared_array.shape}"
+            )
+        shared_array[camera_index, start_frame : start_frame + number_of_frames] = array
+        shared_array.flush()
+    finally:
+        del shared_array